@@ -16,6 +16,7 @@ import { Card } from "@/components/ui/card";
 import { Textarea } from "@/components/ui/textarea";
 import { X, Loader2 } from "lucide-react";
 import useAuthStore from "@/store/useAuthStore";
+import { authHeaders } from "@/utils/ProfileApi";
 
 interface AcademicEntry {
     institution: string;
@@ -75,7 +76,8 @@ function AcademicInfo({ formRef, onSuccess }: AcademicInfoProps) {
             setFetchError(null);
             try {
                 const response = await axios.get<ProfileResponse>(
-                    `${API_BASE_URL}/${id}/getprofile`
+                    `${API_BASE_URL}/${id}/getprofile`,
+                    { headers: authHeaders() }
                 );
                 const profileData = response.data;
 
@@ -105,7 +107,8 @@ function AcademicInfo({ formRef, onSuccess }: AcademicInfoProps) {
         try {
             const response = await axios.post(
                 `${API_BASE_URL}/${id}/academic_info`,
-                { academics: data.academics }
+                { academics: data.academics },
+                { headers: authHeaders() }
             );
 
             if (response.status === 200) {
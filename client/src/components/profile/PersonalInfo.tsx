@@ -8,6 +8,7 @@ import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import { Loader2 } from "lucide-react";
 import useAuthStore from "@/store/useAuthStore";
+import { authHeaders } from "@/utils/ProfileApi";
 
 interface PersonalInfoForm {
   firstName: string;
@@ -59,9 +60,7 @@ const PersonalInfo = ({ formRef, onSuccess }) => {
       setIsLoading(true);
       try {
         const response = await axios.get(`${API_BASE_URL}/profile/${user.userId}/getprofile`, {
-          headers: {
-            Authorization: `Bearer ${user.token}`
-          }
+          headers: authHeaders()
         });
 
         const profileData = response.data;
@@ -111,7 +110,7 @@ const PersonalInfo = ({ formRef, onSuccess }) => {
         formData,
         {
           headers: {
-            Authorization: `Bearer ${user.token}`,
+            ...authHeaders(),
             'Content-Type': 'application/json'
           }
         }
@@ -9,6 +9,7 @@ import { Card } from "@/components/ui/card";
 import { Textarea } from "@/components/ui/textarea";
 import { X, Loader2 } from "lucide-react";
 import useAuthStore from "@/store/useAuthStore";
+import { authHeaders } from "@/utils/ProfileApi";
 
 interface Publication {
     title: string;
@@ -55,7 +56,7 @@ const PublicationInfo: React.FC<PublicationInfoProps> = ({ formRef, onSuccess })
             setFetchError(null);
 
             try {
-                const response = await axios.get(`${API_BASE_URL}/${id}/getprofile`);
+                const response = await axios.get(`${API_BASE_URL}/${id}/getprofile`, { headers: authHeaders() });
                 const profileData = response.data;
 
                 if (profileData.publications && profileData.publications.length > 0) {
@@ -84,7 +85,7 @@ const PublicationInfo: React.FC<PublicationInfoProps> = ({ formRef, onSuccess })
         try {
             const response = await axios.post(`${API_BASE_URL}/${id}/publication_info`, {
                 publications: data.publications
-            });
+            }, { headers: authHeaders() });
 
             if (response.status === 200) {
                 setIsSubmitted(true);
@@ -8,6 +8,7 @@ import { Card } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Loader2, X } from "lucide-react";
 import useAuthStore from "@/store/useAuthStore";
+import { authHeaders } from "@/utils/ProfileApi";
 
 // Tech skills suggestions based on common technologies
 const suggestedSkills = [
@@ -51,9 +52,7 @@ const SkillInfo = ({ formRef, onSuccess }) => {
       setIsLoading(true);
       try {
         const response = await axios.get(`${API_BASE_URL}/profile/${user.userId}/getprofile`, {
-          headers: {
-            Authorization: `Bearer ${user.token}`
-          }
+          headers: authHeaders()
         });
 
         const profileData = response.data;
@@ -87,7 +86,7 @@ const SkillInfo = ({ formRef, onSuccess }) => {
         { skills: data.skills },
         {
           headers: {
-            Authorization: `Bearer ${user.token}`,
+            ...authHeaders(),
             'Content-Type': 'application/json'
           }
         }
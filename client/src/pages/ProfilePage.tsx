@@ -1,4 +1,4 @@
-import React, { useState, ReactElement, useEffect } from "react";
+import React, { useState, ReactElement, useEffect, useRef } from "react";
 import PersonalInfo from "@/components/profile/PersonalInfo";
 import AcademicInfo from "@/components/profile/AcademicInfo";
 import ProjectsInfo from "@/components/profile/ProjectsInfo";
@@ -8,6 +8,8 @@ import CertificationInfo from "@/components/profile/CertificationInfo";
 import AchievementInfo from "@/components/profile/AchievementInfo";
 import PublicationInfo from "@/components/profile/PublicationInfo";
 import SocialInfo from "@/components/profile/SocialInfo";
+import useAuthStore from "@/store/useAuthStore";
+import { subscribeToProfileChanges } from "@/utils/ProfileApi";
 import {
   UserPen,
   School,
@@ -23,25 +25,49 @@ import {
 
 interface Tab {
   name: string;
+  // Profile section the tab edits, as named in pushed change events
+  section: string;
   component: ReactElement;
   icon: ReactElement;
 }
 
 const tabs: Tab[] = [
-  { name: "Personal Info", component: <PersonalInfo />, icon: <UserPen /> },
-  { name: "Academic Info", component: <AcademicInfo />, icon: <School /> },
-  { name: "Projects", component: <ProjectsInfo />, icon: <FolderGit2 /> },
-  { name: "Skills", component: <SkillInfo />, icon: <Brain /> },
-  { name: "Work Experience", component: <WorkInfo />, icon: <Building2 /> },
-  { name: "Certifications", component: <CertificationInfo />, icon: <FileBadge /> },
-  { name: "Achievements", component: <AchievementInfo />, icon: <Trophy /> },
-  { name: "Publications", component: <PublicationInfo />, icon: <ScrollText /> },
-  { name: "Social Links", component: <SocialInfo />, icon: <Link /> },
+  { name: "Personal Info", section: "personalInfo", component: <PersonalInfo />, icon: <UserPen /> },
+  { name: "Academic Info", section: "academic", component: <AcademicInfo />, icon: <School /> },
+  { name: "Projects", section: "projects", component: <ProjectsInfo />, icon: <FolderGit2 /> },
+  { name: "Skills", section: "skills", component: <SkillInfo />, icon: <Brain /> },
+  { name: "Work Experience", section: "workEx", component: <WorkInfo />, icon: <Building2 /> },
+  { name: "Certifications", section: "certifications", component: <CertificationInfo />, icon: <FileBadge /> },
+  { name: "Achievements", section: "achievements", component: <AchievementInfo />, icon: <Trophy /> },
+  { name: "Publications", section: "publications", component: <PublicationInfo />, icon: <ScrollText /> },
+  { name: "Social Links", section: "socials", component: <SocialInfo />, icon: <Link /> },
 ];
 
 const ProfilePage: React.FC = () => {
   const [activeTab, setActiveTab] = useState<number>(0);
   const [isMobile, setIsMobile] = useState<boolean>(false);
+  // Bumped to remount (and so re-fetch) the open tab when its section changes elsewhere
+  const [reloadKey, setReloadKey] = useState<number>(0);
+  const activeSection = useRef<string>(tabs[0].section);
+  const userId = useAuthStore((state) => state.user?.userId);
+  const token = useAuthStore((state) => state.user?.sessionToken ?? state.user?.idToken);
+
+  useEffect(() => {
+    activeSection.current = tabs[activeTab].section;
+  }, [activeTab]);
+
+  // Saves from other tabs and devices are pushed over server-sent events
+  useEffect(() => {
+    if (!userId || !token) return;
+    const reload = () => setReloadKey((key) => key + 1);
+    return subscribeToProfileChanges(
+      userId,
+      (section) => {
+        if (section === activeSection.current) reload();
+      },
+      reload
+    );
+  }, [userId, token]);
 
   useEffect(() => {
     const handleResize = () => setIsMobile(window.innerWidth < 768);
@@ -94,7 +120,7 @@ const ProfilePage: React.FC = () => {
 
         {/* Content Area */}
         <div className={`w-full md:w-3/4 px-4 flex justify-center overflow-y-auto ${isMobile ? "mt-5 mb-10" : ""}`}>
-          {tabs[activeTab].component}
+          <React.Fragment key={`${activeTab}:${reloadKey}`}>{tabs[activeTab].component}</React.Fragment>
         </div>
       </div>
     </>
@@ -6,7 +6,12 @@ interface User {
   userId: string;
   username: string;
   email: string;
-  token: string;
+  // Sent as the Bearer token on API calls (verified by the server without
+  // Firebase); absent when the server has session tokens disabled
+  sessionToken?: string;
+  sessionExpiresAt?: number;
+  // Firebase ID token, needed to log out; the Bearer token when there is no session
+  idToken?: string;
   picture?: string;
 }
 
@@ -114,7 +119,8 @@ const useAuthStore = create<AuthState>()(
           }
           
           set({ 
-            user: data.data,
+            // The response carries no ID token; keep Google's for logout
+            user: { ...data.data, idToken },
             isLoading: false, 
             isAuthenticated: true,
           });
@@ -134,14 +140,14 @@ const useAuthStore = create<AuthState>()(
           
           const { user } = get();
           
-          if (user?.token) {
+          if (user?.idToken) {
             // Call the logout API
             await fetch(`${API_URL}/auth/logout`, {
               method: 'POST',
               headers: {
                 'Content-Type': 'application/json',
               },
-              body: JSON.stringify({ idToken: user.token }),
+              body: JSON.stringify({ idToken: user.idToken, sessionToken: user.sessionToken }),
             });
           }
           
@@ -168,6 +174,9 @@ const useAuthStore = create<AuthState>()(
     {
       name: 'uply-auth-storage',
       storage: createJSONStorage(() => localStorage),
+      // Version 0 stored users without their tokens; they sign in again
+      version: 1,
+      migrate: () => ({ user: null, isAuthenticated: false }),
       partialize: (state) => ({ 
         user: state.user,
         isAuthenticated: state.isAuthenticated,
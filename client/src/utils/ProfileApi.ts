@@ -4,27 +4,35 @@ import useAuthStore from '@/store/useAuthStore';
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
+/**
+ * Token proving the signed-in user's identity: the session token, or the
+ * Firebase ID token when the server issued no session
+ */
+export const bearerToken = (): string | undefined => {
+  const { user } = useAuthStore.getState();
+  return user?.sessionToken ?? user?.idToken;
+};
+
+/**
+ * Authorization header for the signed-in user (empty when signed out)
+ */
+export const authHeaders = (): Record<string, string> => {
+  const token = bearerToken();
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
 /**
  * Creates a configured axios instance with authentication
  */
 export const createApiClient = () => {
-  const { user } = useAuthStore.getState();
-  
   const config: AxiosRequestConfig = {
     baseURL: API_BASE_URL,
     headers: {
       'Content-Type': 'application/json',
+      ...authHeaders(),
     }
   };
   
-  // Add auth token if available
-  if (user?.token) {
-    config.headers = {
-      ...config.headers,
-      Authorization: `Bearer ${user.token}`,
-    };
-  }
-  
   return axios.create(config);
 };
 
@@ -88,4 +96,31 @@ export const updatePublications = async (userId: string, data: any) =>
   updateProfileSection(userId, 'publication_info', { publications: data });
 
 export const updateSocialLinks = async (userId: string, data: any) => 
-  updateProfileSection(userId, 'socials', data);
\ No newline at end of file
+  updateProfileSection(userId, 'socials', data);
+/**
+ * Listen for saved profile sections (from other tabs and devices)
+ *
+ * onSection receives (section, data) with the section's new value; onResync
+ * is called when events were missed and the whole profile should be fetched
+ * again. Returns a function closing the stream.
+ */
+export const subscribeToProfileChanges = (
+  userId: string,
+  onSection: (section: string, data: any) => void,
+  onResync: () => void
+) => {
+  const token = bearerToken();
+  // EventSource cannot send an Authorization header
+  const query = token ? `?access_token=${encodeURIComponent(token)}` : '';
+  const source = new EventSource(`${API_BASE_URL}/profile/${userId}/events${query}`);
+
+  source.addEventListener('section', (event: MessageEvent) => {
+    const { section, data } = JSON.parse(event.data);
+    onSection(section, data);
+  });
+  source.addEventListener('resync', onResync);
+  // The token stopped being valid; reconnecting would not help
+  source.addEventListener('expired', () => source.close());
+
+  return () => source.close();
+};
@@ -0,0 +1,96 @@
+"""
+Bulk profile import/export throughput
+
+Writes generated profiles to a compressed JSON lines file (not timed), then
+imports it into an empty database once per worker count and exports it back.
+Reports profiles/second for each run. The target is 1M profiles against a
+real mongod; mongomock numbers are dominated by its Python write path.
+
+Usage (from the server directory):
+    python -m benchmarks.bulk_import --profiles 20000 --workers 0,2,4
+    python -m benchmarks.bulk_import --mongodb-uri mongodb://localhost/uply_bench \\
+        --profiles 1000000 --workers 8 --batch-size 1000
+"""
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+from benchmarks.harness import boot_app, git_revision, reset_database
+from benchmarks.seed import profile_document
+from utils.json_response import dumps
+
+def write_input(path, count, entries, seed):
+    with gzip.open(path, "wb", compresslevel=1) as f:
+        for index in range(count):
+            document = profile_document(index, entries, seed)
+            document.pop("password")
+            f.write(dumps(document) + b"\n")
+    return os.path.getsize(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export benchmark")
+    parser.add_argument("--mongodb-uri", help="Local mongod URI (db name must end in _bench); default: mongomock")
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--entries", type=int, default=3, help="Entries per list section (profile size)")
+    parser.add_argument("--workers", default="0,4", help="Comma-separated worker counts to compare")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    boot_app(args.mongodb_uri)
+    from models.profile_schema import Profile
+    from services.profile_transfer import export_profiles, import_profiles
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "profiles.jsonl.gz")
+        input_bytes = write_input(path, args.profiles, args.entries, args.seed)
+
+        imports = {}
+        for workers in (int(value) for value in args.workers.split(",")):
+            reset_database()
+            # Dropping the collection dropped its indexes; unique checks are part of the cost
+            Profile.ensure_indexes()
+            with open(path, "rb") as f:
+                report = import_profiles(f, "gzip", "insert", workers, args.batch_size)
+            if report["written"] != args.profiles:
+                raise AssertionError(f"Imported {report['written']} of {args.profiles} profiles: {report['errors'][:3]}")
+            imports[f"workers={workers}"] = {
+                "seconds": report["seconds"],
+                "profiles_per_second": report["profilesPerSecond"],
+            }
+
+        export_path = os.path.join(directory, "export.jsonl.gz")
+        start = time.perf_counter()
+        with open(export_path, "wb") as f:
+            export_profiles(f, "gzip")
+        export_seconds = time.perf_counter() - start
+
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "backend": "mongod" if args.mongodb_uri else "mongomock",
+            "profiles": args.profiles,
+            "entries": args.entries,
+            "batch_size": args.batch_size,
+            "input_bytes": input_bytes,
+            "cpus": os.cpu_count(),
+        },
+        "import": imports,
+        "export": {
+            "seconds": round(export_seconds, 3),
+            "profiles_per_second": round(args.profiles / export_seconds) if export_seconds else None,
+        },
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
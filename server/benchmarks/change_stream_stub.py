@@ -0,0 +1,127 @@
+"""
+Change stream stand-in for mongomock (and standalone mongod) databases
+
+Change streams need a replica set. This emulates Collection.watch() well
+enough for services.profile_changes by polling the collection and diffing
+each document against the previous poll:
+
+    source = PollingChangeSource(Profile._get_collection())
+    profile_change_tailer.watch = source.watch
+    profile_change_tailer.start()
+
+Writes are reported as top-level field updates ("workEx" rather than
+"workEx.2.company"), and several writes to one document between two polls
+come out as a single change. Resume tokens are positions in an in-memory
+log, so resuming works for as long as the source object lives.
+"""
+import copy
+import threading
+import time
+from pymongo.errors import OperationFailure
+
+class PollingChangeSource:
+    """Polls a collection on a background thread and records changes like a replica set oplog"""
+
+    def __init__(self, collection, poll_seconds=0.05):
+        self.collection = collection
+        self.poll_seconds = poll_seconds
+        self._log = []
+        self._documents = {document["_id"]: document for document in collection.find()}
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        threading.Thread(target=self._poll, name="change-stream-stub", daemon=True).start()
+
+    def close(self):
+        self._stop.set()
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                current = {document["_id"]: document for document in self.collection.find()}
+            except Exception as e:
+                print(f"Error polling {self.collection.name}: {str(e)}")
+                continue
+            changes = list(self._diff(self._documents, current))
+            self._documents = current
+            if changes:
+                with self._changed:
+                    for change in changes:
+                        change["_id"] = {"_data": f"{len(self._log) + 1:016x}"}
+                        self._log.append(change)
+                    self._changed.notify_all()
+
+    def _diff(self, before, after):
+        for key, document in after.items():
+            previous = before.get(key)
+            base = {"documentKey": {"_id": key}, "ns": {"coll": self.collection.name}}
+            if previous is None:
+                yield {**base, "operationType": "insert", "fullDocument": copy.deepcopy(document)}
+            elif previous != document:
+                updated = {field: value for field, value in document.items() if previous.get(field) != value}
+                removed = [field for field in previous if field not in document]
+                yield {
+                    **base,
+                    "operationType": "update",
+                    "updateDescription": {"updatedFields": copy.deepcopy(updated), "removedFields": removed},
+                    "fullDocument": copy.deepcopy(document),
+                    "fullDocumentBeforeChange": copy.deepcopy(previous),
+                }
+        for key in before.keys() - after.keys():
+            yield {"documentKey": {"_id": key}, "ns": {"coll": self.collection.name}, "operationType": "delete"}
+
+    def watch(self, resume_after=None, full_document=None, full_document_before_change=None,
+              max_await_time_ms=None, **kwargs):
+        """Open a stream positioned after resume_after, or at the end of the log"""
+        with self._changed:
+            if resume_after is None:
+                position = len(self._log)
+            else:
+                position = int(resume_after["_data"], 16)
+                if position > len(self._log):
+                    raise OperationFailure("Resume token not found", code=286)
+        return StubChangeStream(
+            self, position,
+            full_document == "updateLookup",
+            full_document_before_change in ("whenAvailable", "required"),
+            (max_await_time_ms or 1000) / 1000
+        )
+
+class StubChangeStream:
+    """The subset of pymongo's ChangeStream the tailer uses"""
+
+    def __init__(self, source, position, lookup, pre_images, max_await):
+        self._source = source
+        self._position = position
+        self._lookup = lookup
+        self._pre_images = pre_images
+        self._max_await = max_await
+        self.alive = True
+
+    @property
+    def resume_token(self):
+        return {"_data": f"{self._position:016x}"}
+
+    def try_next(self):
+        deadline = time.monotonic() + self._max_await
+        with self._source._changed:
+            while self._position >= len(self._source._log):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.alive:
+                    return None
+                self._source._changed.wait(remaining)
+            change = dict(self._source._log[self._position])
+        self._position += 1
+        if not self._lookup and change["operationType"] == "update":
+            change.pop("fullDocument", None)
+        if not self._pre_images:
+            change.pop("fullDocumentBeforeChange", None)
+        return change
+
+    def close(self):
+        self.alive = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,147 @@
+"""
+Response compression benchmark: CPU time versus bytes saved per codec and level
+
+Encodes seeded profiles the way the API does, then for every available codec
+(gzip always; brotli and zstd when installed) and a range of levels reports
+compression/decompression time and compressed size, for a single profile and
+for a /profile/profiles listing. Finally times the getprofile route cold
+(fetch, encode, compress) and from the compressed response cache.
+
+Usage (from the server directory):
+    python -m benchmarks.compression --profiles 200 --entries 10
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import time
+import httpx
+from benchmarks.harness import auth_headers, boot_app, reset_database, seed_profiles, git_revision, summarize
+
+LEVELS = {
+    "gzip": [1, 3, 6, 9],
+    "br": [1, 4, 6, 9, 11],
+    "zstd": [1, 3, 6, 12, 19],
+}
+
+def decompressor(encoding):
+    if encoding == "gzip":
+        return gzip.decompress
+    if encoding == "br":
+        import brotli
+        return brotli.decompress
+    import zstandard
+    return zstandard.ZstdDecompressor().decompress
+
+def measure_codec(bodies, encoding, level, rounds):
+    from services.compression import compress
+
+    decompress = decompressor(encoding)
+    compress_seconds = 0.0
+    decompress_seconds = 0.0
+    compressed_bytes = 0
+    for _ in range(rounds):
+        for body in bodies:
+            start = time.perf_counter()
+            compressed = compress(body, encoding, level)
+            compress_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            decompress(compressed)
+            decompress_seconds += time.perf_counter() - start
+            compressed_bytes += len(compressed)
+
+    calls = rounds * len(bodies)
+    original_bytes = rounds * sum(len(body) for body in bodies)
+    return {
+        "encoding": encoding,
+        "level": level,
+        "ratio": round(original_bytes / compressed_bytes, 2),
+        "mean_compressed_bytes": round(compressed_bytes / calls),
+        "compress_ms": round(compress_seconds * 1000 / calls, 4),
+        "decompress_ms": round(decompress_seconds * 1000 / calls, 4),
+        "compress_mb_per_s": round(original_bytes / compress_seconds / 1e6, 1),
+    }
+
+def codec_table(bodies, rounds):
+    from services.compression import CODECS
+    return [
+        measure_codec(bodies, encoding, level, rounds)
+        for encoding in CODECS
+        for level in LEVELS[encoding]
+    ]
+
+async def time_route(app, users, rounds, accept_encoding, clear_cache):
+    from services.response_cache import profile_response_cache
+
+    latencies = []
+    headers = {"Accept-Encoding": accept_encoding}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        if not clear_cache:
+            # Fill the cache (and its compressed variants) before measuring
+            for user in users:
+                await client.get(f"/api/profile/{user.user_id}/getprofile", headers={**headers, **auth_headers(user)})
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for user in users:
+                if clear_cache:
+                    profile_response_cache.clear()
+                begin = time.perf_counter()
+                response = await client.get(f"/api/profile/{user.user_id}/getprofile", headers={**headers, **auth_headers(user)})
+                latencies.append(time.perf_counter() - begin)
+                response.raise_for_status()
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Response compression benchmark")
+    parser.add_argument("--mongodb-uri", help="Local mongod URI (db name must end in _bench); default: mongomock")
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=10, help="Entries per list section (profile size)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    app, toolkit = boot_app(args.mongodb_uri)
+    reset_database()
+    users = seed_profiles(toolkit, args.profiles, args.entries, args.seed)
+
+    from models.profile_schema import Profile
+    from services.compression import negotiate
+    from utils.json_response import dumps
+    from utils.profile_utils import mongo_to_dict
+
+    profiles = [mongo_to_dict(p) for p in Profile.objects.exclude("password", "username")]
+    profile_bodies = [dumps(profile) for profile in profiles]
+    listing_body = dumps(profiles)
+
+    accept_encoding = "gzip, deflate, br, zstd"
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "backend": "mongod" if args.mongodb_uri else "mongomock",
+            "profiles": args.profiles,
+            "entries": args.entries,
+            "rounds": args.rounds,
+            "mean_profile_bytes": round(sum(len(body) for body in profile_bodies) / len(profile_bodies)),
+            "listing_bytes": len(listing_body),
+            "negotiated_encoding": negotiate(accept_encoding),
+        },
+        "profile": codec_table(profile_bodies, args.rounds),
+        "listing": codec_table([listing_body], args.rounds),
+        "route_identity": asyncio.run(time_route(app, users, args.rounds, "identity", clear_cache=True)),
+        "route_cold": asyncio.run(time_route(app, users, args.rounds, accept_encoding, clear_cache=True)),
+        "route_cached": asyncio.run(time_route(app, users, args.rounds, accept_encoding, clear_cache=False)),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Fake Firebase Identity Toolkit server for benchmarks
+
+Implements the handful of endpoints the app uses, laid out like the Firebase
+Auth emulator so the Admin SDK can be pointed at it with
+FIREBASE_AUTH_EMULATOR_HOST:
+
+    POST /identitytoolkit.googleapis.com/v1/accounts:signUp
+    POST /identitytoolkit.googleapis.com/v1/accounts:signInWithPassword
+    POST /identitytoolkit.googleapis.com/v1/projects/<id>/accounts:lookup
+    POST /identitytoolkit.googleapis.com/v1/projects/<id>/accounts:update
+    POST /identitytoolkit.googleapis.com/v1/projects/<id>/accounts:delete
+
+ID tokens are real RS256 JWTs signed with a key generated at startup. Note that
+the Admin SDK skips signature checks in emulator mode, so signature
+verification CPU is not part of the measured request cost.
+"""
+import hashlib
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt, jwt
+
+class FakeIdentityToolkit:
+    """In-memory user store plus token minting"""
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self.users = {}
+        self.uids_by_email = {}
+        self.lock = threading.Lock()
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        self.key_id = secrets.token_hex(8)
+        self.signer = crypt.RSASigner.from_string(pem, key_id=self.key_id)
+
+    def _hash(self, password):
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def create_user(self, email, password, uid=None, display_name=None):
+        """Register a user directly (used by seeding); returns the uid"""
+        with self.lock:
+            if email in self.uids_by_email:
+                return None
+            uid = uid or secrets.token_hex(14)
+            self.users[uid] = {
+                "localId": uid,
+                "email": email,
+                "passwordHash": self._hash(password),
+                "displayName": display_name,
+                "validSince": "0",
+                "createdAt": str(int(time.time() * 1000)),
+            }
+            self.uids_by_email[email] = uid
+            return uid
+
+    def mint_id_token(self, uid):
+        """Issue an RS256 ID token shaped like the ones Firebase Auth returns"""
+        user = self.users[uid]
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{self.project_id}",
+            "aud": self.project_id,
+            "auth_time": now,
+            "user_id": uid,
+            "sub": uid,
+            "iat": now,
+            "exp": now + 3600,
+            "email": user["email"],
+            "email_verified": False,
+            "firebase": {"identities": {"email": [user["email"]]}, "sign_in_provider": "password"},
+        }
+        return jwt.encode(self.signer, payload).decode()
+
+    def _token_response(self, uid):
+        user = self.users[uid]
+        return {
+            "kind": "identitytoolkit#SignupNewUserResponse",
+            "localId": uid,
+            "email": user["email"],
+            "displayName": user["displayName"] or "",
+            "idToken": self.mint_id_token(uid),
+            "refreshToken": secrets.token_urlsafe(32),
+            "expiresIn": "3600",
+            "registered": True,
+        }
+
+    def sign_up(self, body):
+        uid = self.create_user(body.get("email"), body.get("password", ""))
+        if uid is None:
+            return 400, {"error": {"code": 400, "message": "EMAIL_EXISTS"}}
+        return 200, self._token_response(uid)
+
+    def sign_in(self, body):
+        uid = self.uids_by_email.get(body.get("email"))
+        if uid is None:
+            return 400, {"error": {"code": 400, "message": "EMAIL_NOT_FOUND"}}
+        if self.users[uid]["passwordHash"] != self._hash(body.get("password", "")):
+            return 400, {"error": {"code": 400, "message": "INVALID_PASSWORD"}}
+        return 200, self._token_response(uid)
+
+    def lookup(self, body):
+        uids = list(body.get("localId", []))
+        uids += [self.uids_by_email[email] for email in body.get("email", []) if email in self.uids_by_email]
+        users = [
+            {key: value for key, value in self.users[uid].items() if key != "passwordHash"}
+            for uid in uids if uid in self.users
+        ]
+        return 200, {"kind": "identitytoolkit#GetAccountInfoResponse", "users": users} if users else {}
+
+    def update(self, body):
+        uid = body.get("localId")
+        if uid not in self.users:
+            return 400, {"error": {"code": 400, "message": "USER_NOT_FOUND"}}
+        with self.lock:
+            if "displayName" in body:
+                self.users[uid]["displayName"] = body["displayName"]
+            if "validSince" in body:
+                self.users[uid]["validSince"] = str(body["validSince"])
+        return 200, {"localId": uid}
+
+    def delete(self, body):
+        uid = body.get("localId")
+        with self.lock:
+            user = self.users.pop(uid, None)
+            if user is None:
+                return 400, {"error": {"code": 400, "message": "USER_NOT_FOUND"}}
+            self.uids_by_email.pop(user.get("email"), None)
+        return 200, {"kind": "identitytoolkit#DeleteAccountResponse"}
+
+def _make_handler(toolkit):
+    routes = {
+        "accounts:signUp": toolkit.sign_up,
+        "accounts:signInWithPassword": toolkit.sign_in,
+        "accounts:lookup": toolkit.lookup,
+        "accounts:update": toolkit.update,
+        "accounts:delete": toolkit.delete,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; avoid delayed-ACK stalls
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            action = self.path.split("?")[0].rsplit("/", 1)[-1]
+            handler = routes.get(action)
+            if handler is None:
+                status, payload = 404, {"error": {"code": 404, "message": "NOT_FOUND"}}
+            else:
+                status, payload = handler(body)
+
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def start_fake_firebase(project_id, host="127.0.0.1", port=0):
+    """
+    Start the fake Identity Toolkit server on a background thread
+
+    Returns:
+        (toolkit, server) - server.server_address gives the bound host/port
+    """
+    toolkit = FakeIdentityToolkit(project_id)
+    server = ThreadingHTTPServer((host, port), _make_handler(toolkit))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-firebase", daemon=True).start()
+    return toolkit, server
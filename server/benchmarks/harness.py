@@ -0,0 +1,129 @@
+"""
+Boot the API in-process against a local MongoDB (or an in-memory stand-in)
+and the fake Firebase server, then seed it with generated profiles.
+"""
+import math
+import os
+import subprocess
+from collections import namedtuple
+from benchmarks.firebase_stub import start_fake_firebase
+from benchmarks.seed import profile_document
+
+BENCH_PASSWORD = "benchpass123"
+
+SeededUser = namedtuple("SeededUser", ["user_id", "uid", "email", "password", "token"])
+
+def auth_headers(user):
+    """Authorization header carrying the user's session token"""
+    return {"Authorization": f"Bearer {user.token}"}
+
+def boot_app(mongodb_uri=None):
+    """
+    Import the FastAPI app wired to benchmark backends
+
+    Args:
+        mongodb_uri: URI of a local mongod whose database name ends in "_bench".
+            When omitted, mongomock is used as an in-memory stand-in.
+
+    Returns:
+        (app, toolkit) where toolkit is the fake Identity Toolkit
+    """
+    if mongodb_uri and not mongodb_uri.split("/")[-1].split("?")[0].endswith("_bench"):
+        raise ValueError("Refusing to seed a database whose name does not end in '_bench'.")
+
+    toolkit, server = start_fake_firebase(project_id="")
+    host, port = server.server_address
+    os.environ["FIREBASE_AUTH_EMULATOR_HOST"] = f"{host}:{port}"
+    os.environ["FIREBASE_API_KEY"] = "bench"
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret")
+    # Benchmark traffic all comes from one IP; per-IP sign-in limits would refuse most of it
+    os.environ.setdefault("RATE_LIMIT", "0")
+    # An empty value keeps python-dotenv from loading a real URI from .env
+    os.environ["MONGODB_URI"] = mongodb_uri or ""
+
+    import mongoengine
+    import main
+    from config.firebase import firebase_app
+
+    toolkit.project_id = firebase_app.project_id
+
+    if not mongodb_uri:
+        import mongomock
+        import mongomock.gridfs
+        mongoengine.disconnect()
+        mongoengine.connect("uply_bench", host="mongodb://localhost", mongo_client_class=mongomock.MongoClient)
+        # Lets gridfs (resume storage) run on mongomock databases
+        mongomock.gridfs.enable_gridfs_integration()
+
+    return main.app, toolkit
+
+def reset_database():
+    """Drop every collection of the benchmark database"""
+    from mongoengine.connection import get_db
+    db = get_db()
+    for name in db.list_collection_names():
+        db.drop_collection(name)
+
+def seed_profiles(toolkit, count, entries=3, seed=0, batch_size=1000):
+    """
+    Insert `count` generated profiles and register matching Firebase users
+
+    Each user gets a session token, as if they had logged in.
+
+    Returns:
+        List of SeededUser
+    """
+    from models.profile_schema import Profile
+    from services.sessions import issue_session
+
+    def seeded_user(doc):
+        email = doc["personalInfo"]["email"]
+        token, _ = issue_session(doc["firebase_uid"], str(doc["_id"]), email, doc["username"])
+        return SeededUser(str(doc["_id"]), doc["firebase_uid"], email, BENCH_PASSWORD, token)
+
+    collection = Profile._get_collection()
+    users = []
+    batch = []
+    for index in range(count):
+        doc = profile_document(index, entries, seed)
+        batch.append(doc)
+        email = doc["personalInfo"]["email"]
+        toolkit.create_user(email, BENCH_PASSWORD, uid=doc["firebase_uid"], display_name=doc["username"])
+        if len(batch) >= batch_size:
+            collection.insert_many(batch)
+            users.extend(seeded_user(d) for d in batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+        users.extend(seeded_user(d) for d in batch)
+    return users
+
+def git_revision():
+    """Current commit hash, so reports from different commits can be compared"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(latencies, elapsed):
+    """Throughput and latency percentiles (ms) for a list of latencies in seconds"""
+    values = sorted(latencies)
+    to_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "count": len(values),
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else None,
+        "mean_ms": to_ms(sum(values) / len(values)) if values else None,
+        "p50_ms": to_ms(percentile(values, 0.50)),
+        "p95_ms": to_ms(percentile(values, 0.95)),
+        "p99_ms": to_ms(percentile(values, 0.99)),
+        "max_ms": to_ms(values[-1]) if values else None,
+    }
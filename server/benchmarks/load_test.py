@@ -0,0 +1,158 @@
+"""
+Mixed read/write/auth load test against the in-process API
+
+Runs entirely locally: MongoDB is a local mongod (--mongodb-uri, database name
+must end in "_bench") or mongomock, and Firebase is the fake Identity Toolkit
+from benchmarks/firebase_stub.py. Results are printed (or written) as JSON so
+runs on different commits can be diffed.
+
+Usage (from the server directory):
+    python -m benchmarks.load_test --profiles 2000 --entries 5 --concurrency 16 --requests 5000
+    python -m benchmarks.load_test --mix read=80,write=15,auth=5 --output bench_output.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+import httpx
+from benchmarks.harness import auth_headers, boot_app, reset_database, seed_profiles, git_revision, summarize
+from benchmarks import seed as seed_data
+
+async def op_read_profile(client, rng, users, toolkit):
+    user = rng.choice(users)
+    response = await client.get(f"/api/profile/{user.user_id}/getprofile", headers=auth_headers(user))
+    return "GET /api/profile/{user_id}/getprofile", response
+
+async def op_write_skills(client, rng, users, toolkit):
+    user = rng.choice(users)
+    response = await client.post(
+        f"/api/profile/{user.user_id}/skill_info", json={"skills": seed_data.skill_list(rng, 8)}, headers=auth_headers(user)
+    )
+    return "POST /api/profile/{user_id}/skill_info", response
+
+async def op_write_workex(client, rng, users, toolkit):
+    user = rng.choice(users)
+    response = await client.post(
+        f"/api/profile/{user.user_id}/workex_info", json={"work_experience": seed_data.work_entries(rng, 3)}, headers=auth_headers(user)
+    )
+    return "POST /api/profile/{user_id}/workex_info", response
+
+async def op_write_projects(client, rng, users, toolkit):
+    user = rng.choice(users)
+    response = await client.post(
+        f"/api/profile/{user.user_id}/project_info", json={"projects": seed_data.project_entries(rng, 3)}, headers=auth_headers(user)
+    )
+    return "POST /api/profile/{user_id}/project_info", response
+
+async def op_login(client, rng, users, toolkit):
+    user = rng.choice(users)
+    response = await client.post("/api/auth/login", json={"email": user.email, "password": user.password})
+    return "POST /api/auth/login", response
+
+async def op_google(client, rng, users, toolkit):
+    user = rng.choice(users)
+    response = await client.post("/api/auth/google", json={"idToken": toolkit.mint_id_token(user.uid)})
+    return "POST /api/auth/google", response
+
+async def op_signup(client, rng, users, toolkit):
+    suffix = f"{rng.getrandbits(40):x}"
+    response = await client.post("/api/auth/signup", json={
+        "email": f"new{suffix}@bench.example.com", "password": "benchpass123", "username": f"new{suffix}"
+    })
+    return "POST /api/auth/signup", response
+
+# Workload class -> list of (operation, relative weight within the class)
+WORKLOADS = {
+    "read": [(op_read_profile, 1)],
+    "write": [(op_write_skills, 2), (op_write_workex, 1), (op_write_projects, 1)],
+    "auth": [(op_login, 2), (op_google, 2), (op_signup, 1)],
+}
+
+def parse_mix(value):
+    """Parse "read=60,write=25,auth=15" into a weighted operation table"""
+    table = []
+    for part in value.split(","):
+        name, weight = part.split("=")
+        ops = WORKLOADS[name.strip()]
+        total = sum(op_weight for _, op_weight in ops)
+        table.extend((op, float(weight) * op_weight / total) for op, op_weight in ops)
+    return [op for op, _ in table], [weight for _, weight in table]
+
+async def run_load(app, toolkit, users, mix, concurrency, total_requests, seed):
+    operations, weights = parse_mix(mix)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    remaining = total_requests
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(worker_id):
+            nonlocal remaining
+            rng = random.Random(seed * 7919 + worker_id)
+            while remaining > 0:
+                remaining -= 1
+                operation = rng.choices(operations, weights)[0]
+                start = time.perf_counter()
+                route, response = await operation(client, rng, users, toolkit)
+                latencies[route].append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors[route] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    routes = {}
+    for route, values in sorted(latencies.items()):
+        routes[route] = summarize(values, elapsed)
+        routes[route]["errors"] = errors[route]
+    overall = summarize([value for values in latencies.values() for value in values], elapsed)
+    overall["errors"] = sum(errors.values())
+    return {"elapsed_seconds": round(elapsed, 3), "overall": overall, "routes": routes}
+
+def main():
+    parser = argparse.ArgumentParser(description="Uply API load test")
+    parser.add_argument("--mongodb-uri", help="Local mongod URI (db name must end in _bench); default: mongomock")
+    parser.add_argument("--profiles", type=int, default=1000, help="Number of profiles to seed")
+    parser.add_argument("--entries", type=int, default=3, help="Entries per list section (profile size)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100, help="Requests run before measuring")
+    parser.add_argument("--mix", default="read=60,write=25,auth=15")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    app, toolkit = boot_app(args.mongodb_uri)
+    reset_database()
+    users = seed_profiles(toolkit, args.profiles, args.entries, args.seed)
+
+    if args.warmup:
+        asyncio.run(run_load(app, toolkit, users, args.mix, args.concurrency, args.warmup, args.seed + 1))
+    results = asyncio.run(run_load(app, toolkit, users, args.mix, args.concurrency, args.requests, args.seed))
+
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "backend": "mongod" if args.mongodb_uri else "mongomock",
+            "profiles": args.profiles,
+            "entries": args.entries,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        **results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Profile read path benchmark: stdlib JSON vs orjson response encoding
+
+Times the three stages of GET /api/profile/{user_id}/getprofile separately on
+seeded profiles: the mongoengine fetch, the previous encoding
+(jsonable_encoder + Starlette's json.dumps JSONResponse) and the current
+encoding (FastJSONResponse over pre-encoded bytes), then the whole route
+end-to-end. Both encodings are checked to produce the same JSON.
+
+Usage (from the server directory):
+    python -m benchmarks.profile_read --profiles 500 --entries 10 --rounds 5
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+from benchmarks.harness import auth_headers, boot_app, reset_database, seed_profiles, git_revision, summarize
+
+def fetch_profile(user_id):
+    from models.profile_schema import Profile
+    return Profile.objects(id=user_id).exclude("password", "username").first()
+
+def encode_stdlib(profile_dict):
+    """Encoding used before FastJSONResponse"""
+    return JSONResponse(jsonable_encoder(profile_dict)).body
+
+def encode_fast(profile_dict):
+    from utils.json_response import FastJSONResponse, dumps
+    return FastJSONResponse(dumps(profile_dict)).body
+
+def time_stage(function, inputs, rounds):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in inputs:
+            begin = time.perf_counter()
+            function(value)
+            latencies.append(time.perf_counter() - begin)
+    return summarize(latencies, time.perf_counter() - start)
+
+async def time_route(app, users, rounds):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for user in users:
+                begin = time.perf_counter()
+                response = await client.get(f"/api/profile/{user.user_id}/getprofile", headers=auth_headers(user))
+                latencies.append(time.perf_counter() - begin)
+                response.raise_for_status()
+        elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile read path benchmark")
+    parser.add_argument("--mongodb-uri", help="Local mongod URI (db name must end in _bench); default: mongomock")
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--entries", type=int, default=10, help="Entries per list section (profile size)")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes over all profiles per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    from utils.profile_utils import mongo_to_dict
+
+    app, toolkit = boot_app(args.mongodb_uri)
+    reset_database()
+    users = seed_profiles(toolkit, args.profiles, args.entries, args.seed)
+
+    user_ids = [user.user_id for user in users]
+    profile_dicts = [mongo_to_dict(fetch_profile(user_id)) for user_id in user_ids]
+
+    for profile_dict in profile_dicts:
+        if json.loads(encode_stdlib(profile_dict)) != json.loads(encode_fast(profile_dict)):
+            raise AssertionError("stdlib and orjson encodings differ")
+
+    stdlib = time_stage(encode_stdlib, profile_dicts, args.rounds)
+    fast = time_stage(encode_fast, profile_dicts, args.rounds)
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "backend": "mongod" if args.mongodb_uri else "mongomock",
+            "profiles": args.profiles,
+            "entries": args.entries,
+            "rounds": args.rounds,
+            "mean_body_bytes": round(sum(len(encode_fast(d)) for d in profile_dicts) / len(profile_dicts)),
+        },
+        "fetch": time_stage(fetch_profile, user_ids, args.rounds),
+        "encode_stdlib": stdlib,
+        "encode_orjson": fast,
+        "encode_speedup": round(stdlib["mean_ms"] / fast["mean_ms"], 2) if fast["mean_ms"] else None,
+        "route": asyncio.run(time_route(app, users, args.rounds)),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Write-path cost and storage of the profile revision log
+
+Edits one work experience entry per request (the common case: a field of
+one entry changed) through POST /api/profile/{id}/workex_info and reports:
+
+- the route's latency with REVISION_HISTORY off and on
+- the time the revision handler adds on the request thread (queueing only)
+- the background writer's cost per revision (diff, version bump, insert)
+- stored bytes per revision against storing the whole section each time
+- rebuilding a section at the oldest and newest versions
+
+Usage (from the server directory):
+    python -m benchmarks.revisions --profiles 50 --edits 20 --entries 10
+"""
+import argparse
+import asyncio
+import json
+import time
+import bson
+import httpx
+from benchmarks.harness import auth_headers, boot_app, reset_database, seed_profiles, git_revision, summarize
+
+async def edit_work(app, users, work, edits):
+    """One single-field workEx edit per user per round; returns per-request latencies"""
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for round_index in range(edits):
+            for user in users:
+                entries = work[user.user_id]
+                entries[round_index % len(entries)]["company"] = f"Company {round_index}"
+                begin = time.perf_counter()
+                response = await client.post(
+                    f"/api/profile/{user.user_id}/workex_info",
+                    json={"work_experience": entries}, headers=auth_headers(user)
+                )
+                latencies.append(time.perf_counter() - begin)
+                response.raise_for_status()
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile revision log benchmark")
+    parser.add_argument("--mongodb-uri", help="Local mongod URI (db name must end in _bench); default: mongomock")
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument("--edits", type=int, default=20, help="Edits per profile and mode")
+    parser.add_argument("--entries", type=int, default=10, help="Entries per list section (profile size)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    app, toolkit = boot_app(args.mongodb_uri)
+    reset_database()
+    users = seed_profiles(toolkit, args.profiles, args.entries, args.seed)
+
+    import services.profile_history as history
+    from models.profile_schema import Profile
+    from services.profile_events import subscribe, unsubscribe
+    from utils.profile_utils import mongo_to_dict
+
+    work = {}
+    for user in users:
+        entries = mongo_to_dict(Profile.objects(id=user.user_id).only("workEx").first().workEx)
+        work[user.user_id] = [{key: value for key, value in entry.items() if value is not None} for entry in entries]
+
+    # Time the handler on the request thread through a wrapper subscribed in its place
+    handler_latencies = []
+    def timed_handler(*change):
+        begin = time.perf_counter()
+        history.on_section_change(*change)
+        handler_latencies.append(time.perf_counter() - begin)
+    unsubscribe(history.on_section_change)
+    subscribe(timed_handler)
+
+    results = {}
+    for mode, enabled in (("history_off", False), ("history_on", True)):
+        history.REVISION_HISTORY = enabled
+        handler_latencies.clear()
+        latencies, elapsed = asyncio.run(edit_work(app, users, work, args.edits))
+        results[mode] = summarize(latencies, elapsed)
+        if enabled:
+            results["handler"] = summarize(handler_latencies, sum(handler_latencies))
+    unsubscribe(timed_handler)
+    subscribe(history.on_section_change)
+    history.flush(timeout=120)
+
+    # The writer's cost per revision, replaying recorded changes synchronously
+    sample = []
+    for user in users:
+        entries = [dict(entry) for entry in work[user.user_id]]
+        for round_index in range(args.edits):
+            before = [dict(entry) for entry in entries]
+            entries[round_index % len(entries)]["company"] = f"Replay {round_index}"
+            sample.append((user.user_id, "workEx", before, [dict(entry) for entry in entries], None))
+    start = time.perf_counter()
+    for offset in range(0, len(sample), history.BATCH_SIZE):
+        history.record_revisions(sample[offset:offset + history.BATCH_SIZE])
+    writer_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+    revisions = list(history.revisions_collection().find({"section": "workEx"}))
+    stored = sum(len(bson.encode(revision)) for revision in revisions)
+    full = sum(len(bson.encode({"section": work[revision["profileId"]]})) for revision in revisions)
+
+    user_id = users[0].user_id
+    latest = history.current_version(user_id)
+    rebuild = {}
+    for label, version in (("oldest", 1), ("newest", latest)):
+        begin = time.perf_counter()
+        history.section_at(user_id, "workEx", version)
+        rebuild[f"{label}_ms"] = round((time.perf_counter() - begin) * 1000, 3)
+
+    off, on = results["history_off"]["mean_ms"], results["history_on"]["mean_ms"]
+    report = {
+        "revision": git_revision(),
+        "config": {
+            "backend": "mongod" if args.mongodb_uri else "mongomock",
+            "profiles": args.profiles,
+            "edits": args.edits,
+            "entries": args.entries,
+            "snapshot_interval": history.REVISION_SNAPSHOT_INTERVAL,
+        },
+        "route": results,
+        "route_overhead_ms": round(on - off, 3) if on is not None and off is not None else None,
+        "writer_ms_per_revision": round(writer_ms, 3),
+        "storage": {
+            "revisions": len(revisions),
+            "mean_revision_bytes": round(stored / len(revisions)) if revisions else None,
+            "mean_full_section_bytes": round(full / len(revisions)) if revisions else None,
+            "ratio": round(stored / full, 3) if full else None,
+        },
+        "rebuild_workex": rebuild,
+    }
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
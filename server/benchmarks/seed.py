@@ -0,0 +1,152 @@
+"""
+Deterministic generators for realistic profile data
+
+Section payloads use the same shape the API accepts, so they can be both
+inserted directly and POSTed to the section routes.
+"""
+import random
+
+INSTITUTIONS = [
+    "Massachusetts Institute of Technology", "Stanford University", "IIT Delhi", "IIT Bombay",
+    "University of Cambridge", "ETH Zurich", "National University of Singapore", "BITS Pilani",
+    "University of Toronto", "Carnegie Mellon University", "Delhi Technological University",
+]
+DEGREES = ["B.Tech", "B.Sc", "M.Tech", "M.Sc", "MBA", "PhD", "B.E", "M.S"]
+FIELDS = ["Computer Science", "Electrical Engineering", "Mathematics", "Data Science", "Mechanical Engineering"]
+COMPANIES = [
+    "Google", "Microsoft", "Amazon", "Flipkart", "Infosys", "Goldman Sachs", "Atlassian",
+    "Razorpay", "Zomato", "Swiggy", "Adobe", "Uber", "Meta", "Stripe", "Tata Consultancy Services",
+]
+POSITIONS = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "Product Manager", "SDE Intern"]
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "MongoDB", "FastAPI", "Docker",
+    "Kubernetes", "AWS", "GCP", "SQL", "Go", "Rust", "Java", "C++", "Machine Learning", "PyTorch",
+    "TensorFlow", "GraphQL", "Redis", "Kafka", "Linux", "Git", "System Design",
+]
+ISSUERS = ["Coursera", "AWS", "Google Cloud", "Microsoft", "Udemy", "HackerRank", "Linux Foundation"]
+
+WORDS = (
+    "built designed implemented scalable service pipeline latency throughput users data platform "
+    "api backend frontend realtime distributed cache queue search analytics dashboard migration "
+    "reduced improved automated deployed monitored optimized tested refactored integrated"
+).split()
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def _date(rng, start_year=2012, end_year=2024):
+    return f"{rng.randint(start_year, end_year)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+def academic_entries(rng, count):
+    return [
+        {
+            "institution": rng.choice(INSTITUTIONS),
+            "degree": rng.choice(DEGREES),
+            "fieldOfStudy": rng.choice(FIELDS),
+            "startDate": _date(rng, 2008, 2018),
+            "endDate": _date(rng, 2012, 2022),
+            "description": _text(rng, 20),
+            "grade": f"{rng.uniform(6, 10):.2f}",
+        }
+        for _ in range(count)
+    ]
+
+def work_entries(rng, count):
+    entries = []
+    for i in range(count):
+        current = i == 0 and rng.random() < 0.5
+        entry = {
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(POSITIONS),
+            "startDate": _date(rng),
+            "description": _text(rng, 60),
+            "isCurrent": current,
+        }
+        if not current:
+            entry["endDate"] = _date(rng)
+        entries.append(entry)
+    return entries
+
+def project_entries(rng, count):
+    return [
+        {
+            "title": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}",
+            "description": _text(rng, 80),
+            "startDate": _date(rng),
+            "endDate": _date(rng),
+            "technologiesUsed": rng.sample(SKILLS, 4),
+            "projectLink": f"https://github.com/example/project-{rng.randint(1, 10**6)}",
+            "isOpenSource": rng.random() < 0.5,
+        }
+        for _ in range(count)
+    ]
+
+def certification_entries(rng, count):
+    return [
+        {
+            "name": f"{rng.choice(SKILLS)} Certification",
+            "issuingOrganization": rng.choice(ISSUERS),
+            "issueDate": _date(rng),
+            "credentialId": f"CERT-{rng.randint(10**5, 10**6)}",
+            "credentialURL": f"https://certs.example.com/{rng.randint(1, 10**6)}",
+        }
+        for _ in range(count)
+    ]
+
+def achievement_entries(rng, count):
+    return [
+        {"title": f"Winner - {rng.choice(WORDS).capitalize()} Hackathon", "date": _date(rng),
+         "description": _text(rng, 30), "issuer": rng.choice(COMPANIES)}
+        for _ in range(count)
+    ]
+
+def publication_entries(rng, count):
+    return [
+        {"title": _text(rng, 8), "publisher": "IEEE", "publicationDate": _date(rng),
+         "description": _text(rng, 50), "link": f"https://doi.org/10.1000/{rng.randint(1, 10**6)}"}
+        for _ in range(count)
+    ]
+
+def skill_list(rng, count):
+    return rng.sample(SKILLS, min(count, len(SKILLS)))
+
+def personal_info(rng, index, email):
+    return {
+        "firstName": f"User{index}",
+        "lastName": "Bench",
+        "email": email,
+        "phone": f"+91{rng.randint(7 * 10**9, 10**10 - 1)}",
+        "dateOfBirth": _date(rng, 1985, 2003),
+        "address": {"street": f"{rng.randint(1, 999)} Main Road", "city": "Bengaluru",
+                    "state": "KA", "country": "India", "zipCode": f"{rng.randint(560001, 560100)}"},
+        "resume": "",
+    }
+
+def socials(index):
+    return {"linkedIn": f"https://linkedin.com/in/user{index}", "github": f"https://github.com/user{index}"}
+
+def profile_document(index, entries=3, seed=0):
+    """
+    Build a full profile as a plain dict matching the Profile schema
+
+    Args:
+        index: Sequence number, used for unique username/email/uid
+        entries: Number of entries per list section (scales document size)
+        seed: Base random seed so runs are reproducible
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    email = f"user{index}@bench.example.com"
+    return {
+        "username": f"benchuser{index}",
+        "password": "",
+        "firebase_uid": f"benchuid{index:08d}",
+        "personalInfo": personal_info(rng, index, email),
+        "academic": academic_entries(rng, max(1, entries // 2)),
+        "projects": project_entries(rng, entries),
+        "skills": skill_list(rng, entries * 3),
+        "workEx": work_entries(rng, entries),
+        "certifications": certification_entries(rng, entries),
+        "achievements": achievement_entries(rng, entries),
+        "publications": publication_entries(rng, max(1, entries // 2)),
+        "socials": socials(index),
+    }
@@ -0,0 +1,68 @@
+"""
+Per-request auth cost with session tokens
+
+Times issuing a session token, verifying it directly, and the full
+middlewares.auth.verify_token path a protected route would run. The budget
+for per-request auth is 50µs.
+
+Usage (from the server directory):
+    python -m benchmarks.session_auth --iterations 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+from fastapi.security import HTTPAuthorizationCredentials
+from benchmarks.harness import git_revision, percentile
+
+def time_calls(function, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    to_us = lambda value: round(value * 1e6, 2)
+    return {
+        "count": iterations,
+        "mean_us": to_us(sum(latencies) / iterations),
+        "p50_us": to_us(percentile(latencies, 0.50)),
+        "p99_us": to_us(percentile(latencies, 0.99)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Session token auth benchmark")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    from middlewares.auth import verify_token
+    from services.sessions import issue_session, verify_session
+
+    token, _ = issue_session("benchuid00000000", "0123456789abcdef01234567", "user0@bench.example.com", "benchuser0")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def run_dependency():
+        coroutine = verify_token(credentials)
+        try:
+            coroutine.send(None)
+        except StopIteration:
+            pass
+
+    report = {
+        "revision": git_revision(),
+        "token_bytes": len(token),
+        "issue_session": time_calls(lambda: issue_session("benchuid00000000", "0123456789abcdef01234567"), args.iterations),
+        "verify_session": time_calls(lambda: verify_session(token), args.iterations),
+        "verify_token": time_calls(run_dependency, args.iterations),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
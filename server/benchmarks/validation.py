@@ -0,0 +1,101 @@
+"""
+Validation cost per 1k entries for every profile section
+
+For each section, times the per-entry validate_* wrappers (how the section
+routes called validation before the schemas existed: one traced call per
+entry) against one Schema.validate pass over the whole array, on valid data
+and on data where about a fifth of the entries are broken. Also times the
+whole-document check used by bulk import.
+
+Usage (from the server directory):
+    python -m benchmarks.validation --entries 1000 --rounds 20
+"""
+import argparse
+import json
+import random
+import time
+from benchmarks import seed
+from benchmarks.harness import git_revision
+
+def break_entry(rng, entry):
+    """Drop one field and blank another, which fails most sections' rules"""
+    entry = dict(entry)
+    keys = list(entry)
+    entry.pop(rng.choice(keys), None)
+    entry[rng.choice(keys)] = ""
+    return entry
+
+def per_1k_us(function, value, count, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function(value)
+    elapsed = time.perf_counter() - start
+    return round(elapsed / rounds / count * 1000 * 1e6, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile validation benchmark")
+    parser.add_argument("--entries", type=int, default=1000, help="Entries per section array")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    from controllers.profile.academic import ACADEMIC_SCHEMA, validate_academic_record
+    from controllers.profile.achievement import ACHIEVEMENT_SCHEMA, validate_achievement
+    from controllers.profile.certification import CERTIFICATION_SCHEMA, validate_certification
+    from controllers.profile.personal_info import PERSONAL_INFO_SCHEMA, validate_personal_info
+    from controllers.profile.project import PROJECT_SCHEMA, validate_project
+    from controllers.profile.publication import PUBLICATION_SCHEMA, validate_publication
+    from controllers.profile.skills import SKILLS_SCHEMA
+    from controllers.profile.socials import SOCIALS_SCHEMA, validate_social_links
+    from controllers.profile.workex import WORK_EXPERIENCE_SCHEMA, validate_work_experience
+    from services.profile_transfer import validate_profile_document
+
+    rng = random.Random(args.seed)
+    n = args.entries
+    sections = {
+        "academic": (ACADEMIC_SCHEMA, validate_academic_record, seed.academic_entries(rng, n)),
+        "projects": (PROJECT_SCHEMA, validate_project, seed.project_entries(rng, n)),
+        "workEx": (WORK_EXPERIENCE_SCHEMA, validate_work_experience, seed.work_entries(rng, n)),
+        "certifications": (CERTIFICATION_SCHEMA, validate_certification, seed.certification_entries(rng, n)),
+        "achievements": (ACHIEVEMENT_SCHEMA, validate_achievement, seed.achievement_entries(rng, n)),
+        "publications": (PUBLICATION_SCHEMA, validate_publication, seed.publication_entries(rng, n)),
+        "personalInfo": (PERSONAL_INFO_SCHEMA, validate_personal_info,
+                         [seed.personal_info(rng, i, f"user{i}@bench.example.com") for i in range(n)]),
+        "socials": (SOCIALS_SCHEMA, validate_social_links, [seed.socials(i) for i in range(n)]),
+    }
+
+    results = {}
+    for name, (schema, validate_one, entries) in sections.items():
+        broken = [break_entry(rng, entry) if rng.random() < 0.2 else entry for entry in entries]
+        per_entry = lambda values: [validate_one(value) for value in values]
+        results[name] = {
+            "per_entry_us_per_1k": per_1k_us(per_entry, entries, n, args.rounds),
+            "batch_us_per_1k": per_1k_us(schema.validate, entries, n, args.rounds),
+            "per_entry_broken_us_per_1k": per_1k_us(per_entry, broken, n, args.rounds),
+            "batch_broken_us_per_1k": per_1k_us(schema.validate, broken, n, args.rounds),
+            "broken_issues": len(schema.validate(broken)),
+        }
+
+    skills = [rng.choice(seed.SKILLS) for _ in range(n)]
+    results["skills"] = {"batch_us_per_1k": per_1k_us(SKILLS_SCHEMA.validate, skills, n, args.rounds)}
+
+    documents = [seed.profile_document(i, 3, args.seed) for i in range(n)]
+    whole = lambda values: [validate_profile_document(value) for value in values]
+
+    report = {
+        "revision": git_revision(),
+        "config": {"entries": n, "rounds": args.rounds},
+        "sections": results,
+        "import_document_us_per_1k": per_1k_us(whole, documents, n, args.rounds),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,33 @@ import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
 import mongoengine
+from services.metrics import MongoCommandListener
+from services.tracing import MongoTracingListener
+from services.index_advisor import SlowQueryListener
+from services.load_shedding import mongo_pool_listener
 
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGODB_URI")
 
+# Feed Mongo command counts/latencies into metrics, emit a span per command
+# and record slow commands with their explain plans; count operations waiting
+# for a pooled connection for load shedding
+mongo_listeners = [MongoCommandListener(), MongoTracingListener(), SlowQueryListener(), mongo_pool_listener]
+
 def connect_db():
     try:
         if not MONGO_URI:
             raise ValueError("MONGODB_URI is not set in the environment variables.")
         
         # Connect using pymongo
-        client = MongoClient(MONGO_URI)
+        client = MongoClient(MONGO_URI, event_listeners=mongo_listeners)
         
         # Extract database name from the URI
         db_name = MONGO_URI.split("/")[-1].split("?")[0]
         
         # Connect `mongoengine`
-        mongoengine.connect(db=db_name, host=MONGO_URI, alias="default")
+        mongoengine.connect(db=db_name, host=MONGO_URI, alias="default", event_listeners=mongo_listeners)
         
         print("✅ Database is connected! 🚀")
         return client
@@ -0,0 +1,32 @@
+from services.analytics import DIMENSIONS, get_top_values, rebuild_aggregates
+from utils.profile_utils import format_error_response, format_success_response
+
+def get_aggregates(dimension, limit=20):
+    """Return the most common values for an analytics dimension"""
+    if dimension not in DIMENSIONS:
+        return format_error_response(
+            f"Unknown dimension '{dimension}'. Expected one of: {', '.join(DIMENSIONS)}",
+            404
+        )
+
+    if limit < 1 or limit > 100:
+        return format_error_response("Limit must be between 1 and 100.")
+
+    try:
+        return format_success_response(
+            "Aggregates fetched successfully.",
+            {"dimension": dimension, "values": get_top_values(dimension, limit)}
+        )
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+def rebuild_all_aggregates(dimension=None):
+    """Recompute materialized aggregates from the profiles collection"""
+    if dimension is not None and dimension not in DIMENSIONS:
+        return format_error_response(f"Unknown dimension '{dimension}'.", 404)
+
+    try:
+        rebuilt = rebuild_aggregates([dimension] if dimension else None)
+        return format_success_response("Aggregates rebuilt successfully.", {"dimensions": rebuilt})
+    except Exception as e:
+        return format_error_response(str(e), 500)
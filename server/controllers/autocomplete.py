@@ -0,0 +1,24 @@
+from services.autocomplete import DIMENSIONS, MAX_LIMIT, suggest
+from utils.profile_utils import format_error_response, format_success_response
+
+def get_suggestions(field, query, limit=10):
+    """Return popularity-ranked suggestions for a free-text profile field"""
+    if field not in DIMENSIONS:
+        return format_error_response(
+            f"Unknown field '{field}'. Expected one of: {', '.join(DIMENSIONS)}",
+            404
+        )
+
+    if not query or not query.strip():
+        return format_error_response("Query must be a non-empty string.")
+
+    if limit < 1 or limit > MAX_LIMIT:
+        return format_error_response(f"Limit must be between 1 and {MAX_LIMIT}.")
+
+    try:
+        return format_success_response(
+            "Suggestions fetched successfully.",
+            {"field": field, "suggestions": suggest(field, query, limit)}
+        )
+    except Exception as e:
+        return format_error_response(str(e), 500)
@@ -1,27 +1,21 @@
 from bson import ObjectId
-from datetime import datetime
-import re
 from models.profile_schema import Profile, Academic
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import FALSY, Schema, entry_errors, matches, required
 
+ACADEMIC_SCHEMA = Schema(
+    required("institution", "degree", "fieldOfStudy", "startDate", missing=FALSY),
+    # Dates are accepted as plain strings
+    matches("grade", r'^[A-Fa-f0-9.]+$', lambda record: f"Invalid grade format for {record.get('institution', 'record')}."),
+)
+
+@traced
 def validate_academic_record(record):
     """Validate a single academic record"""
-    errors = []
-    
-    # Required fields check
-    required_fields = ["institution", "degree", "fieldOfStudy", "startDate"]
-    missing_fields = [field for field in required_fields if not record.get(field)]
-    
-    if missing_fields:
-        errors.append(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    # Removed date validation - accepting dates as strings
-    
-    # Grade format validation (if provided)
-    if record.get("grade") and not re.match(r'^[A-Fa-f0-9.]+$', record["grade"]):
-        errors.append(f"Invalid grade format for {record.get('institution', 'record')}.")
-    
-    return errors
+    return ACADEMIC_SCHEMA.errors(record)
 
+@traced
 def update_academic_info(user_id, academic_records):
     """Update a user's academic information"""
     
@@ -29,12 +23,8 @@ def update_academic_info(user_id, academic_records):
     if not isinstance(academic_records, list) or len(academic_records) == 0:
         return {"success": False, "errors": ["Academics data must be a non-empty array."]}
     
-    # Validate each academic record
-    all_errors = []
-    for i, record in enumerate(academic_records):
-        errors = validate_academic_record(record)
-        if errors:
-            all_errors.append(f"Record #{i+1} ({record.get('institution', '')}): {', '.join(errors)}")
+    # Validate all academic records in one pass
+    all_errors = entry_errors(ACADEMIC_SCHEMA.validate(academic_records), academic_records, "Record", "institution")
     
     if all_errors:
         return {"success": False, "errors": all_errors}
@@ -60,8 +50,10 @@ def update_academic_info(user_id, academic_records):
         ]
         
         # Replace existing academic entries
+        previous = section_snapshot(profile.academic)
         profile.academic = academic_entries
         profile.save()
+        publish_section_change(user_id, "academic", previous, section_snapshot(profile.academic))
         
         return {
             "success": True,
@@ -1,19 +1,19 @@
 from bson import ObjectId
 from models.profile_schema import Profile, Achievement
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import Schema, entry_errors, required
 
+ACHIEVEMENT_SCHEMA = Schema(
+    required("title", "date"),
+)
+
+@traced
 def validate_achievement(achievement):
     """Validate a single achievement entry"""
-    errors = []
-    
-    # Required fields check
-    required_fields = ["title", "date"]
-    missing_fields = [field for field in required_fields if achievement.get(field) is None]
-    
-    if missing_fields:
-        errors.append(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    return errors
+    return ACHIEVEMENT_SCHEMA.errors(achievement)
 
+@traced
 def update_achievements(user_id, achievements):
     """Update a user's achievements"""
     
@@ -21,12 +21,8 @@ def update_achievements(user_id, achievements):
     if not isinstance(achievements, list) or len(achievements) == 0:
         return {"success": False, "errors": ["Achievements must be a non-empty array."]}
     
-    # Validate each achievement
-    all_errors = []
-    for i, achievement in enumerate(achievements):
-        errors = validate_achievement(achievement)
-        if errors:
-            all_errors.append(f"Achievement #{i+1} ({achievement.get('title', '')}): {', '.join(errors)}")
+    # Validate all achievements in one pass
+    all_errors = entry_errors(ACHIEVEMENT_SCHEMA.validate(achievements), achievements, "Achievement", "title")
     
     if all_errors:
         return {"success": False, "errors": all_errors}
@@ -49,8 +45,10 @@ def update_achievements(user_id, achievements):
         ]
         
         # Replace existing achievements
+        previous = section_snapshot(profile.achievements)
         profile.achievements = achievement_entries
         profile.save()
+        publish_section_change(user_id, "achievements", previous, section_snapshot(profile.achievements))
         
         return {
             "success": True,
@@ -1,23 +1,20 @@
 from bson import ObjectId
 from models.profile_schema import Profile, Certification
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import Schema, entry_errors, required, starts_with
 
+CERTIFICATION_SCHEMA = Schema(
+    required("name", "issuingOrganization", "issueDate"),
+    starts_with("credentialURL", ("http://", "https://"), "Credential URL must start with http:// or https://"),
+)
+
+@traced
 def validate_certification(certification):
     """Validate a single certification entry"""
-    errors = []
-    
-    # Required fields check
-    required_fields = ["name", "issuingOrganization", "issueDate"]
-    missing_fields = [field for field in required_fields if certification.get(field) is None]
-    
-    if missing_fields:
-        errors.append(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    # URL validation for credential URL if provided
-    if certification.get("credentialURL") and not certification["credentialURL"].startswith(("http://", "https://")):
-        errors.append("Credential URL must start with http:// or https://")
-    
-    return errors
+    return CERTIFICATION_SCHEMA.errors(certification)
 
+@traced
 def update_certifications(user_id, certifications):
     """Update a user's certifications"""
     
@@ -25,12 +22,8 @@ def update_certifications(user_id, certifications):
     if not isinstance(certifications, list) or len(certifications) == 0:
         return {"success": False, "errors": ["Certifications must be a non-empty array."]}
     
-    # Validate each certification
-    all_errors = []
-    for i, cert in enumerate(certifications):
-        errors = validate_certification(cert)
-        if errors:
-            all_errors.append(f"Certification #{i+1} ({cert.get('name', '')}): {', '.join(errors)}")
+    # Validate all certifications in one pass
+    all_errors = entry_errors(CERTIFICATION_SCHEMA.validate(certifications), certifications, "Certification", "name")
     
     if all_errors:
         return {"success": False, "errors": all_errors}
@@ -55,8 +48,10 @@ def update_certifications(user_id, certifications):
         ]
         
         # Replace existing certifications
+        previous = section_snapshot(profile.certifications)
         profile.certifications = certification_entries
         profile.save()
+        publish_section_change(user_id, "certifications", previous, section_snapshot(profile.certifications))
         
         return {
             "success": True,
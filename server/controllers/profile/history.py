@@ -0,0 +1,104 @@
+from bson import ObjectId
+from mongoengine.errors import NotUniqueError
+from models.profile_schema import Profile
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from services.profile_history import current_version, list_revisions, sections_at
+from utils.profile_utils import format_error_response, format_success_response, mongo_to_dict
+
+# Sections a past version can be restored into; resumeFile points at a stored
+# file that may since have been swept, and the account fields are not sections
+RESTORABLE_SECTIONS = (
+    "personalInfo", "academic", "projects", "skills", "workEx",
+    "certifications", "achievements", "publications", "socials",
+)
+
+@traced
+def get_profile_history(user_id, before=None, limit=50):
+    """Revisions of the profile, newest first"""
+    try:
+        if not Profile.objects(id=ObjectId(user_id)).only("id").first():
+            return format_error_response("User not found.", 404)
+
+        revisions = list_revisions(user_id, before, limit)
+        return format_success_response("Profile history found.", {
+            "version": current_version(user_id),
+            "revisions": revisions,
+        })
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+def _check_version(user_id, version):
+    latest = current_version(user_id)
+    if version < 0 or version > latest:
+        return format_error_response(f"Version must be between 0 and {latest}.", 404)
+    return None
+
+@traced
+def get_profile_version(user_id, version):
+    """The profile's sections as they were at a version"""
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).exclude("password", "username").first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+        error = _check_version(user_id, version)
+        if error:
+            return error
+
+        profile_dict = mongo_to_dict(profile)
+        profile_dict.update(sections_at(user_id, version))
+        return format_success_response("Profile version found.", {"version": version, "profile": profile_dict})
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+@traced
+def restore_profile_version(user_id, version, sections=None):
+    """
+    Set sections (all restorable ones unless listed) back to their value at a version
+
+    The restore is saved like any edit, so it becomes a new revision and can
+    itself be undone.
+    """
+    try:
+        sections = sections or list(RESTORABLE_SECTIONS)
+        unknown = [section for section in sections if section not in RESTORABLE_SECTIONS]
+        if unknown:
+            return format_error_response(f"Unknown sections: {', '.join(unknown)}")
+
+        profile = Profile.objects(id=ObjectId(user_id)).first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+        error = _check_version(user_id, version)
+        if error:
+            return error
+
+        past = sections_at(user_id, version)
+        changed = {}
+        for section in sections:
+            # Sections without revisions have not changed since
+            if section not in past:
+                continue
+            previous = section_snapshot(getattr(profile, section))
+            if previous == past[section]:
+                continue
+            value = past[section]
+            setattr(profile, section, Profile._fields[section].to_python(value) if value is not None else None)
+            changed[section] = previous
+
+        if changed:
+            try:
+                profile.save()
+            except NotUniqueError:
+                return format_error_response("Email is already in use by another account.")
+            for section, previous in changed.items():
+                publish_section_change(user_id, section, previous, section_snapshot(getattr(profile, section)))
+
+        return format_success_response(
+            "Profile restored." if changed else "Profile already matches that version.",
+            {"restored": list(changed)}
+        )
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
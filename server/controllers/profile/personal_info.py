@@ -1,38 +1,24 @@
 from bson import ObjectId
-import re
+from mongoengine.errors import NotUniqueError
 from models.profile_schema import Profile, PersonalInfo, Address
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import FALSY, Schema, matches, required
 from utils.profile_utils import mongo_to_dict, format_error_response, format_success_response
 
+PERSONAL_INFO_SCHEMA = Schema(
+    required("firstName", "lastName", "email", "phone", missing=FALSY,
+             message="First name, last name, email, and phone are required."),
+    matches("email", r'^\S+@\S+\.\S+$', "Invalid email format."),
+    # Date of birth is accepted as a plain string
+)
+
+@traced
 def validate_personal_info(payload):
     """Validate the personal information payload"""
-    errors = []
-    
-    # Extract fields from payload
-    first_name = payload.get("firstName")
-    last_name = payload.get("lastName")
-    email = payload.get("email")
-    phone = payload.get("phone")
-    
-    # Required field validation
-    if not all([first_name, last_name, email, phone]):
-        errors.append("First name, last name, email, and phone are required.")
-
-    # Validate email format
-    if email and not re.match(r'^\S+@\S+\.\S+$', email):
-        errors.append("Invalid email format.")
-    
-    # We're no longer validating date format, accepting it as a string
-    
-    return errors
-
-def check_email_exists(email, user_id):
-    """Check if email exists for another user"""
-    existing_user = Profile.objects(
-        personalInfo__email=email,
-        id__ne=ObjectId(user_id)
-    ).first()
-    return existing_user is not None
+    return PERSONAL_INFO_SCHEMA.errors(payload)
 
+@traced
 def update_personal_info(user_id, payload):
     """Update a user's personal information"""
     # Validation
@@ -40,10 +26,6 @@ def update_personal_info(user_id, payload):
     if validation_errors:
         return format_error_response(validation_errors)
     
-    # Check email uniqueness
-    if payload.get("email") and check_email_exists(payload["email"], user_id):
-        return format_error_response("Email is already in use by another account.")
-    
     try:
         # Find the user profile
         profile = Profile.objects(id=ObjectId(user_id)).first()
@@ -62,6 +44,8 @@ def update_personal_info(user_id, payload):
                 zipCode=address_data.get("zipCode")
             )
         
+        previous = section_snapshot(profile.personalInfo)
+
         # Create/update personal info
         profile.personalInfo = PersonalInfo(
             firstName=payload.get("firstName"),
@@ -73,7 +57,12 @@ def update_personal_info(user_id, payload):
             resume=payload.get("resume")
         )
         
-        profile.save()
+        try:
+            profile.save()
+        except NotUniqueError:
+            # Enforced by the unique index on personalInfo.email
+            return format_error_response("Email is already in use by another account.")
+        publish_section_change(user_id, "personalInfo", previous, section_snapshot(profile.personalInfo))
         
         # Convert to dict for serialization
         profile_dict = mongo_to_dict(profile)
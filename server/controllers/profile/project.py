@@ -1,28 +1,23 @@
 from bson import ObjectId
-from datetime import datetime
-import re
 from models.profile_schema import Profile, Project
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import ABSENT, Schema, entry_errors, matches, of_type, required
 
+PROJECT_SCHEMA = Schema(
+    required("title", "description", "startDate", missing=ABSENT,
+             message="Title, description, and start date are required."),
+    # Dates are accepted as plain strings
+    matches("projectLink", r'^https?://\S+$', lambda project: f"Invalid project link format for {project.get('title', 'project')}."),
+    of_type("technologiesUsed", list, lambda project: f"Technologies used must be an array for {project.get('title', 'project')}."),
+)
+
+@traced
 def validate_project(project):
     """Validate a single project entry"""
-    errors = []
-    
-    # Required fields check
-    if not all(key in project for key in ["title", "description", "startDate"]):
-        errors.append("Title, description, and start date are required.")
-    
-    # Removed date validation - accepting dates as strings
-    
-    # Project link validation
-    if project.get("projectLink") and not re.match(r'^https?://\S+$', project["projectLink"]):
-        errors.append(f"Invalid project link format for {project.get('title', 'project')}.")
-    
-    # Technologies validation
-    if "technologiesUsed" in project and not isinstance(project["technologiesUsed"], list):
-        errors.append(f"Technologies used must be an array for {project.get('title', 'project')}.")
-    
-    return errors
+    return PROJECT_SCHEMA.errors(project)
 
+@traced
 def update_projects(user_id, projects):
     """Update a user's project information"""
     
@@ -30,12 +25,8 @@ def update_projects(user_id, projects):
     if not isinstance(projects, list) or len(projects) == 0:
         return {"success": False, "errors": ["Projects data must be a non-empty array."]}
     
-    # Validate each project
-    all_errors = []
-    for i, project in enumerate(projects):
-        errors = validate_project(project)
-        if errors:
-            all_errors.append(f"Project #{i+1} ({project.get('title', '')}): {', '.join(errors)}")
+    # Validate all projects in one pass
+    all_errors = entry_errors(PROJECT_SCHEMA.validate(projects), projects, "Project", "title")
     
     if all_errors:
         return {"success": False, "errors": all_errors}
@@ -61,8 +52,10 @@ def update_projects(user_id, projects):
         ]
         
         # Replace existing projects
+        previous = section_snapshot(profile.projects)
         profile.projects = project_entries
         profile.save()
+        publish_section_change(user_id, "projects", previous, section_snapshot(profile.projects))
         
         return {
             "success": True,
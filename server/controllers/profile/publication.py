@@ -1,23 +1,20 @@
 from bson import ObjectId
 from models.profile_schema import Profile, Publication
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import Schema, entry_errors, required, starts_with
 
+PUBLICATION_SCHEMA = Schema(
+    required("title", "publisher", "publicationDate"),
+    starts_with("link", ("http://", "https://"), "Publication link must start with http:// or https://"),
+)
+
+@traced
 def validate_publication(publication):
     """Validate a single publication entry"""
-    errors = []
-    
-    # Required fields check
-    required_fields = ["title", "publisher", "publicationDate"]
-    missing_fields = [field for field in required_fields if publication.get(field) is None]
-    
-    if missing_fields:
-        errors.append(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    # Link validation if provided
-    if publication.get("link") and not publication["link"].startswith(("http://", "https://")):
-        errors.append("Publication link must start with http:// or https://")
-    
-    return errors
+    return PUBLICATION_SCHEMA.errors(publication)
 
+@traced
 def update_publications(user_id, publications):
     """Update a user's publications"""
     
@@ -25,12 +22,8 @@ def update_publications(user_id, publications):
     if not isinstance(publications, list) or len(publications) == 0:
         return {"success": False, "errors": ["Publications must be a non-empty array."]}
     
-    # Validate each publication
-    all_errors = []
-    for i, pub in enumerate(publications):
-        errors = validate_publication(pub)
-        if errors:
-            all_errors.append(f"Publication #{i+1} ({pub.get('title', '')}): {', '.join(errors)}")
+    # Validate all publications in one pass
+    all_errors = entry_errors(PUBLICATION_SCHEMA.validate(publications), publications, "Publication", "title")
     
     if all_errors:
         return {"success": False, "errors": all_errors}
@@ -54,8 +47,10 @@ def update_publications(user_id, publications):
         ]
         
         # Replace existing publications
+        previous = section_snapshot(profile.publications)
         profile.publications = publication_entries
         profile.save()
+        publish_section_change(user_id, "publications", previous, section_snapshot(profile.publications))
         
         return {
             "success": True,
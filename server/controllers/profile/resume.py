@@ -0,0 +1,204 @@
+from bson import ObjectId
+from datetime import datetime, timezone
+from models.profile_schema import Profile, ResumeFile
+from controllers.profile.academic import update_academic_info
+from controllers.profile.certification import update_certifications
+from controllers.profile.project import update_projects
+from controllers.profile.skills import update_skills
+from controllers.profile.workex import update_work_experience
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from services.resume_parsing import SECTION_SCHEMAS, ResumeParserBusy, get_parse, request_parse
+from services.resume_storage import get_blob
+from utils.profile_utils import format_error_response, format_success_response
+
+# Section controllers a parsed draft is applied through, so drafts get the
+# same validation and change events as the section forms
+SECTION_UPDATES = {
+    "academic": update_academic_info,
+    "workEx": update_work_experience,
+    "projects": update_projects,
+    "certifications": update_certifications,
+    "skills": update_skills,
+}
+
+# Fields identifying an entry; draft entries matching an existing one are not added again
+ENTRY_KEYS = {
+    "academic": ("institution", "degree"),
+    "workEx": ("company", "position"),
+    "projects": ("title",),
+    "certifications": ("name",),
+}
+
+def _parse_status(record):
+    return {
+        "state": record["state"],
+        "draft": record.get("draft"),
+        "issues": record.get("issues"),
+        "error": record.get("error"),
+        "finishedAt": record.get("finishedAt"),
+    }
+
+@traced
+def attach_resume(user_id, blob, filename):
+    """Point a user's profile at a stored resume (replacing any previous one)"""
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).only("resumeFile").first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+
+        previous = section_snapshot(profile.resumeFile)
+        resume = ResumeFile(
+            sha256=blob["_id"],
+            filename=filename,
+            contentType=blob["contentType"],
+            size=blob["size"],
+            uploadedAt=datetime.now(timezone.utc)
+        )
+        # Only the reference is written; the rest of the document is untouched
+        Profile.objects(id=profile.id).update_one(set__resumeFile=resume)
+        publish_section_change(user_id, "resumeFile", previous, section_snapshot(resume))
+
+        return format_success_response("Resume uploaded successfully.", {"resume": section_snapshot(resume)})
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+@traced
+def get_resume(user_id):
+    """The resume reference of a profile and its stored blob"""
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).only("resumeFile").first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+        if not profile.resumeFile:
+            return format_error_response("No resume uploaded.", 404)
+
+        blob = get_blob(profile.resumeFile.sha256)
+        if blob is None:
+            return format_error_response("Resume file is missing.", 404)
+
+        return format_success_response("Resume found.", {"resume": profile.resumeFile, "blob": blob})
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+@traced
+def remove_resume(user_id):
+    """Unlink the uploaded resume (the file is removed by the orphan sweep)"""
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).only("resumeFile").first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+
+        previous = section_snapshot(profile.resumeFile)
+        Profile.objects(id=profile.id).update_one(unset__resumeFile=True)
+        publish_section_change(user_id, "resumeFile", previous, None)
+
+        return format_success_response("Resume removed successfully.")
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+@traced
+def start_resume_parse(user_id, force=False):
+    """Queue parsing of the uploaded resume (a cached result is returned as is)"""
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).only("resumeFile").first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+        if not profile.resumeFile:
+            return format_error_response("No resume uploaded.", 404)
+
+        record = request_parse(profile.resumeFile.sha256, force)
+        return format_success_response("Resume parsing started.", {"parse": _parse_status(record)})
+
+    except ResumeParserBusy as e:
+        return format_error_response(str(e), 503)
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+@traced
+def get_resume_parse(user_id):
+    """Status of the uploaded resume's parse, with the draft sections once done"""
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).only("resumeFile").first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+        if not profile.resumeFile:
+            return format_error_response("No resume uploaded.", 404)
+
+        record = get_parse(profile.resumeFile.sha256)
+        if record is None:
+            return format_error_response("Resume has not been parsed.", 404)
+
+        return format_success_response("Resume parse found.", {"parse": _parse_status(record)})
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
+
+def _entry_key(section, entry):
+    return tuple(str(entry.get(field) or "").strip().lower() for field in ENTRY_KEYS[section])
+
+@traced
+def apply_resume_draft(user_id, sections=None):
+    """
+    Add the valid entries of the parsed draft to the profile
+
+    Entries are appended to what the profile already has; entries failing
+    their section's schema, or already present, are skipped and counted.
+    Sections are saved one by one, so an error leaves earlier ones applied.
+    """
+    try:
+        profile = Profile.objects(id=ObjectId(user_id)).first()
+        if not profile:
+            return format_error_response("User not found.", 404)
+        if not profile.resumeFile:
+            return format_error_response("No resume uploaded.", 404)
+
+        record = get_parse(profile.resumeFile.sha256)
+        if record is None or record["state"] != "done":
+            return format_error_response("Resume parsing has not finished.", 409)
+
+        draft = record["draft"]
+        sections = sections or list(draft)
+        unknown = [section for section in sections if section not in SECTION_UPDATES]
+        if unknown:
+            return format_error_response(f"Unknown sections: {', '.join(unknown)}")
+
+        applied, skipped, errors = {}, {}, []
+        for section in sections:
+            entries = draft.get(section) or []
+            existing = section_snapshot(getattr(profile, section)) or []
+
+            if section == "skills":
+                known = {skill.lower() for skill in existing}
+                additions = [skill for skill in entries if skill.lower() not in known]
+                merged = existing + additions
+            else:
+                schema = SECTION_SCHEMAS[section]
+                known = {_entry_key(section, entry) for entry in existing}
+                additions = [
+                    entry for entry in entries
+                    if not schema.errors(entry) and _entry_key(section, entry) not in known
+                ]
+                merged = existing + additions
+
+            skipped[section] = len(entries) - len(additions)
+            applied[section] = 0
+            if not additions:
+                continue
+
+            result = SECTION_UPDATES[section](user_id, merged)
+            if result["success"]:
+                applied[section] = len(additions)
+            else:
+                errors.extend(result["errors"])
+
+        if errors:
+            return format_error_response(errors)
+
+        return format_success_response("Resume draft applied.", {"applied": applied, "skipped": skipped})
+
+    except Exception as e:
+        return format_error_response(str(e), 500)
@@ -1,22 +1,21 @@
 from bson import ObjectId
 from models.profile_schema import Profile
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import ListSchema
 
+SKILLS_SCHEMA = ListSchema(
+    lambda skill: isinstance(skill, str) and bool(skill.strip()),
+    empty_message="Skills must be a non-empty array of strings.",
+    item_message="Skill #{number} must be a non-empty string.",
+)
+
+@traced
 def validate_skills(skills):
     """Validate skills array"""
-    errors = []
-    
-    # Check if it's a list
-    if not isinstance(skills, list) or len(skills) == 0:
-        errors.append("Skills must be a non-empty array of strings.")
-        return errors
-    
-    # Validate each skill is a non-empty string
-    for i, skill in enumerate(skills):
-        if not isinstance(skill, str) or not skill.strip():
-            errors.append(f"Skill #{i+1} must be a non-empty string.")
-    
-    return errors
+    return SKILLS_SCHEMA.errors(skills)
 
+@traced
 def update_skills(user_id, skills):
     """Update a user's skills"""
     
@@ -32,8 +31,10 @@ def update_skills(user_id, skills):
             return {"success": False, "errors": ["User not found."]}
         
         # Update skills
+        previous = section_snapshot(profile.skills)
         profile.skills = skills
         profile.save()
+        publish_section_change(user_id, "skills", previous, section_snapshot(profile.skills))
         
         return {
             "success": True,
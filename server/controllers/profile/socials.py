@@ -1,24 +1,23 @@
 from bson import ObjectId
-import re
 from models.profile_schema import Profile, Social
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import Schema, each_value, when
 
+SOCIALS_SCHEMA = Schema(
+    when(lambda socials: not any(value for value in socials.values() if value is not None),
+         "At least one social link is required."),
+    # Scheme optional; a plain domain like github.com/user is accepted
+    each_value(r"^(https?:\/\/)?([\w\d-]+\.)+[\w]{2,}(\/[\w\d\-./?%&=]*)?$", "Invalid URL format for {key}"),
+    not_object="Social links must be an object.",
+)
+
+@traced
 def validate_social_links(socials):
     """Validate social media links"""
-    errors = []
-    
-    # Check if at least one social is provided
-    if not any(value for value in socials.values() if value is not None):
-        errors.append("At least one social link is required.")
-    
-    # Simple URL validation for provided links
-    url_regex = r"^(https?:\/\/)?([\w\d-]+\.)+[\w]{2,}(\/[\w\d\-./?%&=]*)?$"
-    
-    for platform, url in socials.items():
-        if url is not None and url != "" and not re.match(url_regex, url):
-            errors.append(f"Invalid URL format for {platform}")
-    
-    return errors
+    return SOCIALS_SCHEMA.errors(socials)
 
+@traced
 def update_social_links(user_id, socials_update):
     """Update a user's social media links"""
     
@@ -36,6 +35,8 @@ def update_social_links(user_id, socials_update):
         # Create update dictionary, removing None values
         update_data = {key: value for key, value in socials_update.items() if value is not None}
         
+        previous = section_snapshot(profile.socials)
+
         # Initialize socials if it doesn't exist
         if not profile.socials:
             profile.socials = Social()
@@ -45,6 +46,7 @@ def update_social_links(user_id, socials_update):
             setattr(profile.socials, field, value)
         
         profile.save()
+        publish_section_change(user_id, "socials", previous, section_snapshot(profile.socials))
         
         return {
             "success": True,
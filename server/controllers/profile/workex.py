@@ -1,30 +1,24 @@
 from bson import ObjectId
 from models.profile_schema import Profile, WorkExperience
+from services.tracing import traced
+from services.profile_events import section_snapshot, publish_section_change
+from utils.validation import Schema, entry_errors, of_type, required, when
 
+WORK_EXPERIENCE_SCHEMA = Schema(
+    required("company", "position", "startDate", "isCurrent"),
+    of_type("isCurrent", bool, "isCurrent must be a boolean value."),
+    when(lambda experience: experience.get("isCurrent") is True and experience.get("endDate"),
+         "End date should not be provided when isCurrent is true.", field="endDate"),
+    when(lambda experience: experience.get("isCurrent") is False and not experience.get("endDate"),
+         "End date is required when isCurrent is false.", field="endDate"),
+)
+
+@traced
 def validate_work_experience(experience):
     """Validate a single work experience entry"""
-    errors = []
-    
-    # Required fields check
-    required_fields = ["company", "position", "startDate", "isCurrent"]
-    missing_fields = [field for field in required_fields if experience.get(field) is None]
-    
-    if missing_fields:
-        errors.append(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    # Validate isCurrent type
-    if "isCurrent" in experience and not isinstance(experience["isCurrent"], bool):
-        errors.append("isCurrent must be a boolean value.")
-    
-    # Logic for end date based on isCurrent
-    if experience.get("isCurrent") is True and experience.get("endDate"):
-        errors.append("End date should not be provided when isCurrent is true.")
-    
-    if experience.get("isCurrent") is False and not experience.get("endDate"):
-        errors.append("End date is required when isCurrent is false.")
-    
-    return errors
+    return WORK_EXPERIENCE_SCHEMA.errors(experience)
 
+@traced
 def update_work_experience(user_id, experiences):
     """Update a user's work experience"""
     
@@ -32,12 +26,8 @@ def update_work_experience(user_id, experiences):
     if not isinstance(experiences, list) or len(experiences) == 0:
         return {"success": False, "errors": ["Work experience must be a non-empty array."]}
     
-    # Validate each work experience entry
-    all_errors = []
-    for i, exp in enumerate(experiences):
-        errors = validate_work_experience(exp)
-        if errors:
-            all_errors.append(f"Experience #{i+1} ({exp.get('company', '')}): {', '.join(errors)}")
+    # Validate all work experience entries in one pass
+    all_errors = entry_errors(WORK_EXPERIENCE_SCHEMA.validate(experiences), experiences, "Experience", "company")
     
     if all_errors:
         return {"success": False, "errors": all_errors}
@@ -62,8 +52,10 @@ def update_work_experience(user_id, experiences):
         ]
         
         # Replace existing work experiences
+        previous = section_snapshot(profile.workEx)
         profile.workEx = experience_entries
         profile.save()
+        publish_section_change(user_id, "workEx", previous, section_snapshot(profile.workEx))
         
         return {
             "success": True,
@@ -1,32 +1,85 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from config.db import connect_db
 from config.firebase import firebase_app
+from models.profile_schema import Profile
+from services.index_advisor import reconcile_indexes, format_report
 from routes.index import router as api_router
+from middlewares.metrics import MetricsMiddleware
+from middlewares.tracing import TracingMiddleware
+from middlewares.compression import CompressionMiddleware
+from middlewares.idempotency import IdempotencyMiddleware
+from middlewares.rate_limit import RateLimitMiddleware
+from middlewares.profiling import ProfilingMiddleware, profiling_enabled
+from services.metrics import render_metrics
+from services.profile_changes import PROFILE_CHANGE_STREAM, profile_change_tailer
+from utils.json_response import FastJSONResponse
 
 # Initialize MongoDB
-connect_db()
+mongo_client = connect_db()
+
+# Optionally reconcile Profile indexes at startup (INDEX_CHECK_ON_STARTUP=report|apply)
+if mongo_client is not None and os.getenv("INDEX_CHECK_ON_STARTUP") in ("report", "apply"):
+    try:
+        print(format_report(reconcile_indexes(Profile, apply=os.getenv("INDEX_CHECK_ON_STARTUP") == "apply")))
+    except Exception as e:
+        print(f"Error checking indexes: {str(e)}")
+
+# Feed cache invalidation and profile push from the profiles change stream
+if mongo_client is not None and PROFILE_CHANGE_STREAM:
+    profile_change_tailer.start()
 
 # Initialize FastAPI App
 app = FastAPI(
     title="Uply API",
     description="API for Uply - AI-powered career assistant platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
-# Enable CORS (Cross-Origin Resource Sharing)
+# Replay stored responses for retried POSTs carrying an Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+
+# Shed writes while the thread pool or Mongo pool is saturated and limit
+# sign-in attempts per IP (outside idempotency so refusals are never stored)
+app.add_middleware(RateLimitMiddleware)
+
+# Enable CORS (Cross-Origin Resource Sharing); added after the middlewares
+# above so their own responses (429/503 refusals, idempotency errors) carry
+# the CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins, modify for production
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["Retry-After"],  # Readable by the client on 429/503
 )
 
+# Negotiated gzip/brotli/zstd compression above COMPRESSION_MIN_SIZE
+app.add_middleware(CompressionMiddleware)
+
+# Opt-in per-request stack profiling (not installed at all unless configured)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+# Record per-route latency and Mongo/Firebase call metrics
+app.add_middleware(MetricsMiddleware)
+
+# Trace requests through controllers, Mongo and Firebase (sampled, see TRACE_SAMPLE_RATE and TRACE_TRUST_PARENT)
+app.add_middleware(TracingMiddleware)
+
 # Register all routes from index.py
 app.include_router(api_router, prefix="/api")
 
 # Root Route
 @app.get("/")
 def home():
-    return {"message": "Welcome to the FastAPI MongoDB Server 🚀"}
\ No newline at end of file
+    return {"message": "Welcome to the FastAPI MongoDB Server 🚀"}
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -1,20 +1,62 @@
-from fastapi import Request, HTTPException, status
+from fastapi import Depends, Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from firebase_admin import auth
 from models.profile_schema import Profile
-from typing import Optional, Callable
-from functools import wraps
+from services.metrics import RATE_LIMITED, track_external
+from services.rate_limit import WRITE_LIMIT, RateLimited, check_async, retry_after_header
+from services.sessions import InvalidSessionError, is_session_token, verify_session
+from services.revocation import revocation_index
+from collections import OrderedDict
+from typing import Optional
+import hmac
 import logging
+import os
+import threading
+import time
 
-security = HTTPBearer()
+# auto_error=False so a missing header gets verify_token's 401 instead of a 403
+security = HTTPBearer(auto_error=False)
 logger = logging.getLogger(__name__)
 
+# Verified Firebase ID tokens are reused for this long (capped at the token's
+# own expiry), skipping the signature check, get_user and the profile lookup
+TOKEN_CACHE_SECONDS = int(os.getenv("TOKEN_CACHE_SECONDS", "300"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# Admin routes (bulk import/export) require `X-Admin-Token: <token>`; they are
+# disabled while this is unset
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+# token -> (user info, uid, issued at, usable until)
+_verified_tokens = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+def _cached_identity(token):
+    entry = _verified_tokens.get(token)
+    if entry is None:
+        return None
+    user_info, uid, issued_at, usable_until = entry
+    if usable_until <= time.time() or revocation_index.is_revoked(uid, issued_at):
+        with _verified_tokens_lock:
+            _verified_tokens.pop(token, None)
+        return None
+    return dict(user_info)
+
+def _cache_identity(token, user_info, decoded_token):
+    usable_until = min(decoded_token['exp'], time.time() + TOKEN_CACHE_SECONDS)
+    with _verified_tokens_lock:
+        _verified_tokens[token] = (dict(user_info), decoded_token['uid'], decoded_token['iat'], usable_until)
+        while len(_verified_tokens) > TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+
 async def verify_token(authorization: HTTPAuthorizationCredentials = None) -> dict:
     """
-    Verify Firebase JWT token
+    Verify a session token or a Firebase JWT
     
     Args:
-        authorization: HTTP Authorization credentials containing the JWT
+        authorization: HTTP Authorization credentials containing a session token
+            (from /auth/login or /auth/google) or a Firebase ID token
         
     Returns:
         Dictionary containing user info
@@ -29,13 +71,50 @@ async def verify_token(authorization: HTTPAuthorizationCredentials = None) -> di
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    token = authorization.credentials
+    
+    # Session tokens issued at login are verified locally with no remote calls
+    if is_session_token(token):
+        try:
+            session = verify_session(token)
+        except InvalidSessionError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(e),
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return {
+            "firebase_uid": session.firebase_uid,
+            "user_id": session.user_id,
+            "email": session.email,
+            "username": session.username
+        }
+    
+    user_info = _cached_identity(token)
+    if user_info is not None:
+        return user_info
+    
+    # Signature check, get_user and the profile lookup all block
+    return await run_in_threadpool(_verify_firebase_token, token)
+
+def _verify_firebase_token(token):
+    """verify_token's cache miss for Firebase JWTs (blocking; run on the thread pool)"""
     try:
-        token = authorization.credentials
         # Verify the Firebase JWT
-        decoded_token = auth.verify_id_token(token)
+        with track_external("firebase", "verify_id_token"):
+            decoded_token = auth.verify_id_token(token)
+        
+        # Logged-out tokens stay cryptographically valid until they expire
+        if revocation_index.is_revoked(decoded_token['uid'], decoded_token['iat']):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         
         # Get Firebase user
-        firebase_user = auth.get_user(decoded_token['uid'])
+        with track_external("firebase", "get_user"):
+            firebase_user = auth.get_user(decoded_token['uid'])
         
         # Find user in MongoDB
         user = Profile.objects(firebase_uid=decoded_token['uid']).first()
@@ -47,12 +126,17 @@ async def verify_token(authorization: HTTPAuthorizationCredentials = None) -> di
             )
         
         # Return user info
-        return {
+        user_info = {
             "firebase_uid": firebase_user.uid,
             "user_id": str(user.id),
             "email": firebase_user.email,
             "username": user.username
         }
+        _cache_identity(token, user_info, decoded_token)
+        return user_info
+    
+    except HTTPException:
+        raise
     
     except auth.InvalidIdTokenError:
         raise HTTPException(
@@ -76,24 +160,89 @@ async def verify_token(authorization: HTTPAuthorizationCredentials = None) -> di
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def auth_required(endpoint_function: Callable) -> Callable:
+async def get_current_user(
+    request: Request,
+    authorization: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> dict:
     """
-    Decorator for endpoints that require authentication
+    FastAPI dependency resolving the caller's identity
     
-    Args:
-        endpoint_function: The FastAPI endpoint function to protect
-        
-    Returns:
-        Wrapped function that checks authentication before calling the endpoint
+    The result is memoized in request.state.user, so every dependency and the
+    endpoint itself share a single verification per request.
     """
-    @wraps(endpoint_function)
-    async def wrapper(*args, request: Request, authorization: HTTPAuthorizationCredentials = None, **kwargs):
+    user_info = getattr(request.state, "user", None)
+    if user_info is None:
         user_info = await verify_token(authorization)
-        
-        # Add user_info to request state
         request.state.user = user_info
-        
-        # Call the original endpoint with all arguments
-        return await endpoint_function(*args, request=request, **kwargs)
+    return user_info
+
+async def require_profile_owner(
+    user_id: str,
+    request: Request,
+    user_info: dict = Depends(get_current_user)
+) -> dict:
+    """
+    FastAPI dependency for /{user_id}/... routes: the caller must own user_id
+    
+    Writes are also rate limited per user (WRITE_LIMIT); the limit is only
+    charged once the caller is verified, so nobody can spend another
+    user's budget.
+    
+    Raises:
+        HTTPException: 403 if the profile belongs to someone else, 429 if
+            the caller is writing too fast
+    """
+    if user_info["user_id"] != user_id.lower():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only access your own profile."
+        )
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        try:
+            await check_async(WRITE_LIMIT, user_info["firebase_uid"])
+        except RateLimited as e:
+            RATE_LIMITED.inc(e.limit.name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many profile updates, please retry later.",
+                headers={"Retry-After": retry_after_header(e.retry_after)}
+            )
+    return user_info
+
+async def require_stream_owner(
+    user_id: str,
+    request: Request,
+    authorization: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    access_token: Optional[str] = None
+) -> dict:
+    """
+    require_profile_owner for event streams
+
+    Browsers cannot set headers on an EventSource, so the token may also be
+    passed as ?access_token=. Only stream routes accept it: tokens in URLs
+    end up in access logs.
+    """
+    if authorization is None and access_token:
+        authorization = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+    user_info = await verify_token(authorization)
+    request.state.user = user_info
+    request.state.token = authorization.credentials
+    return await require_profile_owner(user_id, request, user_info)
+
+async def require_admin(request: Request) -> None:
+    """
+    FastAPI dependency for operator-only routes
     
-    return wrapper
\ No newline at end of file
+    Raises:
+        HTTPException: 403 unless X-Admin-Token matches ADMIN_API_TOKEN
+    """
+    supplied = request.headers.get("x-admin-token")
+    if not ADMIN_API_TOKEN or not supplied or not hmac.compare_digest(supplied, ADMIN_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required."
+        )
+
+# For routes that need an authenticated caller but no ownership check:
+#     @router.get("/path", dependencies=[auth_required])
+auth_required = Depends(get_current_user)
@@ -0,0 +1,98 @@
+from anyio import to_thread
+from services.compression import (
+    COMPRESSION_MIN_SIZE, COMPRESSION_THREAD_MIN_SIZE, compress, is_compressible, negotiate
+)
+from services.metrics import RESPONSE_BYTES
+
+def _header(headers, name):
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+def _add_vary(headers):
+    vary = _header(headers, b"vary")
+    if vary is None:
+        headers.append((b"vary", b"Accept-Encoding"))
+    elif "accept-encoding" not in vary.lower():
+        headers[:] = [(key, value) for key, value in headers if key.lower() != b"vary"]
+        headers.append((b"vary", f"{vary}, Accept-Encoding".encode("latin-1")))
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with gzip, brotli or zstd
+
+    The encoding is negotiated from Accept-Encoding. Bodies below
+    COMPRESSION_MIN_SIZE, non-text content types, streamed responses and
+    responses that already carry a Content-Encoding (e.g. pre-compressed
+    cache entries) are passed through untouched. Bodies above
+    COMPRESSION_THREAD_MIN_SIZE are compressed off the event loop.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = negotiate(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                if _header(headers, b"content-encoding") is not None or not is_compressible(_header(headers, b"content-type")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = {**message, "headers": headers}
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if start_message is not None:
+                headers = start_message["headers"]
+                if message.get("more_body", False) or len(body) < self.minimum_size:
+                    # Streamed or small responses go out as they are
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                if len(body) >= COMPRESSION_THREAD_MIN_SIZE:
+                    # Large listings take tens of milliseconds; keep the event loop free
+                    compressed = await to_thread.run_sync(compress, body, encoding)
+                else:
+                    compressed = compress(body, encoding)
+                RESPONSE_BYTES.inc(encoding, "original", amount=len(body))
+                RESPONSE_BYTES.inc(encoding, "sent", amount=len(compressed))
+
+                headers[:] = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+                headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+                _add_vary(headers)
+                await send(start_message)
+                await send({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from anyio import CancelScope, to_thread
+from services.idempotency import (
+    MAX_KEY_LENGTH, claim, complete, fingerprint, load, release, scoped_key, stored_response
+)
+from utils.json_response import FastJSONResponse
+
+# How long a duplicate waits for the original request running on another worker
+IDEMPOTENCY_WAIT_SECONDS = 10
+POLL_INTERVAL_SECONDS = 0.05
+
+REPLAY_HEADER = (b"idempotent-replayed", b"true")
+
+# Sign-in responses carry tokens and their bodies carry passwords; neither
+# may sit in the store, so these routes ignore Idempotency-Key
+UNCACHED_PREFIXES = ("/api/auth/",)
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware honouring Idempotency-Key on POST requests
+
+    The first request with a key executes normally and its response (any
+    status below 500 but 429) is stored; retries with the same key, caller, route and
+    body are answered from the store. Concurrent duplicates in this process
+    wait for the original instead of executing, and claim the key themselves
+    if its response was not stored; duplicates on other workers poll the
+    store. Requests without the header, and the auth routes, are untouched.
+    Store calls run on the thread pool.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._inflight = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].startswith(UNCACHED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        key = authorization = None
+        for name, value in scope["headers"]:
+            if name == b"idempotency-key":
+                key = value.decode("latin-1")
+            elif name == b"authorization":
+                authorization = value.decode("latin-1")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await self._error(scope, receive, send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters.")
+            return
+
+        body = await self._read_body(receive)
+        record_id = scoped_key(key, scope["method"], scope["path"], authorization)
+        body_fingerprint = fingerprint(body)
+
+        # A duplicate whose original ends without storing a response (a
+        # server error, or rate limited) claims the key itself
+        while True:
+            # Duplicate of a request still running in this process; its future
+            # resolves to None when the response was not stored
+            waiter = self._inflight.get(record_id)
+            if waiter is not None:
+                fingerprint_in_flight, future = waiter
+                if fingerprint_in_flight != body_fingerprint:
+                    await self._error(scope, receive, send, 422, "Idempotency-Key was reused with a different request body.")
+                    return
+                response = await asyncio.shield(future)
+                if response is not None:
+                    await self._replay(send, response)
+                    return
+                continue
+
+            existing = await to_thread.run_sync(claim, record_id, body_fingerprint)
+            if existing is None:
+                break
+            if existing["fingerprint"] != body_fingerprint:
+                await self._error(scope, receive, send, 422, "Idempotency-Key was reused with a different request body.")
+                return
+            if existing["state"] != "done":
+                existing = await self._wait_for_other_worker(record_id)
+                if existing is None:
+                    continue
+                if existing["state"] != "done":
+                    await self._error(scope, receive, send, 409, "A request with this Idempotency-Key is still in progress.")
+                    return
+            await self._replay(send, stored_response(existing))
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[record_id] = (body_fingerprint, future)
+        status, headers, chunks = 500, [], []
+
+        async def replay_receive():
+            nonlocal body
+            if body is not None:
+                message = {"type": "http.request", "body": body, "more_body": False}
+                body = None
+                return message
+            return await receive()
+
+        async def capture_send(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        finally:
+            response = (status, headers, b"".join(chunks))
+            stored = None
+            try:
+                # Shielded: a client disconnecting must not leave the claim pending
+                with CancelScope(shield=True):
+                    if status < 500 and status != 429:
+                        await to_thread.run_sync(complete, record_id, *response)
+                        stored = response
+                    else:
+                        # Server errors and rate limiting are not stored, so a retry gets another attempt
+                        await to_thread.run_sync(release, record_id)
+            except Exception as e:
+                print(f"Error storing idempotent response: {str(e)}")
+            finally:
+                del self._inflight[record_id]
+                future.set_result(stored)
+
+    async def _read_body(self, receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _wait_for_other_worker(self, record_id):
+        """The completed record, the still pending one on timeout, or None if the claim was released"""
+        deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            record = await to_thread.run_sync(load, record_id)
+            if record is None or record["state"] == "done" or time.monotonic() >= deadline:
+                return record
+
+    async def _replay(self, send, response):
+        status, headers, body = response
+        await send({"type": "http.response.start", "status": status, "headers": headers + [REPLAY_HEADER]})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def _error(self, scope, receive, send, status_code, detail):
+        await FastJSONResponse({"detail": detail}, status_code=status_code)(scope, receive, send)
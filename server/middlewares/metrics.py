@@ -0,0 +1,57 @@
+import time
+from services.metrics import (
+    RequestStats, current_request_stats,
+    REQUEST_LATENCY, REQUESTS_IN_FLIGHT, REQUEST_MONGO_COMMANDS
+)
+
+def route_template(scope):
+    """
+    Return the matched route's path template, or "unmatched"
+
+    Newer FastAPI versions keep included routers nested and record the
+    prefixed route in scope["fastapi"]; older ones flatten routes so
+    scope["route"] already carries the full path.
+    """
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, in-flight requests and the
+    number of Mongo commands each request issued
+
+    Routes are labelled by their path template (e.g. /api/profile/{user_id}/getprofile)
+    so user IDs never end up in label values.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec(method)
+            current_request_stats.reset(token)
+
+            route_path = route_template(scope)
+            REQUEST_LATENCY.observe(elapsed, method, route_path, status_code)
+            REQUEST_MONGO_COMMANDS.observe(stats.mongo_commands, route_path)
@@ -0,0 +1,220 @@
+import asyncio
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from anyio import CancelScope, to_thread
+from dotenv import load_dotenv
+from middlewares.metrics import route_template
+from services.metrics import current_request_stats
+
+load_dotenv()
+
+# Requests carrying `X-Profile-Request: <token>` are profiled
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+
+# Fraction of all requests profiled without the header
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+# Stack sampling interval in seconds
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "2")) / 1000
+
+# Where collapsed-stack profiles (and their metadata) are written
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "request_profiles")
+
+PROFILE_HEADER = b"x-profile-request"
+
+# Frames from these packages get a synthetic marker frame so Mongo and
+# Firebase time stands out in the flamegraph
+ANNOTATIONS = (
+    (os.sep + "pymongo" + os.sep, "[mongo]"),
+    (os.sep + "mongoengine" + os.sep, "[mongo]"),
+    (os.sep + "firebase_admin" + os.sep, "[firebase]"),
+    (os.sep + "google" + os.sep + "auth" + os.sep, "[firebase]"),
+    (os.sep + "requests" + os.sep, "[http]"),
+)
+
+def profiling_enabled():
+    """The middleware is only installed when profiling can actually trigger"""
+    return bool(PROFILING_ADMIN_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+def _frame_label(code):
+    filename = code.co_filename
+    parts = filename.replace("\\", "/").split("/")
+    short = "/".join(parts[-2:])
+    return f"{code.co_name} ({short}:{code.co_firstlineno})".replace(";", ":")
+
+def _collapse(frame):
+    """Turn a frame into a root-first `a;b;c` stack with Mongo/Firebase annotations"""
+    labels = []
+    marked = set()
+    stack = []
+    while frame is not None:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+
+    for code in reversed(stack):
+        for fragment, marker in ANNOTATIONS:
+            if marker not in marked and fragment in code.co_filename:
+                labels.append(marker)
+                marked.add(marker)
+                break
+        labels.append(_frame_label(code))
+    return ";".join(labels)
+
+class RequestSampler:
+    """
+    Background thread sampling the stacks that serve one request
+
+    The event loop thread is sampled while it is running the request's own
+    task, not the other requests it interleaves with; worker threads are
+    included while they are executing the request's endpoint function (sync
+    routes). Create it from the request's task.
+    """
+
+    def __init__(self, scope, interval=PROFILE_INTERVAL):
+        self.scope = scope
+        self.interval = interval
+        self.loop_thread = threading.get_ident()
+        # Every stack the loop runs for this task passes through its outermost coroutine
+        self.task_frame = asyncio.current_task().get_coro().cr_frame
+        self.samples = Counter()
+        self.sample_count = 0
+        self._profile_id = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _targets(self, frames):
+        endpoint = self.scope.get("endpoint")
+        endpoint_code = getattr(getattr(endpoint, "__wrapped__", endpoint), "__code__", None)
+        for ident, frame in frames.items():
+            if ident == self._thread.ident:
+                continue
+            current = frame
+            if ident == self.loop_thread:
+                while current is not None:
+                    if current is self.task_frame:
+                        yield frame
+                        break
+                    current = current.f_back
+                continue
+            if endpoint_code is None:
+                continue
+            while current is not None:
+                if current.f_code is endpoint_code:
+                    yield frame
+                    break
+                current = current.f_back
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for frame in self._targets(sys._current_frames()):
+                self.samples[_collapse(frame)] += 1
+            self.sample_count += 1
+
+    def profile_id(self):
+        """Stable file name stem for this request's profile, available once routing ran"""
+        if self._profile_id is None:
+            route = route_template(self.scope)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            slug = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+            self._profile_id = f"{stamp}-{self.scope['method']}-{slug}"
+        return self._profile_id
+
+    def write(self, status_code, elapsed, stats):
+        """Write `<id>.folded` (flamegraph.pl / speedscope input) and `<id>.json` metadata"""
+        os.makedirs(PROFILE_OUTPUT_DIR, exist_ok=True)
+        profile_id = self.profile_id()
+
+        with open(os.path.join(PROFILE_OUTPUT_DIR, f"{profile_id}.folded"), "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        metadata = {
+            "id": profile_id,
+            "method": self.scope["method"],
+            "path": self.scope["path"],
+            "route": route_template(self.scope),
+            "status": status_code,
+            "durationSeconds": elapsed,
+            "intervalSeconds": self.interval,
+            "samples": self.sample_count,
+            "mongo": {"commands": stats.mongo_commands, "seconds": stats.mongo_seconds} if stats else None,
+            "external": {"calls": stats.external_calls, "seconds": stats.external_seconds} if stats else None,
+        }
+        with open(os.path.join(PROFILE_OUTPUT_DIR, f"{profile_id}.json"), "w") as f:
+            json.dump(metadata, f, indent=2)
+
+        return profile_id
+
+    def finish(self, status_code, elapsed, stats):
+        """Stop sampling and write the profile; blocking, so run it on the thread pool"""
+        self.stop()
+        return self.write(status_code, elapsed, stats)
+
+class ProfilingMiddleware:
+    """
+    Opt-in statistical profiler for single requests
+
+    Triggered by the admin header or PROFILE_SAMPLE_RATE. Only one request is
+    profiled at a time; concurrent candidates run unprofiled. Install it only
+    when profiling_enabled() so disabled deployments pay nothing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = threading.Lock()
+
+    def _requested(self, scope):
+        if PROFILING_ADMIN_TOKEN:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return hmac.compare_digest(value.decode("latin-1"), PROFILING_ADMIN_TOKEN)
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        sampler = RequestSampler(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", sampler.profile_id().encode())
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            try:
+                # Shielded: a client disconnecting must not leave the sampler running
+                with CancelScope(shield=True):
+                    profile_id = await to_thread.run_sync(
+                        sampler.finish, status_code, elapsed, current_request_stats.get()
+                    )
+                print(f"Request profile written: {profile_id}")
+            except Exception as e:
+                print(f"Error writing request profile: {str(e)}")
+            finally:
+                self._busy.release()
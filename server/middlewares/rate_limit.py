@@ -0,0 +1,68 @@
+import os
+from services.load_shedding import SHED_RETRY_AFTER_SECONDS, overload_reason
+from services.metrics import RATE_LIMITED, REQUESTS_SHED
+from services.rate_limit import AUTH_LIMIT, RateLimited, check_async, retry_after_header
+from utils.json_response import FastJSONResponse
+
+# Reverse proxies in front of the API that append to X-Forwarded-For; the
+# client IP is the address they saw. 0 uses the socket peer.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+# Sign-in endpoints calling Firebase on every attempt, limited per client IP
+AUTH_PATHS = frozenset(("/api/auth/login", "/api/auth/signup", "/api/auth/google"))
+
+# Methods that are never shed, so reads stay available under load
+READ_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+def client_ip(scope):
+    if TRUSTED_PROXY_HOPS:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",")]
+                if len(hops) >= TRUSTED_PROXY_HOPS:
+                    return hops[-TRUSTED_PROXY_HOPS]
+                break
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware shedding writes under load and limiting sign-in attempts
+
+    Writes (anything but GET/HEAD/OPTIONS) are refused with 503 while the
+    blocking-call thread pool or the Mongo connection wait queue is
+    saturated, before they queue behind it; reads always go through. Sign-in
+    attempts are then limited per client IP with 429. Both carry
+    Retry-After. Per-user write limits need the verified caller and are
+    applied in require_profile_owner.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        resource = overload_reason()
+        if resource is not None:
+            REQUESTS_SHED.inc(resource)
+            await self._refuse(scope, receive, send, 503, "Server is busy, please retry shortly.", SHED_RETRY_AFTER_SECONDS)
+            return
+
+        if scope["path"] in AUTH_PATHS:
+            try:
+                await check_async(AUTH_LIMIT, client_ip(scope))
+            except RateLimited as e:
+                RATE_LIMITED.inc(e.limit.name)
+                await self._refuse(scope, receive, send, 429, "Too many sign-in attempts, please retry later.", e.retry_after)
+                return
+
+        await self.app(scope, receive, send)
+
+    async def _refuse(self, scope, receive, send, status_code, detail, retry_after):
+        response = FastJSONResponse(
+            {"detail": detail}, status_code=status_code, headers={"Retry-After": retry_after_header(retry_after)}
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,52 @@
+from middlewares.metrics import route_template
+from services.tracing import current_span, start_root_span
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span per request
+
+    Continues the caller's trace from an incoming W3C `traceparent` header
+    (its sampled flag only counts with TRACE_TRUST_PARENT) and echoes the
+    server span back in the response `traceparent` header for sampled
+    requests. Unsampled requests only pay for generating IDs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        method = scope["method"]
+        span = start_root_span(method, traceparent, {"http.method": method, "http.target": scope["path"]})
+        token = current_span.set(span)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and span.sampled:
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.status = "ERROR"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"traceparent", span.traceparent().encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            span.record_error(e)
+            raise
+        finally:
+            current_span.reset(token)
+            if span.sampled:
+                route = route_template(scope)
+                span.name = f"{method} {route}"
+                span.set_attribute("http.route", route)
+                span.end()
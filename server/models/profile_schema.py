@@ -1,4 +1,6 @@
-from mongoengine import Document, StringField, EmailField, ListField, EmbeddedDocument, EmbeddedDocumentField, BooleanField
+from mongoengine import Document, StringField, EmailField, ListField, EmbeddedDocument, EmbeddedDocumentField, BooleanField, IntField, DateTimeField, DictField
+from mongoengine.queryset import QuerySet
+from services.profile_storage import SPILLABLE_SECTIONS, merge_spilled, spill_sections
 
 # Address Sub-Schema
 class Address(EmbeddedDocument):
@@ -12,7 +14,7 @@ class Address(EmbeddedDocument):
 class PersonalInfo(EmbeddedDocument):
     firstName = StringField()
     lastName = StringField()
-    email = EmailField(unique=True)
+    email = EmailField()  # Unique (sparse) index declared on Profile.meta
     phone = StringField()
     dateOfBirth = StringField()  # YYYY-MM-DD format
     address = EmbeddedDocumentField(Address)
@@ -81,6 +83,21 @@ class Social(EmbeddedDocument):
     stackOverflow = StringField()
     leetcode = StringField()
 
+# Uploaded Resume Reference (the file itself lives in resume storage)
+class ResumeFile(EmbeddedDocument):
+    sha256 = StringField()       # Content hash, also the storage key
+    filename = StringField()
+    contentType = StringField()
+    size = IntField()
+    uploadedAt = DateTimeField()
+
+class ProfileQuerySet(QuerySet):
+    def only(self, *fields):
+        # Spilled sections are found through the marker, so it has to be loaded with them
+        if any(field.split(".")[0] in SPILLABLE_SECTIONS for field in fields):
+            fields += ("spilled",)
+        return super().only(*fields)
+
 # Main Profile Schema
 class Profile(Document):
     username = StringField(required=True, unique=True)
@@ -96,12 +113,25 @@ class Profile(Document):
     achievements = ListField(EmbeddedDocumentField(Achievement))
     publications = ListField(EmbeddedDocumentField(Publication))
     socials = EmbeddedDocumentField(Social)
+    resumeFile = EmbeddedDocumentField(ResumeFile)
+    # Sections stored in profile_sections because they outgrew SECTION_SPILL_BYTES:
+    # {section: {bytes, entries, at}} (see services.profile_storage)
+    spilled = DictField()
     
     meta = {
         'collection': 'profiles',  # Explicitly naming the collection
+        'queryset_class': ProfileQuerySet,
+        # username and firebase_uid are indexed through unique=True on the fields
         'indexes': [
-            'username',  # Index for faster username lookups
-            'firebase_uid',  # Index for faster Firebase UID lookups
-            {'fields': ['personalInfo.email'], 'unique': True, 'sparse': True}  # Ensure email uniqueness when provided
+            {'fields': ['personalInfo.email'], 'unique': True, 'sparse': True},  # Ensure email uniqueness when provided
+            {'fields': ['resumeFile.sha256'], 'sparse': True}  # Finds stored resumes no profile references
         ]
-    }
\ No newline at end of file
+    }
+
+    @classmethod
+    def _from_son(cls, son, *args, **kwargs):
+        return super()._from_son(merge_spilled(son), *args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        with spill_sections(self):
+            return super().save(*args, **kwargs)
@@ -0,0 +1,91 @@
+import tempfile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from middlewares.auth import require_admin
+from controllers.analytics import rebuild_all_aggregates
+from services.profile_transfer import import_profiles, iter_export
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# Uploads are spooled to disk past this size instead of held in memory
+SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+EXPORT_FORMATS = {
+    "gzip": ("application/gzip", "profiles.jsonl.gz"),
+    "zstd": ("application/zstd", "profiles.jsonl.zst"),
+    "none": ("application/x-ndjson", "profiles.jsonl"),
+}
+
+UPLOAD_ENCODINGS = {
+    "gzip": "gzip", "application/gzip": "gzip", "application/x-gzip": "gzip",
+    "zstd": "zstd", "application/zstd": "zstd",
+}
+
+@router.get("/profiles/export", status_code=status.HTTP_200_OK)
+async def export_profiles_route(encoding: str = Query("gzip")):
+    """
+    Stream every profile as compressed JSON lines
+    """
+    if encoding not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported encoding '{encoding}'."
+        )
+
+    media_type, filename = EXPORT_FORMATS[encoding]
+    try:
+        chunks = iter_export(None if encoding == "none" else encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/profiles/import", status_code=status.HTTP_200_OK)
+async def import_profiles_route(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    mode: str = Query("upsert"),
+    rebuild: bool = Query(True)
+):
+    """
+    Bulk import a JSON lines body (plain, gzip or zstd)
+
+    The compression comes from Content-Encoding, or else the Content-Type.
+    Analytics aggregates are rebuilt in the background afterwards unless
+    rebuild=false.
+    """
+    if mode not in ("upsert", "insert"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown import mode '{mode}'."
+        )
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    encoding = UPLOAD_ENCODINGS.get(request.headers.get("content-encoding", "").strip()) or UPLOAD_ENCODINGS.get(content_type)
+
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as upload:
+            async for chunk in request.stream():
+                await run_in_threadpool(upload.write, chunk)
+            upload.seek(0)
+            report = await run_in_threadpool(import_profiles, upload, encoding, mode)
+
+        if report["written"] and rebuild:
+            background_tasks.add_task(rebuild_all_aggregates)
+        return report
+
+    except (ValueError, OSError, EOFError) as e:
+        # Corrupt or mislabelled compressed bodies
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from middlewares.auth import require_admin
+from services.tracing import memory_exporter
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/traces/{trace_id}", status_code=status.HTTP_200_OK)
+async def get_trace_route(trace_id: str):
+    """
+    Spans of a recent sampled trace, from the in-memory buffer
+
+    The trace ID is the second field of the traceparent header on sampled
+    responses. Only the last TRACE_BUFFER_SIZE spans of this worker are kept.
+    """
+    spans = memory_exporter.get_trace(trace_id.lower())
+    if not spans:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trace not found (unsampled, expired from the buffer or recorded by another worker)."
+        )
+    return {"traceId": trace_id.lower(), "spans": sorted(spans, key=lambda span: span["startTimeUnixNano"])}
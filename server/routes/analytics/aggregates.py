@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, status
+from middlewares.auth import require_admin
+from controllers.analytics import DIMENSIONS, get_aggregates, rebuild_all_aggregates
+
+router = APIRouter()
+
+@router.get("/{dimension}", status_code=status.HTTP_200_OK)
+async def get_aggregates_route(dimension: str, limit: int = Query(20)):
+    try:
+        result = get_aggregates(dimension, limit)
+
+        if not result["success"]:
+            raise HTTPException(
+                status_code=result.get("status_code", status.HTTP_400_BAD_REQUEST),
+                detail=result["errors"][0]
+            )
+
+        return result["data"]
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+
+@router.post("/rebuild", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+async def rebuild_aggregates_route(background_tasks: BackgroundTasks, dimension: str | None = Query(None)):
+    """
+    Schedule a full rebuild of the materialized aggregates (admin only: it
+    aggregates over every profile)
+    """
+    if dimension is not None and dimension not in DIMENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown dimension '{dimension}'."
+        )
+
+    background_tasks.add_task(rebuild_all_aggregates, dimension)
+    return {"message": "Aggregate rebuild scheduled."}
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Body, status
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from controllers.auth import google_auth_controller
 
@@ -14,7 +15,8 @@ async def google_auth(data: GoogleAuthRequest):
     Authenticate a user with Google via Firebase
     """
     try:
-        result = google_auth_controller(data.idToken)
+        # Firebase calls block; keep them off the event loop
+        result = await run_in_threadpool(google_auth_controller, data.idToken)
         
         if not result["success"]:
             raise HTTPException(
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Body, status
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from controllers.auth import login_with_email
 
@@ -15,7 +16,8 @@ async def login_user(data: LoginRequest):
     Authenticate a user with email and password
     """
     try:
-        result = login_with_email(data.email, data.password)
+        # Firebase calls block; keep them off the event loop
+        result = await run_in_threadpool(login_with_email, data.email, data.password)
         
         if not result["success"]:
             raise HTTPException(
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Body, status
 from pydantic import BaseModel
+from typing import Optional
 from controllers.auth import logout_user
 
 router = APIRouter()
 
 class LogoutRequest(BaseModel):
     idToken: str
+    sessionToken: Optional[str] = None
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
@@ -14,7 +16,7 @@ async def logout(data: LogoutRequest):
     Logout a user by revoking their Firebase tokens
     """
     try:
-        result = logout_user(data.idToken)
+        result = logout_user(data.idToken, data.sessionToken)
         
         if not result["success"]:
             raise HTTPException(
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Body, status
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr, validator
 from controllers.auth import signup_with_email
 
@@ -30,7 +31,8 @@ async def signup_user(data: SignupRequest):
     Register a new user with email, password, and username
     """
     try:
-        result = signup_with_email(data.email, data.password, data.username)
+        # Firebase calls block; keep them off the event loop
+        result = await run_in_threadpool(signup_with_email, data.email, data.password, data.username)
         
         if not result["success"]:
             raise HTTPException(
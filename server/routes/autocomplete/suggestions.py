@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from controllers.autocomplete import get_suggestions
+
+router = APIRouter()
+
+@router.get("/{field}", status_code=status.HTTP_200_OK)
+def get_suggestions_route(field: str, q: str = Query(...), limit: int = Query(10)):
+    """
+    Prefix autocomplete for institutions, degrees, companies, issuing organizations and skills
+    """
+    try:
+        result = get_suggestions(field, q, limit)
+
+        if not result["success"]:
+            raise HTTPException(
+                status_code=result.get("status_code", status.HTTP_400_BAD_REQUEST),
+                detail=result["errors"][0]
+            )
+
+        return result["data"]
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
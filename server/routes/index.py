@@ -12,6 +12,10 @@ from routes.profile.certification_info import router as certification_info_route
 from routes.profile.achievement_info import router as achievement_info_router
 from routes.profile.publication_info import router as publication_info_router
 from routes.profile.social_info import router as social_info_router
+from routes.profile.resume import router as resume_router
+from routes.profile.render import router as render_router
+from routes.profile.events import router as profile_events_router
+from routes.profile.history import router as history_router
 
 # Auth routes
 from routes.auth.login import router as login_router
@@ -19,6 +23,14 @@ from routes.auth.signup import router as signup_router
 from routes.auth.google import router as google_auth_router
 from routes.auth.logout import router as logout_router
 
+# Analytics routes
+from routes.analytics.aggregates import router as aggregates_router
+from routes.autocomplete.suggestions import router as autocomplete_router
+
+# Admin routes
+from routes.admin.profile_transfer import router as profile_transfer_router
+from routes.admin.traces import router as traces_router
+
 # Create a global router
 router = APIRouter()
 
@@ -33,9 +45,21 @@ router.include_router(certification_info_router, prefix="/profile", tags=["Profi
 router.include_router(achievement_info_router, prefix="/profile", tags=["Profile"])
 router.include_router(publication_info_router, prefix="/profile", tags=["Profile"])
 router.include_router(social_info_router, prefix="/profile", tags=["Profile"])
+router.include_router(resume_router, prefix="/profile", tags=["Profile"])
+router.include_router(render_router, prefix="/profile", tags=["Profile"])
+router.include_router(profile_events_router, prefix="/profile", tags=["Profile"])
+router.include_router(history_router, prefix="/profile", tags=["Profile"])
 
 # Include all auth routers
 router.include_router(login_router, prefix="/auth", tags=["Auth"])
 router.include_router(signup_router, prefix="/auth", tags=["Auth"])
 router.include_router(google_auth_router, prefix="/auth", tags=["Auth"])
-router.include_router(logout_router, prefix="/auth", tags=["Auth"])
\ No newline at end of file
+router.include_router(logout_router, prefix="/auth", tags=["Auth"])
+
+# Include all analytics routers
+router.include_router(aggregates_router, prefix="/analytics", tags=["Analytics"])
+router.include_router(autocomplete_router, prefix="/autocomplete", tags=["Autocomplete"])
+
+# Include admin routers
+router.include_router(profile_transfer_router, prefix="/admin", tags=["Admin"])
+router.include_router(traces_router, prefix="/admin", tags=["Admin"])
@@ -0,0 +1,66 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from middlewares.auth import require_stream_owner, verify_token
+from services.profile_push import TooManyStreams, format_sse, profile_change_hub
+
+router = APIRouter()
+
+# Comment lines keep idle connections open through proxies; the caller's
+# token is checked again at the same interval, ending streams after logout
+HEARTBEAT_SECONDS = 15
+
+# Client reconnect delay after a dropped connection
+RETRY_MILLISECONDS = 3000
+
+async def _event_source(stream, token):
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+        while True:
+            try:
+                event = await asyncio.wait_for(stream.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                try:
+                    await verify_token(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+                except HTTPException:
+                    yield format_sse({"event": "expired"})
+                    return
+                yield b": ping\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        profile_change_hub.close(stream)
+
+@router.get("/{user_id}/events", status_code=status.HTTP_200_OK)
+async def profile_events_route(user_id: str, request: Request, user_info: dict = Depends(require_stream_owner)):
+    """
+    Server-sent events for the user's profile
+
+    Each save of a section sends `event: section` with {"section", "data", "at"},
+    data being the section's new value, so open tabs update without re-fetching
+    the profile. `event: resync` means events were missed and the profile
+    should be fetched again.
+    """
+    try:
+        last_event_id = request.headers.get("last-event-id") or request.query_params.get("lastEventId")
+        try:
+            stream = profile_change_hub.open(user_id.lower(), last_event_id)
+        except TooManyStreams as e:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+        return StreamingResponse(
+            _event_source(stream, request.state.token),
+            media_type="text/event-stream",
+            # X-Accel-Buffering: nginx would otherwise hold events back
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
@@ -1,13 +1,24 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from models.profile_schema import Profile
 from utils.profile_utils import mongo_to_dict
-from fastapi.encoders import jsonable_encoder
+from utils.json_response import FastJSONResponse, dumps
+from services.response_cache import profile_response_cache, cached_json_response
+from middlewares.auth import require_profile_owner, auth_required
 
 router = APIRouter()
 
-@router.get("/{user_id}/getprofile", status_code=status.HTTP_200_OK)
-async def get_full_profile(user_id: str):
+@router.get("/{user_id}/getprofile", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def get_full_profile(user_id: str, request: Request):
     try:
+        accept_encoding = request.headers.get("accept-encoding")
+
+        # Hot reads are served from the encoded (and already compressed) body
+        cache_key = user_id.lower()
+        entry = profile_response_cache.get(cache_key)
+        if entry is not None:
+            return cached_json_response(entry, accept_encoding)
+        epoch = profile_response_cache.epoch()
+
         # Fetch profile by ID, excluding 'password' and 'username'
         profile = Profile.objects(id=user_id).exclude("password", "username").first()
 
@@ -17,11 +28,11 @@ async def get_full_profile(user_id: str):
                 detail="User not found."
             )
 
-        # Convert to serializable format
+        # Encode straight to bytes: returning a Response skips jsonable_encoder
         profile_dict = mongo_to_dict(profile)
-        serialized_profile = jsonable_encoder(profile_dict)
+        entry = profile_response_cache.put(cache_key, dumps(profile_dict), epoch)
 
-        return serialized_profile
+        return cached_json_response(entry, accept_encoding)
         
     except HTTPException as he:
         raise he
@@ -33,7 +44,7 @@ async def get_full_profile(user_id: str):
         )
 
 
-@router.get("/profiles", status_code=status.HTTP_200_OK)
+@router.get("/profiles", status_code=status.HTTP_200_OK, dependencies=[auth_required])
 async def get_all_profiles():
     try:
         # Fetch all profiles, excluding sensitive fields
@@ -44,9 +55,8 @@ async def get_all_profiles():
             
         # Convert to serializable format
         profiles_list = [mongo_to_dict(profile) for profile in profiles]
-        serialized_profiles = jsonable_encoder(profiles_list)
-        
-        return serialized_profiles
+
+        return FastJSONResponse(dumps(profiles_list))
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from controllers.profile.history import get_profile_history, get_profile_version, restore_profile_version
+from middlewares.auth import require_profile_owner
+
+router = APIRouter()
+
+def _result_or_raise(result):
+    if not result["success"]:
+        raise HTTPException(
+            status_code=result.get("status_code", status.HTTP_400_BAD_REQUEST),
+            detail=result["errors"][0]
+        )
+    return result["data"]
+
+@router.get("/{user_id}/history", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def profile_history_route(
+    user_id: str,
+    before: int | None = Query(None, ge=1, description="Only versions older than this"),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Saved revisions of the profile, newest first
+
+    Each revision is one section saved: {version, section, at, changes}.
+    Page back with ?before=<oldest version seen>.
+    """
+    try:
+        return _result_or_raise(get_profile_history(user_id, before, limit))
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+@router.get("/{user_id}/history/{version}", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def profile_version_route(user_id: str, version: int):
+    """The profile as it was right after revision `version` (0: before the first)"""
+    try:
+        return _result_or_raise(get_profile_version(user_id, version))
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+@router.post("/{user_id}/history/{version}/restore", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def restore_profile_version_route(user_id: str, version: int, sections: list[str] | None = Body(None, embed=True)):
+    """
+    Undo edits: set sections back to their value at `version` (all unless listed)
+    """
+    try:
+        return _result_or_raise(restore_profile_version(user_id, version, sections))
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Body, status
 from fastapi.encoders import jsonable_encoder
 from controllers.profile.personal_info import update_personal_info
+from middlewares.auth import require_profile_owner
 
 router = APIRouter()
 
-@router.post("/{user_id}/personal_info", status_code=status.HTTP_200_OK)
+@router.post("/{user_id}/personal_info", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
 async def update_profile(
     user_id: str,
     payload: dict = Body(...)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Body, status
 from fastapi.encoders import jsonable_encoder
 from controllers.profile.project import update_projects
+from middlewares.auth import require_profile_owner
 
 router = APIRouter()
 
-@router.post("/{user_id}/project_info", status_code=status.HTTP_200_OK)
+@router.post("/{user_id}/project_info", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
 async def update_projects_route(
     user_id: str,
     projects: list[dict] = Body(..., embed=True)
@@ -0,0 +1,65 @@
+import re
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from middlewares.auth import require_profile_owner
+from services.profile_rendering import RenderBusy, RenderFailed, render_profile
+from utils.profile_render import FORMATS, SECTION_TITLES, available_templates
+
+router = APIRouter()
+
+@router.get("/{user_id}/render", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def render_profile_route(
+    user_id: str,
+    request: Request,
+    format: str = Query("pdf"),
+    template: str = Query("classic"),
+    sections: str | None = Query(None, description="Comma-separated sections (default: all)"),
+    download: bool = Query(False)
+):
+    """
+    Render the profile as a formatted resume (PDF or HTML)
+
+    Repeat downloads of an unchanged profile are served from the render cache;
+    the ETag lets clients revalidate without downloading again.
+    """
+    try:
+        if format not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join(FORMATS)}.")
+        if template not in available_templates():
+            raise HTTPException(status_code=400, detail=f"Unknown template '{template}'.")
+
+        chosen = list(SECTION_TITLES)
+        if sections:
+            requested = {section.strip() for section in sections.split(",") if section.strip()}
+            unknown = sorted(requested - set(SECTION_TITLES))
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}.")
+            # Document order is fixed by the template, not by the query
+            chosen = [section for section in SECTION_TITLES if section in requested]
+
+        result = await render_profile(user_id, template, format, chosen)
+        if result is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+        key, body = result
+
+        etag = f'"{key}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        filename = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{user_id}-resume.{format}")
+        headers["Content-Disposition"] = f'{"attachment" if download else "inline"}; filename="{filename}"'
+        return Response(body, media_type=FORMATS[format][1], headers=headers)
+
+    except RenderBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "5"})
+    except RenderFailed as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
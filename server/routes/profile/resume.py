@@ -0,0 +1,230 @@
+import os
+from urllib.parse import quote
+from dotenv import load_dotenv
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from controllers.profile.resume import (
+    apply_resume_draft, attach_resume, get_resume, get_resume_parse, remove_resume, start_resume_parse
+)
+from middlewares.auth import require_profile_owner
+from services.resume_storage import (
+    RESUME_MAX_BYTES, LocalResumeStore, ResumeUploadError, iter_gridfs_range, parse_range, store_for, store_upload
+)
+
+load_dotenv()
+
+# Start parsing every uploaded resume right away (otherwise only on request)
+RESUME_PARSE_ON_UPLOAD = os.getenv("RESUME_PARSE_ON_UPLOAD", "1") == "1"
+
+router = APIRouter()
+
+# Stored resumes never change (the URL's content only changes on re-upload,
+# which changes the ETag), so browsers may revalidate cheaply
+CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+def content_disposition(filename):
+    """
+    Content-Disposition for a stored resume name (any Unicode, as uploaded)
+
+    Headers are latin-1, so non-ASCII names get an ASCII fallback plus the
+    RFC 5987 filename* value browsers prefer, the way FileResponse does.
+    """
+    fallback = "".join(c if " " <= c <= "~" and c not in '"\\' else "_" for c in filename)
+    value = f'inline; filename="{fallback}"'
+    if fallback != filename:
+        value += f"; filename*=UTF-8''{quote(filename)}"
+    return value
+
+def _raise_for(result):
+    raise HTTPException(
+        status_code=result.get("status_code", status.HTTP_400_BAD_REQUEST),
+        detail=result["errors"][0]
+    )
+
+@router.put("/{user_id}/resume", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def upload_resume_route(user_id: str, request: Request, filename: str = Query("resume")):
+    """
+    Upload a resume as the raw request body (PDF or Word, Content-Type set)
+
+    The body is streamed into storage in chunks and never held in memory.
+    """
+    try:
+        length = request.headers.get("content-length")
+        if length and length.isdigit() and int(length) > RESUME_MAX_BYTES:
+            raise ResumeUploadError(f"Resumes are limited to {RESUME_MAX_BYTES // (1024 * 1024)} MB.", 413)
+
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        blob = await store_upload(request.stream(), content_type)
+
+        result = attach_resume(user_id, blob, os.path.basename(filename)[:255] or "resume")
+        if not result["success"]:
+            _raise_for(result)
+
+        response = result["data"]
+        if RESUME_PARSE_ON_UPLOAD:
+            # A full parse queue only means the client asks for the parse later
+            parse = start_resume_parse(user_id)
+            response["parse"] = parse["data"]["parse"] if parse["success"] else None
+        return response
+
+    except ResumeUploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+
+@router.get("/{user_id}/resume", dependencies=[Depends(require_profile_owner)])
+async def download_resume_route(user_id: str, request: Request):
+    """
+    Download the uploaded resume; supports Range requests and ETag revalidation
+    """
+    try:
+        result = get_resume(user_id)
+        if not result["success"]:
+            _raise_for(result)
+        resume, blob = result["data"]["resume"], result["data"]["blob"]
+
+        etag = f'"{blob["_id"]}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Accept-Ranges": "bytes"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        store = store_for(blob)
+        if isinstance(store, LocalResumeStore):
+            # Starlette answers ranges itself and uses zero-copy sends where the server supports them
+            return FileResponse(
+                store.path(blob["_id"]),
+                media_type=blob["contentType"],
+                filename=resume.filename,
+                content_disposition_type="inline",
+                headers=headers
+            )
+
+        size = blob["size"]
+        byte_range = None
+        if_range = request.headers.get("if-range")
+        if if_range is None or if_range == etag:
+            try:
+                byte_range = parse_range(request.headers.get("range"), size)
+            except ValueError:
+                return Response(
+                    status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+                    headers={**headers, "Content-Range": f"bytes */{size}"}
+                )
+
+        start, end = byte_range or (0, size - 1)
+        headers["Content-Length"] = str(end - start + 1)
+        headers["Content-Disposition"] = content_disposition(resume.filename)
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        # GridFS reads block, so StreamingResponse runs the iterator on a thread
+        return StreamingResponse(
+            iter_gridfs_range(blob, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            media_type=blob["contentType"],
+            headers=headers
+        )
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+
+@router.delete("/{user_id}/resume", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def delete_resume_route(user_id: str):
+    try:
+        result = remove_resume(user_id)
+        if not result["success"]:
+            _raise_for(result)
+        return {"message": result["message"]}
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+
+@router.post("/{user_id}/resume/parse", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_profile_owner)])
+async def start_resume_parse_route(user_id: str, response: Response, force: bool = Query(False)):
+    """
+    Parse the uploaded resume in the background; poll GET .../resume/parse for the result
+    """
+    try:
+        result = start_resume_parse(user_id, force)
+        if not result["success"]:
+            if result["status_code"] == status.HTTP_503_SERVICE_UNAVAILABLE:
+                raise HTTPException(status_code=503, detail=result["errors"][0], headers={"Retry-After": "5"})
+            _raise_for(result)
+
+        parse = result["data"]["parse"]
+        if parse["state"] in ("done", "failed"):
+            # Cached result, nothing was queued
+            response.status_code = status.HTTP_200_OK
+        return parse
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+
+@router.get("/{user_id}/resume/parse", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def get_resume_parse_route(user_id: str):
+    try:
+        result = get_resume_parse(user_id)
+        if not result["success"]:
+            _raise_for(result)
+        return result["data"]["parse"]
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
+
+
+@router.post("/{user_id}/resume/parse/apply", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
+async def apply_resume_draft_route(user_id: str, sections: list[str] | None = Body(None, embed=True)):
+    """
+    Add the parsed draft's valid entries to the profile (all sections unless listed)
+    """
+    try:
+        result = apply_resume_draft(user_id, sections)
+        if not result["success"]:
+            raise HTTPException(
+                status_code=result.get("status_code", status.HTTP_400_BAD_REQUEST),
+                detail=result["errors"]
+            )
+        return result["data"]
+
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error."
+        )
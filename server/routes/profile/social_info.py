@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, model_validator
 from controllers.profile.socials import update_social_links
+from middlewares.auth import require_profile_owner
 
 router = APIRouter()
 
@@ -22,7 +23,7 @@ class SocialsUpdate(BaseModel):
             raise ValueError("At least one social link is required")
         return values
 
-@router.post("/{user_id}/socials", status_code=status.HTTP_200_OK)
+@router.post("/{user_id}/socials", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
 async def update_social_links_route(user_id: str, socials_update: SocialsUpdate = Body(...)):
     try:
         # Convert Pydantic model to dictionary for the controller
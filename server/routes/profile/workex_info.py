@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Body, status
 from fastapi.encoders import jsonable_encoder
 from controllers.profile.workex import update_work_experience
+from middlewares.auth import require_profile_owner
 
 router = APIRouter()
 
-@router.post("/{user_id}/workex_info", status_code=status.HTTP_200_OK)
+@router.post("/{user_id}/workex_info", status_code=status.HTTP_200_OK, dependencies=[Depends(require_profile_owner)])
 async def update_work_experience_route(
     user_id: str,
     work_experience: list[dict] = Body(..., embed=True)
@@ -0,0 +1,40 @@
+"""
+Reconcile the Profile indexes with the model and review slow queries
+
+Usage (from the server directory):
+    python -m scripts.index_advisor            # report only
+    python -m scripts.index_advisor --apply    # drop duplicates, rebuild mismatched, create missing
+    python -m scripts.index_advisor --slow 20  # also list the 20 slowest recorded queries
+"""
+import argparse
+from pymongo import DESCENDING
+from config.db import connect_db
+from models.profile_schema import Profile
+from services.index_advisor import reconcile_indexes, format_report, slow_queries_collection
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile index advisor")
+    parser.add_argument("--apply", action="store_true", help="Apply index changes instead of only reporting")
+    parser.add_argument("--slow", type=int, default=0, help="Show the N slowest recorded queries")
+    args = parser.parse_args()
+
+    if connect_db() is None:
+        raise SystemExit(1)
+
+    report = reconcile_indexes(Profile, apply=args.apply)
+    print(format_report(report))
+    if args.apply:
+        print("Changes applied.")
+
+    if args.slow:
+        print(f"\nSlowest {args.slow} recorded queries:")
+        cursor = slow_queries_collection().find().sort("durationMs", DESCENDING).limit(args.slow)
+        for record in cursor:
+            plan = record.get("plan") or {}
+            print(
+                f"  {record['durationMs']:>9.1f}ms  {record['command']} {record['collection']} "
+                f"{record['shape']}  stages={plan.get('stages')}"
+            )
+
+if __name__ == "__main__":
+    main()
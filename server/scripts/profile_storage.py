@@ -0,0 +1,133 @@
+"""
+Profile document sizes, and moving sections in or out of profile_sections
+
+Saves already place the sections they touch; this handles profiles that
+grew before spilling existed, a changed SECTION_SPILL_BYTES, and orphaned
+spilled sections (profiles replaced by an import or deleted).
+
+Usage (from the server directory):
+    python -m scripts.profile_storage report
+    python -m scripts.profile_storage migrate --dry-run
+    python -m scripts.profile_storage migrate --threshold 262144
+    python -m scripts.profile_storage migrate --inline     # undo: everything back in the profile
+    python -m scripts.profile_storage sweep
+"""
+import argparse
+import heapq
+import json
+from bson import decode
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from config.db import connect_db
+import services.profile_storage as storage
+from models.profile_schema import Profile
+
+# MongoDB's document size limit
+MAX_DOCUMENT_BYTES = 16 * 1024 * 1024
+
+def raw_profiles(fields=None):
+    """Profiles as undecoded BSON, so sizing them costs no decoding"""
+    collection = Profile._get_collection().with_options(codec_options=CodecOptions(document_class=RawBSONDocument))
+    return collection.find({}, fields)
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else None
+
+def report(top):
+    sizes, largest, spilled = [], [], 0
+    section_max = dict.fromkeys(storage.SPILLABLE_SECTIONS, 0)
+    for raw in raw_profiles():
+        size = len(raw.raw)
+        sizes.append(size)
+        document = decode(raw.raw)
+        if document.get("spilled"):
+            spilled += 1
+        for section in storage.SPILLABLE_SECTIONS:
+            section_max[section] = max(section_max[section], storage.section_bytes(document.get(section)))
+        if len(largest) < top:
+            heapq.heappush(largest, (size, str(document["_id"])))
+        else:
+            heapq.heappushpop(largest, (size, str(document["_id"])))
+
+    sizes.sort()
+    spilled_bytes = sum(document["bytes"] for document in storage.sections_collection().find({}, {"bytes": 1}))
+    return {
+        "profiles": len(sizes),
+        "document_bytes": {
+            "p50": percentile(sizes, 0.5), "p99": percentile(sizes, 0.99), "max": sizes[-1] if sizes else None,
+            "over_half_limit": sum(1 for size in sizes if size > MAX_DOCUMENT_BYTES // 2),
+        },
+        "inline_section_bytes_max": section_max,
+        "spill_threshold": storage.SECTION_SPILL_BYTES,
+        "spilled_profiles": spilled,
+        "spilled_section_bytes": spilled_bytes,
+        "largest": [{"id": profile_id, "bytes": size} for size, profile_id in sorted(largest, reverse=True)],
+    }
+
+def needs_move(document):
+    """Sections of a raw profile whose size says they are stored in the wrong place"""
+    spilled = document.get("spilled") or {}
+    moves = []
+    for section in storage.SPILLABLE_SECTIONS:
+        size = spilled[section]["bytes"] if section in spilled else storage.section_bytes(document.get(section))
+        if storage.placement(section, size, spilled) != (section in spilled):
+            moves.append(section)
+    return moves
+
+def migrate(dry_run):
+    fields = {section: 1 for section in storage.SPILLABLE_SECTIONS}
+    fields["spilled"] = 1
+    moved, failed = 0, 0
+    for raw in raw_profiles(fields):
+        document = decode(raw.raw)
+        sections = needs_move(document)
+        if not sections:
+            continue
+        print(f"{document['_id']}: {', '.join(sections)}")
+        if dry_run:
+            moved += 1
+            continue
+        try:
+            profile = Profile.objects(id=document["_id"]).first()
+            for section in sections:
+                # Marked changed, so the save re-places it
+                profile._mark_as_changed(section)
+            profile.save()
+            moved += 1
+        except Exception as e:
+            failed += 1
+            print(f"Error moving sections of {document['_id']}: {str(e)}")
+    return moved, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile storage report and migration")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report", help="Document and section size distribution")
+    report_parser.add_argument("--top", type=int, default=10, help="Largest profiles to list")
+    migrate_parser = commands.add_parser("migrate", help="Move sections to where their size says they belong")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="Only list the profiles that would change")
+    migrate_parser.add_argument("--threshold", type=int, help="Use this instead of SECTION_SPILL_BYTES")
+    migrate_parser.add_argument("--inline", action="store_true", help="Move every spilled section back inline")
+    commands.add_parser("sweep", help="Delete spilled sections no profile points at")
+    args = parser.parse_args()
+
+    if connect_db() is None:
+        raise SystemExit(1)
+
+    if args.command == "report":
+        print(json.dumps(report(args.top), indent=2))
+    elif args.command == "migrate":
+        if args.inline:
+            storage.SECTION_SPILL_BYTES = 2 * MAX_DOCUMENT_BYTES
+        elif args.threshold:
+            storage.SECTION_SPILL_BYTES = args.threshold
+        moved, failed = migrate(args.dry_run)
+        print(f"{'Would move' if args.dry_run else 'Moved'} sections of {moved} profile(s), {failed} failed.")
+    else:
+        orphans = storage.orphaned_sections()
+        if orphans:
+            storage.sections_collection().delete_many({"_id": {"$in": orphans}})
+        print(f"Deleted {len(orphans)} orphaned spilled section(s).")
+
+if __name__ == "__main__":
+    main()
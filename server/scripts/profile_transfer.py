@@ -0,0 +1,52 @@
+"""
+Stream profiles to and from (compressed) JSON lines files
+
+Usage (from the server directory):
+    python -m scripts.profile_transfer export profiles.jsonl.gz
+    python -m scripts.profile_transfer import profiles.jsonl.gz --workers 8 --batch-size 1000
+    python -m scripts.profile_transfer import seed.jsonl --mode insert --skip-aggregates
+
+The compression follows the file name (.gz, .zst, anything else is plain).
+"""
+import argparse
+import json
+from config.db import connect_db
+from services.analytics import rebuild_aggregates
+from services.profile_transfer import (
+    IMPORT_BATCH_SIZE, IMPORT_WORKERS, encoding_for_path, export_profiles, import_profiles
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile bulk import/export")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Write every profile to a JSON lines file")
+    export_parser.add_argument("path")
+
+    import_parser = commands.add_parser("import", help="Validate and load profiles from a JSON lines file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--mode", choices=["upsert", "insert"], default="upsert")
+    import_parser.add_argument("--workers", type=int, default=IMPORT_WORKERS, help="Validation processes (0: inline)")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    import_parser.add_argument("--skip-aggregates", action="store_true", help="Do not rebuild analytics aggregates afterwards")
+    args = parser.parse_args()
+
+    if connect_db() is None:
+        raise SystemExit(1)
+
+    encoding = encoding_for_path(args.path)
+    if args.command == "export":
+        with open(args.path, "wb") as f:
+            written = export_profiles(f, encoding)
+        print(f"Exported profiles to {args.path} ({written} bytes).")
+        return
+
+    with open(args.path, "rb") as f:
+        report = import_profiles(f, encoding, args.mode, args.workers, args.batch_size)
+    print(json.dumps(report, indent=2))
+
+    if report["written"] and not args.skip_aggregates:
+        print(f"Rebuilt aggregates: {', '.join(rebuild_aggregates())}")
+
+if __name__ == "__main__":
+    main()
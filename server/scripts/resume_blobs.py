@@ -0,0 +1,27 @@
+"""
+Delete stored resumes that no profile references any more
+
+Replaced and removed resumes are only unlinked from their profile (another
+profile may share the same file), so their bytes are reclaimed here.
+
+Usage (from the server directory):
+    python -m scripts.resume_blobs                 # blobs unused for an hour
+    python -m scripts.resume_blobs --min-age 86400
+"""
+import argparse
+from config.db import connect_db
+from services.resume_storage import sweep_orphaned_blobs
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume blob sweeper")
+    parser.add_argument("--min-age", type=int, default=3600, help="Skip blobs used within this many seconds")
+    args = parser.parse_args()
+
+    if connect_db() is None:
+        raise SystemExit(1)
+
+    deleted = sweep_orphaned_blobs(args.min_age)
+    print(f"Deleted {deleted} orphaned resume file(s).")
+
+if __name__ == "__main__":
+    main()
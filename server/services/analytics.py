@@ -0,0 +1,196 @@
+import queue
+import threading
+from collections import Counter
+from bson import ObjectId
+from mongoengine.connection import get_db
+from pymongo import UpdateOne, ASCENDING, DESCENDING
+from models.profile_schema import Profile
+from services.profile_events import subscribe
+
+AGGREGATES_COLLECTION = "profile_aggregates"
+
+# dimension name -> (Profile section, field inside each entry or None for plain strings)
+DIMENSIONS = {
+    "skills": ("skills", None),
+    "institution": ("academic", "institution"),
+    "degree": ("academic", "degree"),
+    "company": ("workEx", "company"),
+    "issuingOrganization": ("certifications", "issuingOrganization"),
+}
+
+# Maximum number of queued deltas merged into a single bulk write
+BATCH_SIZE = 500
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+_indexes_ready = False
+
+def normalize_key(value):
+    """Normalize a raw value into the key used for counting"""
+    return value.strip().lower()
+
+def aggregates_collection():
+    """Return the raw pymongo collection holding materialized counters"""
+    global _indexes_ready
+    collection = get_db()[AGGREGATES_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index([("dimension", ASCENDING), ("count", DESCENDING)])
+        _indexes_ready = True
+    return collection
+
+def extract_values(section_data, field):
+    """
+    Collect the distinct values of a dimension from a section snapshot
+
+    Returns:
+        Dict of normalized key -> display value (one per profile, so counts are per profile)
+    """
+    values = {}
+    for entry in section_data or []:
+        raw = entry if field is None else (entry or {}).get(field)
+        if not isinstance(raw, str) or not raw.strip():
+            continue
+        values.setdefault(normalize_key(raw), raw.strip())
+    return values
+
+def compute_deltas(section, old, new):
+    """Diff two section snapshots into (dimension, key, display value, +1/-1) tuples"""
+    deltas = []
+    for dimension, (dim_section, field) in DIMENSIONS.items():
+        if dim_section != section:
+            continue
+        before = extract_values(old, field)
+        after = extract_values(new, field)
+        for key in after.keys() - before.keys():
+            deltas.append((dimension, key, after[key], 1))
+        for key in before.keys() - after.keys():
+            deltas.append((dimension, key, before[key], -1))
+    return deltas
+
+def apply_deltas(deltas):
+    """Apply a batch of deltas to the aggregates collection with one bulk write"""
+    totals = Counter()
+    display = {}
+    for dimension, key, value, delta in deltas:
+        totals[(dimension, key)] += delta
+        display[(dimension, key)] = value
+
+    operations = [
+        UpdateOne(
+            {"_id": f"{dimension}:{key}"},
+            {
+                "$inc": {"count": delta},
+                # Tells a running rebuild this counter moved under it (see rebuild_aggregates)
+                "$set": {"touched": True},
+                "$setOnInsert": {"dimension": dimension, "key": key, "value": display[(dimension, key)]}
+            },
+            upsert=True
+        )
+        for (dimension, key), delta in totals.items()
+        if delta != 0
+    ]
+    if operations:
+        aggregates_collection().bulk_write(operations, ordered=False)
+    return len(operations)
+
+def _drain():
+    """Worker loop: merge queued deltas and flush them in batches"""
+    while True:
+        batch = list(_queue.get())
+        try:
+            while len(batch) < BATCH_SIZE:
+                batch.extend(_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        try:
+            apply_deltas(batch)
+        except Exception as e:
+            print(f"Error applying analytics deltas: {str(e)}")
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_drain, name="analytics-aggregator", daemon=True)
+            _worker.start()
+
+@subscribe
+def on_section_change(user_id, section, old, new):
+    """Profile event handler: queue counter updates for the changed section"""
+    if not any(dim_section == section for dim_section, _ in DIMENSIONS.values()):
+        return
+    deltas = compute_deltas(section, old, new)
+    if deltas:
+        _ensure_worker()
+        _queue.put(deltas)
+
+def rebuild_pipeline(dimension, rebuild_id):
+    """Build the aggregation pipeline that recomputes one dimension and $merges it"""
+    section, field = DIMENSIONS[dimension]
+    path = f"${section}" if field is None else f"${section}.{field}"
+    trimmed = {"$trim": {"input": path}}
+
+    return [
+        {"$unwind": f"${section}"},
+        {"$match": {(section if field is None else f"{section}.{field}"): {"$type": "string"}}},
+        {"$project": {"k": {"$toLower": trimmed}, "v": trimmed}},
+        {"$match": {"k": {"$ne": ""}}},
+        # Deduplicate per profile so counts mean "profiles having this value"
+        {"$group": {"_id": {"p": "$_id", "k": "$k"}, "v": {"$first": "$v"}}},
+        {"$group": {"_id": "$_id.k", "value": {"$first": "$v"}, "count": {"$sum": 1}}},
+        {"$project": {
+            "_id": {"$concat": [f"{dimension}:", "$_id"]},
+            "dimension": {"$literal": dimension},
+            "key": "$_id",
+            "value": 1,
+            "count": 1,
+            "rebuildId": {"$literal": rebuild_id}
+        }},
+        {"$merge": {
+            "into": AGGREGATES_COLLECTION,
+            "on": "_id",
+            # A counter a delta touched during the rebuild keeps its count, which
+            # may include increments this pipeline did not see
+            "whenMatched": [{"$set": {
+                "count": {"$cond": [{"$eq": ["$touched", True]}, "$count", "$$new.count"]},
+                "value": "$$new.value",
+                "rebuildId": "$$new.rebuildId",
+            }}],
+            "whenNotMatched": "insert"
+        }}
+    ]
+
+def rebuild_aggregates(dimensions=None):
+    """
+    Recompute materialized counters from scratch with $merge pipelines
+
+    Counters that no longer appear in any profile are removed afterwards.
+    Incremental deltas keep flowing meanwhile, from every worker: each one
+    marks its counter touched, and a counter touched since the rebuild of
+    its dimension started is neither replaced nor removed; the next rebuild
+    reconciles it.
+    """
+    profiles = Profile._get_collection()
+    collection = aggregates_collection()
+    rebuild_id = ObjectId()
+    rebuilt = []
+
+    for dimension in dimensions or DIMENSIONS.keys():
+        collection.update_many({"dimension": dimension, "touched": True}, {"$unset": {"touched": ""}})
+        list(profiles.aggregate(rebuild_pipeline(dimension, rebuild_id), allowDiskUse=True))
+        collection.delete_many({"dimension": dimension, "rebuildId": {"$ne": rebuild_id}, "touched": {"$ne": True}})
+        rebuilt.append(dimension)
+
+    return rebuilt
+
+def get_top_values(dimension, limit=20):
+    """Read the top counters of a dimension straight from the materialized collection"""
+    cursor = (
+        aggregates_collection()
+        .find({"dimension": dimension, "count": {"$gt": 0}}, {"_id": 0, "value": 1, "count": 1})
+        .sort("count", DESCENDING)
+        .limit(limit)
+    )
+    return list(cursor)
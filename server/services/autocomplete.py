@@ -0,0 +1,208 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from services.analytics import DIMENSIONS, aggregates_collection, compute_deltas, rebuild_aggregates
+from services.profile_events import subscribe
+
+# Rebuild indexes from the aggregates collection at most this often, so writes
+# handled by other workers eventually show up here as well
+REFRESH_INTERVAL_SECONDS = 300
+
+# Number of cached prefixes kept per index before the cache is reset
+PREFIX_CACHE_SIZE = 4096
+
+# Largest number of suggestions a lookup may ask for
+MAX_LIMIT = 50
+
+# Prefixes up to this long match too many keys to scan per keystroke; their
+# most popular keys are kept ranked instead and updated on every write
+TOP_PREFIX_LENGTH = 2
+
+# Keys ranked per short prefix: MAX_LIMIT plus slack, so keys dropping out of
+# the ranking only rarely force a rescan of the prefix
+TOP_KEYS = 2 * MAX_LIMIT
+
+class _Ranking:
+    """
+    Best keys of one short prefix, most popular first (ties alphabetical)
+
+    Every key with the prefix that is not listed ranks below every listed
+    key; `complete` means no key with the prefix is left out at all.
+    """
+
+    def __init__(self, keys, complete):
+        self.keys = keys
+        self.complete = complete
+
+class PrefixIndex:
+    """
+    Sorted array of normalized values with popularity counts
+
+    Lookups binary-search the first key with the prefix and scan forward while
+    keys still match, so a query touches only the matching range. Short
+    prefixes, whose range can cover most of the index, are answered from
+    rankings maintained as counts change.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.counts = {}
+        self.display = {}
+        self.top = {}
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def _rank(self, key):
+        return -self.counts[key], key
+
+    def _matching(self, prefix):
+        keys = self.keys
+        start = bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return keys[start:end]
+
+    def _ranking(self, keys):
+        ranked = heapq.nsmallest(TOP_KEYS + 1, keys, key=self._rank)
+        return _Ranking(ranked[:TOP_KEYS], len(ranked) <= TOP_KEYS)
+
+    def load(self, entries):
+        """Replace the index contents with (key, display value, count) entries"""
+        counts = {}
+        display = {}
+        for key, value, count in entries:
+            if count > 0:
+                counts[key] = count
+                display[key] = value
+        by_prefix = {}
+        for key in counts:
+            for length in range(1, min(len(key), TOP_PREFIX_LENGTH) + 1):
+                by_prefix.setdefault(key[:length], []).append(key)
+        with self.lock:
+            self.keys = sorted(counts)
+            self.counts = counts
+            self.display = display
+            self.top = {prefix: self._ranking(keys) for prefix, keys in by_prefix.items()}
+            self.cache = {}
+
+    def add(self, key, value, delta):
+        """Apply a popularity delta, inserting or removing the key as needed"""
+        with self.lock:
+            count = self.counts.get(key, 0) + delta
+            if count > 0:
+                if key not in self.counts:
+                    insort(self.keys, key)
+                    self.display[key] = value
+                self.counts[key] = count
+            elif key in self.counts:
+                del self.keys[bisect_left(self.keys, key)]
+                del self.counts[key]
+                del self.display[key]
+            else:
+                return
+
+            for length in range(1, min(len(key), TOP_PREFIX_LENGTH) + 1):
+                self._rerank(key[:length], key, count)
+            # Only lookups for prefixes of the changed key can have moved
+            for length in range(len(key) + 1):
+                self.cache.pop(key[:length], None)
+
+    def _rerank(self, prefix, key, count):
+        ranking = self.top.get(prefix)
+        if ranking is None:
+            if count > 0:
+                self.top[prefix] = _Ranking([key], True)
+            return
+        keys = ranking.keys
+        listed = key in keys
+        if listed:
+            keys.remove(key)
+        if count > 0 and (ranking.complete or (keys and self._rank(key) < self._rank(keys[-1]))):
+            insort(keys, key, key=self._rank)
+            if len(keys) > TOP_KEYS:
+                keys.pop()
+                ranking.complete = False
+        elif not listed:
+            # Still ranks below every listed key
+            return
+        # A listed key that dropped below the last one may now rank below
+        # unlisted keys, so it was left out; rescan once too few remain
+        if len(keys) < MAX_LIMIT and not ranking.complete:
+            self.top[prefix] = self._ranking(self._matching(prefix))
+
+    def suggest(self, prefix, limit=10):
+        """Return up to `limit` display values starting with `prefix`, most popular first"""
+        cached = self.cache.get(prefix, {}).get(limit)
+        if cached is not None:
+            return cached
+
+        with self.lock:
+            ranking = self.top.get(prefix) if prefix and len(prefix) <= TOP_PREFIX_LENGTH else None
+            if ranking is not None and (ranking.complete or len(ranking.keys) >= limit):
+                top = ranking.keys[:limit]
+            else:
+                top = heapq.nsmallest(limit, self._matching(prefix), key=self._rank)
+            results = [{"value": self.display[key], "count": self.counts[key]} for key in top]
+
+            if len(self.cache) >= PREFIX_CACHE_SIZE:
+                self.cache = {}
+            self.cache.setdefault(prefix, {})[limit] = results
+        return results
+
+_indexes = {dimension: PrefixIndex() for dimension in DIMENSIONS}
+_loaded_at = None
+_load_lock = threading.Lock()
+
+def load_indexes():
+    """Build every prefix index from the materialized aggregates"""
+    global _loaded_at
+    collection = aggregates_collection()
+
+    # First run on a fresh database: materialize the counters from profiles
+    if collection.estimated_document_count() == 0:
+        rebuild_aggregates()
+
+    for dimension, index in _indexes.items():
+        cursor = collection.find(
+            {"dimension": dimension, "count": {"$gt": 0}},
+            {"_id": 0, "key": 1, "value": 1, "count": 1}
+        )
+        index.load((doc["key"], doc["value"], doc["count"]) for doc in cursor)
+
+    _loaded_at = time.monotonic()
+
+def _refresh_in_background():
+    def run():
+        try:
+            load_indexes()
+        except Exception as e:
+            print(f"Error refreshing autocomplete indexes: {str(e)}")
+        finally:
+            _load_lock.release()
+
+    if _load_lock.acquire(blocking=False):
+        threading.Thread(target=run, name="autocomplete-refresh", daemon=True).start()
+
+def ensure_loaded():
+    """Load indexes on first use and schedule periodic background refreshes"""
+    if _loaded_at is None:
+        with _load_lock:
+            if _loaded_at is None:
+                load_indexes()
+    elif time.monotonic() - _loaded_at > REFRESH_INTERVAL_SECONDS:
+        _refresh_in_background()
+
+def suggest(dimension, prefix, limit=10):
+    """Prefix lookup against the in-memory index for a dimension"""
+    ensure_loaded()
+    return _indexes[dimension].suggest(prefix.strip().lower(), limit)
+
+@subscribe
+def on_section_change(user_id, section, old, new):
+    """Profile event handler: keep the in-memory indexes in step with writes"""
+    if _loaded_at is None:
+        return
+    for dimension, key, value, delta in compute_deltas(section, old, new):
+        _indexes[dimension].add(key, value, delta)
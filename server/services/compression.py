@@ -0,0 +1,90 @@
+import gzip
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+# brotli and zstandard are optional; encodings whose library is missing are
+# simply never negotiated
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+load_dotenv()
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Bodies at least this large are compressed on a worker thread instead of the event loop
+COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", str(256 * 1024)))
+
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "3"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+def _gzip(body, level):
+    # mtime=0 keeps output deterministic, so cached variants are byte-identical
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+def _brotli(body, level):
+    return brotli.compress(body, quality=level, mode=brotli.MODE_TEXT)
+
+def _zstd(body, level):
+    # Compressor objects are not thread-safe; they are cheap enough to make per call
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+# Encoding -> (compress function, default level), in server preference order
+CODECS = {}
+if brotli is not None:
+    CODECS["br"] = (_brotli, BROTLI_QUALITY)
+if zstandard is not None:
+    CODECS["zstd"] = (_zstd, ZSTD_LEVEL)
+CODECS["gzip"] = (_gzip, GZIP_LEVEL)
+
+def compress(body, encoding, level=None):
+    """Compress body with a negotiated encoding, at the configured level unless given"""
+    function, default_level = CODECS[encoding]
+    return function(body, default_level if level is None else level)
+
+def is_compressible(content_type):
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding):
+    """
+    Pick the encoding to use for an Accept-Encoding header value
+
+    The client's q-values win; ties go to the server's preference order in
+    CODECS. Returns None when the response should be sent uncompressed.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in CODECS:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
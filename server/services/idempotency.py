@@ -0,0 +1,102 @@
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from bson import Binary
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo.errors import DuplicateKeyError
+
+load_dotenv()
+
+IDEMPOTENCY_COLLECTION = "idempotency_keys"
+
+# Completed responses are replayed for this long
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+
+# A pending claim older than this is treated as abandoned (e.g. the worker died)
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+MAX_KEY_LENGTH = 255
+
+_indexes_ready = False
+
+def idempotency_collection():
+    global _indexes_ready
+    collection = get_db()[IDEMPOTENCY_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index("expireAt", expireAfterSeconds=0)
+        _indexes_ready = True
+    return collection
+
+def scoped_key(key, method, path, authorization):
+    """
+    Storage key for an Idempotency-Key
+
+    Keys are scoped to the caller's credentials and the route, so one client
+    can never be answered with another client's stored response.
+    """
+    scope = "\n".join((key, method, path, authorization or ""))
+    return hashlib.sha256(scope.encode()).hexdigest()
+
+def fingerprint(body):
+    return hashlib.sha256(body).hexdigest()
+
+def claim(record_id, body_fingerprint):
+    """
+    Try to become the request that executes this key
+
+    Returns:
+        None if the claim succeeded, otherwise the existing record
+    """
+    now = datetime.now(timezone.utc)
+    collection = idempotency_collection()
+    try:
+        collection.insert_one({
+            "_id": record_id,
+            "fingerprint": body_fingerprint,
+            "state": "pending",
+            "createdAt": now,
+            "expireAt": now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+        })
+        return None
+    except DuplicateKeyError:
+        pass
+
+    # Take over claims abandoned by a crashed request before the TTL monitor removes them
+    result = collection.update_one(
+        {"_id": record_id, "state": "pending", "expireAt": {"$lt": now}},
+        {"$set": {
+            "fingerprint": body_fingerprint,
+            "createdAt": now,
+            "expireAt": now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+        }}
+    )
+    if result.modified_count:
+        return None
+    return collection.find_one({"_id": record_id})
+
+def load(record_id):
+    return idempotency_collection().find_one({"_id": record_id})
+
+def complete(record_id, status, headers, body):
+    """Store the final response of a claimed key"""
+    now = datetime.now(timezone.utc)
+    idempotency_collection().update_one(
+        {"_id": record_id},
+        {"$set": {
+            "state": "done",
+            "status": status,
+            "headers": [[key.decode("latin-1"), value.decode("latin-1")] for key, value in headers],
+            "body": Binary(body),
+            "expireAt": now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        }}
+    )
+
+def release(record_id):
+    """Drop a claim whose request failed, so a retry executes again"""
+    idempotency_collection().delete_one({"_id": record_id, "state": "pending"})
+
+def stored_response(record):
+    """(status, raw headers, body) of a completed record"""
+    headers = [(key.encode("latin-1"), value.encode("latin-1")) for key, value in record["headers"]]
+    return record["status"], headers, bytes(record["body"])
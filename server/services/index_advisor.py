@@ -0,0 +1,344 @@
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo import monitoring, ASCENDING
+
+load_dotenv()
+
+# Commands slower than this are recorded with their explain plan
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+# A query shape is explained at most once per this many seconds
+EXPLAIN_INTERVAL_SECONDS = 600
+
+SLOW_QUERIES_COLLECTION = "slow_queries"
+
+# Slow query records expire after a week
+SLOW_QUERY_TTL_SECONDS = 7 * 24 * 3600
+
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+
+def query_shape(value):
+    """Replace literal values in a filter with 1 so equal shapes compare equal"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [query_shape(item) for item in value]
+    return 1
+
+def _command_filter(command_name, command):
+    """Pull the filter out of a command document for shape grouping and index proposals"""
+    if command_name in ("find", "count", "distinct"):
+        return command.get("filter") or command.get("query") or {}
+    if command_name == "findAndModify":
+        return command.get("query") or {}
+    if command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or []
+        return statements[0].get("q", {}) if statements else {}
+    if command_name == "aggregate":
+        for stage in command.get("pipeline", []):
+            if "$match" in stage:
+                return stage["$match"]
+    return {}
+
+RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte", "$ne", "$in", "$nin")
+
+def split_filter_fields(query_filter):
+    """Split a filter's top-level fields into (equality fields, range fields)"""
+    equality, ranges = [], []
+    for field, value in (query_filter or {}).items():
+        if field.startswith("$"):
+            continue
+        if isinstance(value, dict) and any(op in value for op in RANGE_OPERATORS):
+            ranges.append(field)
+        else:
+            equality.append(field)
+    return equality, ranges
+
+def _explainable(command_name, command):
+    """Strip wire-protocol fields that explain does not accept"""
+    ignored = {"lsid", "$db", "$clusterTime", "txnNumber", "$readPreference", "writeConcern", "cursor"}
+    explainable = {key: value for key, value in command.items() if key not in ignored}
+    if command_name == "aggregate":
+        explainable["cursor"] = {}
+    return explainable
+
+def _slow_command(command_name, command):
+    """
+    Copy of a slow command to explain and record later
+
+    Writes keep only their first statement: it is the one the filter is
+    taken from, and explain accepts a single statement.
+    """
+    command = dict(command)
+    if command_name in ("update", "delete"):
+        field = f"{command_name}s"
+        command[field] = list(command.get(field) or [])[:1]
+    return command
+
+def _plan_stages(plan):
+    """Flatten the stage names of a winning plan tree"""
+    stages = []
+    while plan:
+        stages.append(plan.get("stage"))
+        if "inputStage" in plan:
+            plan = plan["inputStage"]
+        elif plan.get("inputStages"):
+            for child in plan["inputStages"]:
+                stages.extend(_plan_stages(child))
+            break
+        else:
+            break
+    return stages
+
+def summarize_explain(explain):
+    """Reduce an explain document to the winning plan's stages and index names"""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # Aggregations report the planner per stage
+        for stage in explain.get("stages", []):
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner")
+                break
+    planner = planner or {}
+    winning = planner.get("winningPlan", {})
+    winning = winning.get("queryPlan", winning)
+    stages = _plan_stages(winning)
+    return {
+        "stages": stages,
+        "collectionScan": "COLLSCAN" in stages,
+        "indexes": sorted(set(_index_names(winning))),
+    }
+
+def _index_names(plan):
+    if not plan:
+        return []
+    names = [plan["indexName"]] if "indexName" in plan else []
+    for child in [plan.get("inputStage")] + list(plan.get("inputStages", [])):
+        names.extend(_index_names(child))
+    return names
+
+class SlowQueryListener(monitoring.CommandListener):
+    """
+    pymongo command monitor that records slow commands
+
+    Explains run on a background thread (never inside the listener) and at most
+    once per query shape per EXPLAIN_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, threshold_ms=SLOW_QUERY_MS):
+        self.threshold_ms = threshold_ms
+        self._commands = {}
+        self._explained_at = {}
+        self._queue = queue.Queue(maxsize=1000)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        # Only a reference: almost no command turns out slow, so the copy the
+        # explain needs is made in succeeded, for slow ones
+        if event.command_name in EXPLAINABLE_COMMANDS:
+            collection = event.command.get(event.command_name)
+            if collection != SLOW_QUERIES_COLLECTION:
+                self._commands[(event.connection_id, event.request_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        started = self._commands.pop((event.connection_id, event.request_id), None)
+        if started is not None and event.duration_micros / 1000 >= self.threshold_ms:
+            database_name, command = started
+            self._enqueue(event, database_name, _slow_command(event.command_name, command))
+
+    def failed(self, event):
+        self._commands.pop((event.connection_id, event.request_id), None)
+
+    def _enqueue(self, event, database_name, command):
+        try:
+            self._queue.put_nowait((event.command_name, database_name, command, event.duration_micros / 1000))
+        except queue.Full:
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            command_name, database_name, command, duration_ms = self._queue.get()
+            try:
+                self._record(command_name, database_name, command, duration_ms)
+            except Exception as e:
+                print(f"Error recording slow query: {str(e)}")
+
+    def _record(self, command_name, database_name, command, duration_ms):
+        collection = command.get(command_name)
+        query_filter = _command_filter(command_name, command)
+        equality, ranges = split_filter_fields(query_filter)
+        shape_key = repr({"command": command_name, "collection": collection, "filter": query_shape(query_filter)})
+
+        plan = None
+        now = time.monotonic()
+        if now - self._explained_at.get(shape_key, float("-inf")) >= EXPLAIN_INTERVAL_SECONDS:
+            self._explained_at[shape_key] = now
+            db = get_db().client[database_name]
+            explain = db.command({"explain": _explainable(command_name, command), "verbosity": "queryPlanner"})
+            plan = summarize_explain(explain)
+
+        # Filters are stored as a string shape plus field lists: raw filters may
+        # contain $-prefixed keys that cannot be stored as document field names
+        slow_queries_collection().insert_one({
+            "command": command_name,
+            "collection": collection,
+            "shape": shape_key,
+            "equalityFields": equality,
+            "rangeFields": ranges,
+            "sortFields": list(command.get("sort") or {}),
+            "durationMs": round(duration_ms, 3),
+            "plan": plan,
+            "createdAt": datetime.now(timezone.utc),
+        })
+
+        if plan and plan["collectionScan"]:
+            print(f"⚠️ Slow query ({duration_ms:.1f}ms) did a collection scan on {collection}: {shape_key}")
+
+_slow_indexes_ready = False
+
+def slow_queries_collection():
+    global _slow_indexes_ready
+    collection = get_db()[SLOW_QUERIES_COLLECTION]
+    if not _slow_indexes_ready:
+        collection.create_index("createdAt", expireAfterSeconds=SLOW_QUERY_TTL_SECONDS)
+        _slow_indexes_ready = True
+    return collection
+
+def _normalize_key(fields):
+    return tuple((name, direction) for name, direction in fields)
+
+def declared_indexes(document_cls):
+    """Index specs mongoengine would create for a Document class"""
+    return [
+        {
+            "key": _normalize_key(spec["fields"]),
+            "unique": bool(spec.get("unique", False)),
+            "sparse": bool(spec.get("sparse", False)),
+        }
+        for spec in document_cls._meta.get("index_specs", [])
+    ]
+
+def actual_indexes(collection):
+    """Indexes present on the server, excluding _id"""
+    return [
+        {
+            "name": name,
+            "key": _normalize_key(info["key"]),
+            "unique": bool(info.get("unique", False)),
+            "sparse": bool(info.get("sparse", False)),
+        }
+        for name, info in collection.index_information().items()
+        if name != "_id_"
+    ]
+
+def propose_indexes_from_slow_queries(collection_name, existing_keys):
+    """
+    Suggest indexes for query shapes that ended in collection scans
+
+    Fields are ordered equality first, then sort, then range (ESR).
+    """
+    proposals = {}
+    cursor = slow_queries_collection().find({"collection": collection_name, "plan.collectionScan": True})
+    for record in cursor:
+        equality = record.get("equalityFields", [])
+        ranges = record.get("rangeFields", [])
+        sort_fields = [field for field in record.get("sortFields", []) if field not in equality]
+        fields = equality + sort_fields + [field for field in ranges if field not in sort_fields]
+        if not fields:
+            continue
+        key = tuple((field, ASCENDING) for field in fields)
+        # Skip shapes whose selective (equality) prefix is already indexed;
+        # those scans predate the index or come from unselective values
+        prefix = key[:len(equality)] or key
+        if any(existing[:len(prefix)] == prefix for existing in existing_keys):
+            continue
+        proposal = proposals.setdefault(key, {"key": key, "queries": 0, "maxDurationMs": 0})
+        proposal["queries"] += 1
+        proposal["maxDurationMs"] = max(proposal["maxDurationMs"], record.get("durationMs", 0))
+    return sorted(proposals.values(), key=lambda item: -item["queries"])
+
+def reconcile_indexes(document_cls, apply=False):
+    """
+    Compare a Document's declared indexes with the server's
+
+    Reports declared-but-missing indexes, indexes whose options differ from the
+    declaration, duplicate indexes over the same key, undeclared indexes, and
+    proposals from slow collection scans. With apply=True, duplicates are
+    dropped, mismatched indexes rebuilt and missing ones created; undeclared
+    indexes are only reported.
+    """
+    # Use the raw collection: _get_collection() would try to create the declared
+    # indexes and fail on exactly the conflicts this function is meant to report
+    collection = get_db(document_cls._meta.get("db_alias", "default"))[document_cls._get_collection_name()]
+    declared = declared_indexes(document_cls)
+    actual = actual_indexes(collection)
+
+    by_key = {}
+    for index in actual:
+        by_key.setdefault(index["key"], []).append(index)
+
+    report = {"collection": collection.name, "missing": [], "mismatched": [], "duplicates": [], "undeclared": [], "proposed": []}
+
+    declared_keys = set()
+    for spec in declared:
+        declared_keys.add(spec["key"])
+        present = by_key.get(spec["key"], [])
+        matching = [index for index in present if index["unique"] == spec["unique"] and index["sparse"] == spec["sparse"]]
+        if matching:
+            report["duplicates"].extend(index["name"] for index in present if index not in matching[:1])
+        elif present:
+            report["mismatched"].append({"declared": spec, "actual": present})
+        else:
+            report["missing"].append(spec)
+
+    for key, indexes in by_key.items():
+        if key not in declared_keys:
+            report["undeclared"].extend(index["name"] for index in indexes)
+
+    report["proposed"] = propose_indexes_from_slow_queries(collection.name, [index["key"] for index in actual])
+
+    if apply:
+        for name in report["duplicates"]:
+            collection.drop_index(name)
+        for item in report["mismatched"]:
+            for index in item["actual"]:
+                collection.drop_index(index["name"])
+            report["missing"].append(item["declared"])
+        for spec in report["missing"]:
+            collection.create_index(list(spec["key"]), unique=spec["unique"], sparse=spec["sparse"], background=True)
+
+    return report
+
+def format_report(report):
+    """Human-readable rendering of a reconcile_indexes() report"""
+    def key_text(key):
+        return ", ".join(f"{field}:{direction}" for field, direction in key)
+
+    lines = [f"Index report for '{report['collection']}'"]
+    for spec in report["missing"]:
+        lines.append(f"  + missing     {key_text(spec['key'])} unique={spec['unique']} sparse={spec['sparse']}")
+    for item in report["mismatched"]:
+        names = ", ".join(index["name"] for index in item["actual"])
+        lines.append(f"  ~ mismatched  {names} -> unique={item['declared']['unique']} sparse={item['declared']['sparse']}")
+    for name in report["duplicates"]:
+        lines.append(f"  - duplicate   {name}")
+    for name in report["undeclared"]:
+        lines.append(f"  ? undeclared  {name}")
+    for proposal in report["proposed"]:
+        lines.append(
+            f"  * proposed    {key_text(proposal['key'])} "
+            f"({proposal['queries']} slow scans, max {proposal['maxDurationMs']}ms)"
+        )
+    if len(lines) == 1:
+        lines.append("  ✅ indexes match the model declaration")
+    return "\n".join(lines)
@@ -0,0 +1,229 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo import ASCENDING, ReturnDocument
+from services.metrics import JOB_QUEUE_DEPTH, JOBS, JOB_LATENCY
+
+load_dotenv()
+
+# Jobs executing at the same time (each runs on a worker thread)
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "4"))
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+
+# Retry n waits JOB_RETRY_BASE_SECONDS * 2^(n-1)
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "2"))
+
+# With JOBS_DURABLE=1, jobs enqueued with durable=True are stored in Mongo and
+# survive restarts; otherwise every job lives in the in-memory queue
+JOBS_DURABLE = os.getenv("JOBS_DURABLE", "0") == "1"
+
+JOBS_COLLECTION = "jobs"
+
+# A claimed durable job is retried by any worker once its lease runs out
+JOB_LEASE_SECONDS = 300
+
+DURABLE_POLL_SECONDS = 1.0
+DEPTH_CHECK_SECONDS = 10.0
+
+# Failed durable jobs are kept this long for inspection
+FAILED_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+MEMORY_QUEUE_SIZE = 10000
+
+_handlers = {}
+
+def job(name):
+    """Register a function as the handler of a background job; it is called with the payload as kwargs"""
+    def register(function):
+        _handlers[name] = function
+        return function
+    return register
+
+def retry_delay(attempt):
+    return JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1)
+
+_indexes_ready = False
+
+def jobs_collection():
+    global _indexes_ready
+    collection = get_db()[JOBS_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index([("state", ASCENDING), ("runAt", ASCENDING)])
+        collection.create_index("expireAt", expireAfterSeconds=0)
+        _indexes_ready = True
+    return collection
+
+class JobRunner:
+    """
+    Runs background jobs on a dedicated event loop thread
+
+    In-memory jobs go through an asyncio queue; durable jobs are claimed from
+    the jobs collection with a lease. JOB_CONCURRENCY worker tasks execute
+    handlers on threads, so blocking Firebase/Mongo calls are fine. Failed
+    attempts are retried with exponential backoff up to JOB_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, concurrency=JOB_CONCURRENCY, durable=JOBS_DURABLE):
+        self.concurrency = concurrency
+        self.durable = durable
+        self._loop = None
+        self._queue = None
+        self._wake = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            ready = threading.Event()
+
+            def run():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._queue = asyncio.Queue(maxsize=MEMORY_QUEUE_SIZE)
+                self._wake = asyncio.Event()
+                for _ in range(self.concurrency):
+                    loop.create_task(self._worker())
+                if self.durable:
+                    loop.create_task(self._poll_durable())
+                self._loop = loop
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name="background-jobs", daemon=True).start()
+            ready.wait()
+
+    def enqueue(self, name, payload, durable=False):
+        """
+        Schedule a job from any thread
+
+        Args:
+            name: Name registered with @job
+            payload: JSON-serializable dict passed to the handler as kwargs
+            durable: Persist the job in Mongo (when JOBS_DURABLE is on)
+        """
+        if name not in _handlers:
+            raise KeyError(f"Unknown background job: {name}")
+
+        self._ensure_started()
+        if durable and self.durable:
+            now = datetime.now(timezone.utc)
+            jobs_collection().insert_one({
+                "name": name, "payload": payload, "state": "queued",
+                "attempts": 0, "runAt": now, "createdAt": now,
+            })
+            self._loop.call_soon_threadsafe(self._wake.set)
+        else:
+            self._loop.call_soon_threadsafe(self._put, (name, payload, 1, None))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+            JOB_QUEUE_DEPTH.inc("memory")
+        except asyncio.QueueFull:
+            JOBS.inc(item[0], "dropped")
+            print(f"⚠️ Background job queue full, dropped {item[0]}")
+
+    async def _worker(self):
+        while True:
+            name, payload, attempt, job_id = await self._queue.get()
+            if job_id is None:
+                JOB_QUEUE_DEPTH.dec("memory")
+
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(_handlers[name], **payload)
+                error = None
+            except Exception as e:
+                error = e
+            JOB_LATENCY.observe(time.perf_counter() - start, name)
+
+            if error is None:
+                JOBS.inc(name, "success")
+                if job_id is not None:
+                    await asyncio.to_thread(self._finish_durable, job_id)
+            elif attempt >= JOB_MAX_ATTEMPTS:
+                JOBS.inc(name, "failed")
+                print(f"Error in background job {name} (giving up after {attempt} attempts): {str(error)}")
+                if job_id is not None:
+                    await asyncio.to_thread(self._fail_durable, job_id, error, final=True)
+            else:
+                JOBS.inc(name, "retry")
+                if job_id is not None:
+                    await asyncio.to_thread(self._fail_durable, job_id, error, final=False, attempt=attempt)
+                else:
+                    self._loop.call_later(retry_delay(attempt), self._put, (name, payload, attempt + 1, None))
+
+    def _finish_durable(self, job_id):
+        try:
+            jobs_collection().delete_one({"_id": job_id})
+        except Exception as e:
+            print(f"Error completing background job {job_id}: {str(e)}")
+
+    def _fail_durable(self, job_id, error, final, attempt=None):
+        now = datetime.now(timezone.utc)
+        update = {"lastError": str(error)}
+        if final:
+            update.update(state="failed", expireAt=now + timedelta(seconds=FAILED_JOB_TTL_SECONDS))
+        else:
+            update.update(state="queued", runAt=now + timedelta(seconds=retry_delay(attempt)))
+        try:
+            jobs_collection().update_one({"_id": job_id}, {"$set": update, "$unset": {"lockedUntil": ""}})
+        except Exception as e:
+            print(f"Error rescheduling background job {job_id}: {str(e)}")
+
+    def _claim_durable(self):
+        now = datetime.now(timezone.utc)
+        return jobs_collection().find_one_and_update(
+            {
+                "name": {"$in": list(_handlers)},
+                "$or": [
+                    {"state": "queued", "runAt": {"$lte": now}},
+                    # Lease expired: the worker running it died
+                    {"state": "running", "lockedUntil": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {"state": "running", "lockedUntil": now + timedelta(seconds=JOB_LEASE_SECONDS)},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("runAt", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _poll_durable(self):
+        next_depth_check = 0.0
+        while True:
+            self._wake.clear()
+            try:
+                # Only claim what the workers can start right away
+                while self._queue.qsize() < self.concurrency:
+                    claimed = await asyncio.to_thread(self._claim_durable)
+                    if claimed is None:
+                        break
+                    self._queue.put_nowait((claimed["name"], claimed["payload"], claimed["attempts"], claimed["_id"]))
+
+                if time.monotonic() >= next_depth_check:
+                    next_depth_check = time.monotonic() + DEPTH_CHECK_SECONDS
+                    depth = await asyncio.to_thread(jobs_collection().count_documents, {"state": "queued"})
+                    JOB_QUEUE_DEPTH.set(depth, "durable")
+            except Exception as e:
+                print(f"Error polling durable jobs: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), DURABLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+job_runner = JobRunner()
+
+def enqueue(name, payload, durable=False):
+    """Schedule a background job (see JobRunner.enqueue)"""
+    job_runner.enqueue(name, payload, durable)
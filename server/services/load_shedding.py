@@ -0,0 +1,89 @@
+import os
+import threading
+from anyio import to_thread
+from dotenv import load_dotenv
+from pymongo import monitoring
+from services.metrics import MONGO_POOL_WAITERS
+
+load_dotenv()
+
+# LOAD_SHEDDING=0 never sheds
+LOAD_SHEDDING = os.getenv("LOAD_SHEDDING", "1") == "1"
+
+# Shed when more than this many calls are queued for the blocking-call thread
+# pool (sync routes, run_in_threadpool, to_thread.run_sync)
+SHED_THREAD_QUEUE = int(os.getenv("SHED_THREAD_QUEUE", "20"))
+
+# Shed when more than this many operations are waiting for a Mongo connection
+# (pymongo's default maxPoolSize is 100)
+SHED_MONGO_WAITERS = int(os.getenv("SHED_MONGO_WAITERS", "50"))
+
+# Retry-After sent with a shed request
+SHED_RETRY_AFTER_SECONDS = int(os.getenv("SHED_RETRY_AFTER_SECONDS", "2"))
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """
+    pymongo pool monitor counting operations waiting to check out a connection
+
+    A check-out that starts waits until it either gets a connection or fails
+    (e.g. waitQueueTimeoutMS), so the difference is the wait queue length,
+    summed over every server's pool.
+    """
+
+    def __init__(self):
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def _add(self, amount):
+        with self._lock:
+            self.waiting += amount
+            MONGO_POOL_WAITERS.set(self.waiting)
+
+    def connection_check_out_started(self, event):
+        self._add(1)
+
+    def connection_checked_out(self, event):
+        self._add(-1)
+
+    def connection_check_out_failed(self, event):
+        self._add(-1)
+
+    def connection_checked_in(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+mongo_pool_listener = MongoPoolListener()
+
+def overload_reason():
+    """
+    Name of the saturated resource, or None
+
+    Must be called from the event loop (the thread pool's limiter belongs to it).
+    """
+    if not LOAD_SHEDDING:
+        return None
+    if to_thread.current_default_thread_limiter().statistics().tasks_waiting > SHED_THREAD_QUEUE:
+        return "thread_pool"
+    if mongo_pool_listener.waiting > SHED_MONGO_WAITERS:
+        return "mongo_pool"
+    return None
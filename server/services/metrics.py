@@ -0,0 +1,213 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pymongo import monitoring
+from services.tracing import start_span, span_scope, SPAN_KIND_CLIENT
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for "Mongo commands issued by one request"
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+# Buckets in bytes for stored document and section sizes (Mongo's limit is 16MB)
+SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(8))
+
+class RequestStats:
+    """Per-request counters filled in by the Mongo and external-call hooks"""
+    __slots__ = ("mongo_commands", "mongo_seconds", "external_calls", "external_seconds")
+
+    def __init__(self):
+        self.mongo_commands = 0
+        self.mongo_seconds = 0.0
+        self.external_calls = 0
+        self.external_seconds = 0.0
+
+# Stats of the request being handled in the current context (None outside requests)
+current_request_stats = ContextVar("current_request_stats", default=None)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = list(self.values.items())
+        for label_values, value in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+class Gauge(Counter):
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value, *label_values):
+        with self.lock:
+            self.values[label_values] = value
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.values.get(label_values)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, plus +Inf, then sum
+                series = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        label_names = self.labels + ("le",)
+        # Copied under the lock, so each series' buckets, sum and count agree
+        with self.lock:
+            values = [(label_values, list(series)) for label_values, series in self.values.items()]
+        for label_values, series in sorted(values):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(label_names, label_values + (bound,))} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",)
+)
+REQUEST_MONGO_COMMANDS = Histogram(
+    "http_request_mongo_commands", "Mongo commands issued per HTTP request", ("route",), COUNT_BUCKETS
+)
+MONGO_COMMANDS = Counter(
+    "mongo_commands_total", "Mongo commands by name and outcome", ("command", "outcome")
+)
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "Mongo command latency", ("command",)
+)
+EXTERNAL_LATENCY = Histogram(
+    "external_call_duration_seconds", "Latency of Firebase SDK and REST calls", ("service", "operation", "outcome")
+)
+RESPONSE_BYTES = Counter(
+    "http_response_body_bytes_total", "Response body bytes before and after compression", ("encoding", "stage")
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "background_job_queue_depth", "Background jobs waiting to run", ("queue",)
+)
+JOBS = Counter(
+    "background_jobs_total", "Background job attempts by job and outcome", ("job", "outcome")
+)
+JOB_LATENCY = Histogram(
+    "background_job_duration_seconds", "Background job run time", ("job",)
+)
+RESPONSE_CACHE = Counter(
+    "response_cache_requests_total", "Cached response lookups by cache and outcome", ("cache", "outcome")
+)
+
+RATE_LIMITED = Counter(
+    "http_requests_rate_limited_total", "Requests refused with 429 by rate limit", ("limit",)
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total", "Requests refused with 503 by saturated resource", ("resource",)
+)
+MONGO_POOL_WAITERS = Gauge(
+    "mongo_pool_wait_queue", "Operations waiting for a Mongo connection"
+)
+
+SECTION_BYTES = Histogram(
+    "profile_section_bytes", "Stored size of saved profile sections by storage", ("section", "storage"), SIZE_BUCKETS
+)
+
+REGISTRY = [
+    REQUEST_LATENCY, REQUESTS_IN_FLIGHT, REQUEST_MONGO_COMMANDS,
+    MONGO_COMMANDS, MONGO_LATENCY, EXTERNAL_LATENCY,
+    RESPONSE_BYTES, RESPONSE_CACHE, JOB_QUEUE_DEPTH, JOBS, JOB_LATENCY, SECTION_BYTES,
+    RATE_LIMITED, REQUESTS_SHED, MONGO_POOL_WAITERS
+]
+
+def render_metrics():
+    """Render every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+class MongoCommandListener(monitoring.CommandListener):
+    """pymongo command monitor feeding the Mongo metrics and per-request stats"""
+
+    def _record(self, event, outcome):
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMANDS.inc(event.command_name, outcome)
+        MONGO_LATENCY.observe(seconds, event.command_name)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.mongo_commands += 1
+            stats.mongo_seconds += seconds
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, "success")
+
+    def failed(self, event):
+        self._record(event, "failure")
+
+@contextmanager
+def track_external(service, operation):
+    """
+    Time an outbound call (Firebase SDK or REST) and trace it as a client span
+
+    Usage:
+        with track_external("firebase", "verify_id_token"):
+            decoded_token = auth.verify_id_token(token)
+    """
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        with span_scope(start_span(f"{service}.{operation}", SPAN_KIND_CLIENT, {"peer.service": service})):
+            yield
+    except Exception:
+        outcome = "failure"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        EXTERNAL_LATENCY.observe(seconds, service, operation, outcome)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.external_calls += 1
+            stats.external_seconds += seconds
@@ -0,0 +1,85 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+# Extra wait for a worker to report its own timeout before it is killed
+KILL_GRACE_SECONDS = 5
+
+class WorkerTimeout(Exception):
+    """A task outlived its timeout and its worker was killed"""
+
+class WorkerCrashed(Exception):
+    """The worker process running a task died"""
+
+class ProcessPool:
+    """
+    Lazily started process pool for CPU-bound work, replaced when a worker hangs
+
+    Tasks are expected to enforce their own timeout (utils.deadline); a task
+    still running KILL_GRACE_SECONDS later is stuck where signals cannot reach,
+    so the whole pool is killed and a new one is started for the next task.
+    """
+
+    def __init__(self, workers):
+        self.workers = max(workers, 1)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs Mongo and job threads is not safe
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def recycle(self, executor):
+        """Replace a pool whose worker hung or died"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # ProcessPoolExecutor cannot kill a busy worker (before Python 3.14),
+        # so its processes are terminated directly
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, function, *args, timeout):
+        """
+        Run function(*args) on a worker and wait for it (blocking)
+
+        A pool broken by another task's timeout gets one retry on a fresh pool.
+
+        Raises:
+            WorkerTimeout, WorkerCrashed
+        """
+        for attempt in (1, 2):
+            executor = self.executor()
+            try:
+                # submit raises too when another task broke the pool and it was not recycled yet
+                future = executor.submit(function, *args)
+                return future.result(timeout + KILL_GRACE_SECONDS)
+            except FutureTimeout:
+                self.recycle(executor)
+                raise WorkerTimeout()
+            except BrokenProcessPool:
+                self.recycle(executor)
+                if attempt == 2:
+                    raise WorkerCrashed()
+
+    async def run_async(self, function, *args, timeout):
+        """run() for the event loop: waits without holding a thread"""
+        for attempt in (1, 2):
+            executor = self.executor()
+            try:
+                future = executor.submit(function, *args)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout + KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                self.recycle(executor)
+                raise WorkerTimeout()
+            except BrokenProcessPool:
+                self.recycle(executor)
+                if attempt == 2:
+                    raise WorkerCrashed()
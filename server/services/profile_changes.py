@@ -0,0 +1,331 @@
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo.errors import OperationFailure, PyMongoError
+from models.profile_schema import Profile
+from services.metrics import JOB_QUEUE_DEPTH, JOBS, JOB_LATENCY
+from services.profile_storage import merge_spilled
+from utils.profile_utils import mongo_to_dict
+
+load_dotenv()
+
+# With PROFILE_CHANGE_STREAM=1 every write to `profiles` is read back from a
+# MongoDB change stream (which needs a replica set), so consumers also see
+# writes made by other workers, scripts and services writing the collection
+PROFILE_CHANGE_STREAM = os.getenv("PROFILE_CHANGE_STREAM", "0") == "1"
+
+# Key of the stored resume token; processes sharing a name resume from the same point
+PROFILE_CHANGE_STREAM_NAME = os.getenv("PROFILE_CHANGE_STREAM_NAME", "profiles")
+
+# Changes handed to consumers at once, and the longest a change waits for its batch to fill
+CHANGE_BATCH_SIZE = int(os.getenv("CHANGE_BATCH_SIZE", "100"))
+CHANGE_BATCH_SECONDS = float(os.getenv("CHANGE_BATCH_SECONDS", "0.2"))
+
+# Batches waiting per consumer; while one consumer's queue is full the stream
+# is not read (the oplog holds the backlog), so a slow consumer delays the others
+CHANGE_QUEUE_BATCHES = int(os.getenv("CHANGE_QUEUE_BATCHES", "16"))
+
+# Set when `profiles` has changeStreamPreAndPostImages enabled (MongoDB 6.0+):
+# changes then carry the section's previous value in `old`
+CHANGE_PRE_IMAGES = os.getenv("CHANGE_PRE_IMAGES", "0") == "1"
+
+CHANGE_TOKENS_COLLECTION = "change_stream_tokens"
+
+# The resume token is stored at most this often
+CHECKPOINT_SECONDS = 1.0
+
+# Wait before reopening a stream after a connection error
+RETRY_SECONDS = 5.0
+
+# ChangeStreamHistoryLost, ChangeStreamFatalError, InvalidResumeToken: the
+# stored position is unusable and the stream restarts from now
+RESUME_FAILURES = (286, 280, 260)
+
+# One profile section written. operation is insert, update, replace or delete
+# (section is None for delete); new is the section after the write, old is
+# only filled when CHANGE_PRE_IMAGES is on
+ProfileChange = namedtuple("ProfileChange", ["user_id", "section", "operation", "old", "new"])
+
+def section_changes(change):
+    """Split a change stream event on `profiles` into one ProfileChange per top-level field"""
+    operation = change.get("operationType")
+    key = (change.get("documentKey") or {}).get("_id")
+    if key is None:
+        return []
+    user_id = str(key)
+    if operation == "delete":
+        return [ProfileChange(user_id, None, operation, None, None)]
+
+    after = change.get("fullDocument") or {}
+    before = change.get("fullDocumentBeforeChange")
+    if operation == "update":
+        description = change.get("updateDescription") or {}
+        # "workEx.2.company" is a write to workEx
+        fields = list(description.get("updatedFields") or {}) + list(description.get("removedFields") or [])
+        fields += [truncated["field"] for truncated in description.get("truncatedArrays") or []]
+    elif operation in ("insert", "replace"):
+        fields = list(after) + list(before or {})
+    else:
+        return []
+
+    sections = {field.split(".")[0] for field in fields} - {"_id"}
+    if "spilled" in sections:
+        # Writes to spilled sections only show as a new marker on the profile
+        sections.discard("spilled")
+        sections.update(after.get("spilled") or {}, (before or {}).get("spilled") or {})
+        after = merge_spilled(dict(after))
+        if before is not None:
+            before = merge_spilled(dict(before))
+    sections = sorted(sections)
+    return [
+        ProfileChange(
+            user_id, section, operation,
+            mongo_to_dict(before.get(section)) if before is not None else None,
+            mongo_to_dict(after.get(section))
+        )
+        for section in sections
+    ]
+
+def tokens_collection():
+    """Resume tokens of the change streams, keyed by stream name"""
+    return get_db()[CHANGE_TOKENS_COLLECTION]
+
+class ChangeConsumer:
+    """
+    A registered handler with its own bounded queue and thread
+
+    Each batch is acknowledged once handled (or failed: a failing handler is
+    logged and skipped, never retried), which is what lets the tailer move
+    the stored resume token forward.
+    """
+
+    def __init__(self, name, handler, sections=None, on_resync=None, queue_batches=CHANGE_QUEUE_BATCHES):
+        self.name = name
+        self.handler = handler
+        self.sections = frozenset(sections) if sections else None
+        self.on_resync = on_resync
+        self.acked = 0
+        self._queue = queue.Queue(maxsize=queue_batches)
+        self._thread = None
+
+    @property
+    def job_name(self):
+        return f"changes:{self.name}"
+
+    def offer(self, sequence, changes, stop):
+        """Queue a batch (None asks for a resync); blocks while the queue is full"""
+        if changes is not None and self.sections is not None:
+            changes = [change for change in changes if change.section is None or change.section in self.sections]
+        self._ensure_started()
+        while not stop.is_set():
+            try:
+                self._queue.put((sequence, changes), timeout=1.0)
+                break
+            except queue.Full:
+                continue
+        JOB_QUEUE_DEPTH.set(self._queue.qsize(), self.job_name)
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"changes-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            sequence, changes = self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize(), self.job_name)
+            if changes is None:
+                self._call(self.on_resync)
+            elif changes:
+                self._call(self.handler, changes)
+            self.acked = max(self.acked, sequence)
+
+    def _call(self, handler, *args):
+        if handler is None:
+            return
+        start = time.perf_counter()
+        try:
+            handler(*args)
+            outcome = "success"
+        except Exception as e:
+            outcome = "failed"
+            print(f"Error in profile change consumer {self.name}: {str(e)}")
+        JOB_LATENCY.observe(time.perf_counter() - start, self.job_name)
+        JOBS.inc(self.job_name, outcome)
+
+class ChangeStreamTailer:
+    """
+    Tails the change stream of `profiles` and fans section changes out to consumers
+
+    Changes are grouped into batches of up to CHANGE_BATCH_SIZE (or whatever
+    arrived within CHANGE_BATCH_SECONDS) and queued to every consumer. The
+    resume token is stored in change_stream_tokens once all consumers have
+    handled the batch it ends, so after a restart delivery resumes where it
+    stopped: changes may be delivered twice, never skipped. When the stored
+    position is no longer in the oplog, the stream restarts from now and
+    consumers get on_resync to rebuild their state.
+
+    `watch` opens the stream (Collection.watch's arguments); tests pass the
+    stand-in from benchmarks.change_stream_stub.
+    """
+
+    def __init__(self, name=PROFILE_CHANGE_STREAM_NAME, watch=None):
+        self.name = name
+        self.watch = watch
+        self._consumers = {}
+        self._sequence = 0
+        self._tokens = deque()
+        self._last_token = None
+        self._checkpoint_at = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def register(self, consumer):
+        with self._lock:
+            self._consumers[consumer.name] = consumer
+            # A consumer joining late starts at the current position
+            consumer.acked = self._sequence
+
+    def consumers(self):
+        with self._lock:
+            return list(self._consumers.values())
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._tail, name=f"change-stream-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._checkpoint(force=True)
+
+    def _open(self, token):
+        watch = self.watch or Profile._get_collection().watch
+        options = {
+            "full_document": "updateLookup",
+            "max_await_time_ms": max(int(CHANGE_BATCH_SECONDS * 1000), 1),
+            "resume_after": token,
+        }
+        if CHANGE_PRE_IMAGES:
+            options["full_document_before_change"] = "whenAvailable"
+        return watch(**options)
+
+    def _load_token(self):
+        record = tokens_collection().find_one({"_id": self.name})
+        return record["token"] if record else None
+
+    def _tail(self):
+        token = self._load_token()
+        while not self._stop.is_set():
+            try:
+                with self._open(token) as stream:
+                    invalidated = self._read(stream)
+                if invalidated:
+                    # The collection was dropped or renamed
+                    token = None
+                    self._resync()
+                else:
+                    token = self._last_token or token
+            except OperationFailure as e:
+                if token is not None and e.code in RESUME_FAILURES:
+                    print(f"⚠️ Change stream {self.name} cannot resume ({str(e)}), restarting from now")
+                    token = self._last_token = None
+                    self._resync()
+                    continue
+                print(f"Error tailing change stream {self.name}: {str(e)}")
+                token = self._last_token or token
+                self._stop.wait(RETRY_SECONDS)
+            except PyMongoError as e:
+                print(f"Error tailing change stream {self.name}: {str(e)}")
+                token = self._last_token or token
+                self._stop.wait(RETRY_SECONDS)
+
+    def _read(self, stream):
+        """Read until stopped; returns True when the stream was invalidated"""
+        pending, count, last_token, deadline = [], 0, None, None
+        while stream.alive and not self._stop.is_set():
+            change = stream.try_next()
+            if change is not None:
+                if change.get("operationType") == "invalidate":
+                    if count:
+                        self._dispatch(pending, last_token)
+                    return True
+                pending.extend(section_changes(change))
+                count += 1
+                last_token = change["_id"]
+                if deadline is None:
+                    deadline = time.monotonic() + CHANGE_BATCH_SECONDS
+
+            if count and (change is None or len(pending) >= CHANGE_BATCH_SIZE or time.monotonic() >= deadline):
+                self._dispatch(pending, last_token)
+                pending, count, deadline = [], 0, None
+            self._checkpoint()
+
+        if count:
+            self._dispatch(pending, last_token)
+        return False
+
+    def _dispatch(self, changes, token):
+        self._sequence += 1
+        self._tokens.append((self._sequence, token))
+        self._last_token = token
+        for consumer in self.consumers():
+            consumer.offer(self._sequence, changes, self._stop)
+
+    def _resync(self):
+        self._sequence += 1
+        # Positions before the restart can no longer be resumed
+        self._tokens.clear()
+        tokens_collection().delete_one({"_id": self.name})
+        for consumer in self.consumers():
+            consumer.offer(self._sequence, None, self._stop)
+
+    def _checkpoint(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checkpoint_at < CHECKPOINT_SECONDS:
+            return
+        self._checkpoint_at = now
+        acked = min((consumer.acked for consumer in self.consumers()), default=self._sequence)
+        token = None
+        while self._tokens and self._tokens[0][0] <= acked:
+            _, token = self._tokens.popleft()
+        if token is None:
+            return
+        try:
+            tokens_collection().update_one(
+                {"_id": self.name},
+                {"$set": {"token": token, "updatedAt": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except PyMongoError as e:
+            print(f"Error storing change stream position {self.name}: {str(e)}")
+
+profile_change_tailer = ChangeStreamTailer()
+
+def change_consumer(name, sections=None, on_resync=None):
+    """
+    Register a handler for batches of profile changes from the change stream
+
+        @change_consumer("search_index", sections={"skills"})
+        def reindex(changes): ...
+
+    Args:
+        name: Consumer name (queue and metrics label)
+        sections: Only deliver changes to these sections (deletes always)
+        on_resync: Called without arguments when changes may have been missed
+    """
+    def register(handler):
+        profile_change_tailer.register(ChangeConsumer(name, handler, sections, on_resync))
+        return handler
+    return register
@@ -0,0 +1,38 @@
+from utils.profile_utils import mongo_to_dict
+
+# Handlers called as handler(user_id, section, old, new) after a section is saved
+_subscribers = []
+
+def subscribe(handler):
+    """Register a handler for profile section changes"""
+    if handler not in _subscribers:
+        _subscribers.append(handler)
+    return handler
+
+def unsubscribe(handler):
+    """Remove a previously registered handler"""
+    if handler in _subscribers:
+        _subscribers.remove(handler)
+
+def section_snapshot(value):
+    """Convert a profile section (embedded documents, lists, strings) into plain data"""
+    if value is None:
+        return None
+    return mongo_to_dict(value)
+
+def publish_section_change(user_id, section, old, new):
+    """
+    Notify subscribers that a profile section was saved
+
+    Args:
+        user_id: Profile ID as a string
+        section: Name of the Profile field that changed (e.g. "academic")
+        old: Plain-data snapshot of the section before the write
+        new: Plain-data snapshot of the section after the write
+    """
+    for handler in list(_subscribers):
+        try:
+            handler(str(user_id), section, old, new)
+        except Exception as e:
+            # A failing consumer must never fail the write that triggered it
+            print(f"Error in profile event handler {getattr(handler, '__name__', handler)}: {str(e)}")
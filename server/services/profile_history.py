@@ -0,0 +1,214 @@
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from services.metrics import JOB_QUEUE_DEPTH, JOBS, JOB_LATENCY
+from services.profile_events import subscribe
+from utils.json_diff import diff, patch
+
+load_dotenv()
+
+# Record a revision for every saved section (REVISION_HISTORY=0 turns it off)
+REVISION_HISTORY = os.getenv("REVISION_HISTORY", "1") == "1"
+
+# Every Nth revision of a section stores the whole section instead of a diff,
+# so rebuilding an old version replays at most N-1 diffs
+REVISION_SNAPSHOT_INTERVAL = int(os.getenv("REVISION_SNAPSHOT_INTERVAL", "20"))
+
+REVISIONS_COLLECTION = "profile_revisions"
+REVISION_HEADS_COLLECTION = "profile_revision_heads"
+
+# Revisions waiting to be written; saves beyond this are not recorded
+REVISION_QUEUE_SIZE = 10000
+
+# Maximum number of queued revisions written with one insert_many
+BATCH_SIZE = 500
+
+JOB_NAME = "profile_revisions"
+
+_queue = queue.Queue(maxsize=REVISION_QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+_indexes_ready = False
+
+def revisions_collection():
+    """
+    One document per saved section: {profileId, version, section, at,
+    changes (number of diff operations)} plus either ops (a utils.json_diff diff from the previous value) or snapshot
+    (the whole section). The first revision of each section also keeps the
+    value it replaced in base.
+    """
+    global _indexes_ready
+    db = get_db()
+    collection = db[REVISIONS_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index([("profileId", ASCENDING), ("version", DESCENDING)], unique=True)
+        collection.create_index([("profileId", ASCENDING), ("section", ASCENDING), ("version", DESCENDING)])
+        _indexes_ready = True
+    return collection
+
+def heads_collection():
+    """Per profile: the latest version and how many revisions each section has"""
+    return get_db()[REVISION_HEADS_COLLECTION]
+
+def build_revisions(user_id, changes, head):
+    """
+    Number a profile's queued changes after the head returned by the version bump
+
+    Args:
+        changes: [(section, old, new, ops, at)] in save order
+        head: Head document after adding len(changes) to version and each
+            section's count to sections.<name>
+    """
+    version = head["version"] - len(changes)
+    counts = dict(head.get("sections") or {})
+    for section, *_ in changes:
+        counts[section] -= 1
+
+    revisions = []
+    for section, old, new, ops, at in changes:
+        version += 1
+        counts[section] += 1
+        revision = {"profileId": user_id, "version": version, "section": section, "at": at, "changes": len(ops)}
+        if counts[section] == 1:
+            revision.update(snapshot=new, base=old)
+        elif counts[section] % REVISION_SNAPSHOT_INTERVAL == 0:
+            revision["snapshot"] = new
+        else:
+            revision["ops"] = ops
+        revisions.append(revision)
+    return revisions
+
+def record_revisions(entries):
+    """
+    Write a batch of queued changes: one version bump per profile, one insert for all
+
+    Args:
+        entries: [(user_id, section, old, new, at)]
+
+    Returns:
+        Number of revisions written
+    """
+    by_user = OrderedDict()
+    for user_id, section, old, new, at in entries:
+        ops = diff(old, new)
+        if ops:
+            by_user.setdefault(user_id, []).append((section, old, new, ops, at))
+
+    heads = heads_collection()
+    revisions = []
+    for user_id, changes in by_user.items():
+        increments = {"version": len(changes)}
+        for section, *_ in changes:
+            increments[f"sections.{section}"] = increments.get(f"sections.{section}", 0) + 1
+        head = heads.find_one_and_update(
+            {"_id": user_id}, {"$inc": increments},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        revisions.extend(build_revisions(user_id, changes, head))
+
+    if revisions:
+        revisions_collection().insert_many(revisions, ordered=False)
+    return len(revisions)
+
+def _drain():
+    """Worker loop: write queued changes in batches"""
+    while True:
+        batch = [_queue.get()]
+        try:
+            while len(batch) < BATCH_SIZE:
+                batch.append(_queue.get_nowait())
+        except queue.Empty:
+            pass
+        JOB_QUEUE_DEPTH.set(_queue.qsize(), JOB_NAME)
+
+        start = time.perf_counter()
+        try:
+            record_revisions(batch)
+            JOBS.inc(JOB_NAME, "success", amount=len(batch))
+        except Exception as e:
+            JOBS.inc(JOB_NAME, "failed", amount=len(batch))
+            print(f"Error recording profile revisions: {str(e)}")
+        JOB_LATENCY.observe(time.perf_counter() - start, JOB_NAME)
+        for _ in batch:
+            _queue.task_done()
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_drain, name="profile-revisions", daemon=True)
+            _worker.start()
+
+@subscribe
+def on_section_change(user_id, section, old, new):
+    """Profile event handler: queue the change; diffing and writing happen on the worker"""
+    if not REVISION_HISTORY:
+        return
+    _ensure_worker()
+    try:
+        _queue.put_nowait((str(user_id), section, old, new, datetime.now(timezone.utc)))
+    except queue.Full:
+        JOBS.inc(JOB_NAME, "dropped")
+
+def flush(timeout=10.0):
+    """Wait for queued revisions to be written (scripts and benchmarks)"""
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def list_revisions(user_id, before=None, limit=50):
+    """Newest revisions first, without their contents"""
+    query = {"profileId": user_id}
+    if before is not None:
+        query["version"] = {"$lt": before}
+    cursor = revisions_collection().find(
+        query, {"_id": 0, "version": 1, "section": 1, "at": 1, "changes": 1}
+    ).sort("version", DESCENDING).limit(limit)
+    return list(cursor)
+
+def current_version(user_id):
+    head = heads_collection().find_one({"_id": user_id}, {"version": 1})
+    return head["version"] if head else 0
+
+def section_at(user_id, section, version):
+    """
+    A section's value as of a profile version
+
+    Returns:
+        (True, value), or (False, None) when the section has no revisions
+        (its current value is the value it had at every version)
+    """
+    collection = revisions_collection()
+    snapshot = collection.find_one(
+        {"profileId": user_id, "section": section, "version": {"$lte": version}, "snapshot": {"$exists": True}},
+        sort=[("version", DESCENDING)]
+    )
+    if snapshot is None:
+        first = collection.find_one({"profileId": user_id, "section": section}, sort=[("version", ASCENDING)])
+        if first is None or first["version"] <= version:
+            return False, None
+        # Before the section's first revision: the value it replaced
+        return True, first.get("base")
+
+    value = snapshot["snapshot"]
+    for revision in collection.find(
+        {"profileId": user_id, "section": section, "version": {"$gt": snapshot["version"], "$lte": version}},
+        {"ops": 1, "snapshot": 1}
+    ).sort("version", ASCENDING):
+        value = revision["snapshot"] if "snapshot" in revision else patch(value, revision["ops"])
+    return True, value
+
+def sections_at(user_id, version):
+    """Every section with revisions, as of version; sections missing were unchanged since"""
+    sections = {}
+    for section in revisions_collection().distinct("section", {"profileId": user_id}):
+        found, value = section_at(user_id, section, version)
+        if found:
+            sections[section] = value
+    return sections
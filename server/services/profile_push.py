@@ -0,0 +1,174 @@
+import asyncio
+import itertools
+import os
+import secrets
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from services.profile_changes import PROFILE_CHANGE_STREAM, change_consumer
+from services.profile_events import subscribe
+from utils.json_response import dumps
+
+load_dotenv()
+
+# Events waiting to be sent on one stream; a client falling further behind
+# is told to resync (re-fetch the profile) instead of buffering without bound
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "100"))
+
+# Open event streams per user (browser tabs)
+PUSH_MAX_STREAMS_PER_USER = int(os.getenv("PUSH_MAX_STREAMS_PER_USER", "10"))
+
+# Recent events kept per user, replayed to clients reconnecting with Last-Event-ID
+PUSH_REPLAY_SIZE = 50
+
+# Users whose recent events are kept
+PUSH_REPLAY_USERS = 10000
+
+# Sections sent to clients; credentials and identity fields never are
+PUSHED_SECTIONS = (
+    "personalInfo", "academic", "projects", "skills", "workEx", "certifications",
+    "achievements", "publications", "socials", "resumeFile",
+)
+
+# Sent to a stream that missed events; the client re-fetches the whole profile
+RESYNC = {"event": "resync"}
+
+class TooManyStreams(Exception):
+    """The user already has PUSH_MAX_STREAMS_PER_USER streams open"""
+
+class EventStream:
+    """One client's queue of pending events, owned by the event loop serving it"""
+
+    def __init__(self, user_id, loop, size):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+
+    def offer(self, event):
+        """Queue an event (on the stream's loop); overflow is replaced by a single resync"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+class ProfileChangeHub:
+    """
+    Fans profile section changes out to the open event streams of their user
+
+    Event ids are "<process>-<sequence>", so a client reconnecting to the same
+    process gets the events it missed replayed, and one reconnecting elsewhere
+    (or after too long) is told to resync.
+    """
+
+    def __init__(self, queue_size=PUSH_QUEUE_SIZE, max_streams=PUSH_MAX_STREAMS_PER_USER):
+        self.queue_size = queue_size
+        self.max_streams = max_streams
+        self._process = secrets.token_hex(4)
+        self._sequence = itertools.count(1)
+        self._streams = {}
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, user_id, last_event_id=None):
+        """
+        Register a stream for the calling event loop
+
+        Raises:
+            TooManyStreams
+        """
+        stream = EventStream(user_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            streams = self._streams.setdefault(user_id, set())
+            if len(streams) >= self.max_streams:
+                raise TooManyStreams("Too many open event streams.")
+            streams.add(stream)
+            if last_event_id:
+                for event in self._missed(user_id, last_event_id):
+                    stream.offer(event)
+        return stream
+
+    def close(self, stream):
+        with self._lock:
+            streams = self._streams.get(stream.user_id)
+            if streams is not None:
+                streams.discard(stream)
+                if not streams:
+                    del self._streams[stream.user_id]
+
+    def _missed(self, user_id, last_event_id):
+        process, _, sequence = last_event_id.rpartition("-")
+        recent = self._recent.get(user_id, ())
+        if process != self._process or not sequence.isdigit():
+            return [RESYNC]
+        sequence = int(sequence)
+        # Events between last_event_id and the oldest one kept are lost
+        if recent and recent[0]["sequence"] > sequence + 1:
+            return [RESYNC]
+        return [event for event in recent if event["sequence"] > sequence]
+
+    def publish(self, user_id, section, data):
+        """Send a section's new value to the user's streams; callable from any thread"""
+        sequence = next(self._sequence)
+        event = {
+            "event": "section",
+            "sequence": sequence,
+            "id": f"{self._process}-{sequence}",
+            "data": {"section": section, "data": data, "at": datetime.now(timezone.utc)},
+        }
+        with self._lock:
+            recent = self._recent.get(user_id)
+            if recent is None:
+                recent = self._recent[user_id] = deque(maxlen=PUSH_REPLAY_SIZE)
+            self._recent.move_to_end(user_id)
+            recent.append(event)
+            while len(self._recent) > PUSH_REPLAY_USERS:
+                self._recent.popitem(last=False)
+            streams = list(self._streams.get(user_id, ()))
+        for stream in streams:
+            try:
+                stream.loop.call_soon_threadsafe(stream.offer, event)
+            except RuntimeError:
+                # The stream's loop closed while it was being disconnected
+                pass
+
+    def resync_all(self):
+        """Tell every open stream to re-fetch the profile"""
+        with self._lock:
+            self._recent.clear()
+            streams = [stream for streams in self._streams.values() for stream in streams]
+        for stream in streams:
+            try:
+                stream.loop.call_soon_threadsafe(stream.offer, RESYNC)
+            except RuntimeError:
+                pass
+
+    def stream_count(self):
+        with self._lock:
+            return sum(len(streams) for streams in self._streams.values())
+
+profile_change_hub = ProfileChangeHub()
+
+@subscribe
+def push_section_change(user_id, section, old, new):
+    """Forward every saved section to the user's open event streams"""
+    # With the change stream on, writes arrive through push_profile_changes
+    # instead, including those handled by other workers
+    if not PROFILE_CHANGE_STREAM:
+        profile_change_hub.publish(user_id.lower(), section, new)
+
+@change_consumer("profile_push", sections=PUSHED_SECTIONS, on_resync=profile_change_hub.resync_all)
+def push_profile_changes(changes):
+    for change in changes:
+        if change.section is not None:
+            profile_change_hub.publish(change.user_id.lower(), change.section, change.new)
+
+def format_sse(event):
+    """Encode an event in the text/event-stream format"""
+    lines = [f"event: {event['event']}"]
+    if "id" in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"data: {dumps(event.get('data', {})).decode()}")
+    return ("\n".join(lines) + "\n\n").encode()
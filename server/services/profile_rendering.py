@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+import orjson
+from models.profile_schema import Profile
+from services.metrics import JOBS, JOB_LATENCY, RESPONSE_CACHE
+from services.process_pool import ProcessPool, WorkerCrashed, WorkerTimeout
+from services.profile_changes import change_consumer
+from services.profile_events import subscribe
+from services.response_cache import PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_SECONDS
+from utils.profile_render import SECTION_TITLES, render_document, template_hash
+from utils.profile_utils import mongo_to_dict
+
+load_dotenv()
+
+# Renderer processes (rendering is CPU bound)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+
+# Distinct documents rendering or waiting for a worker; more are turned away
+RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", "16"))
+
+RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "30"))
+
+# Memory for rendered documents, least recently used dropped first
+RENDER_CACHE_BYTES = int(os.getenv("RENDER_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+JOB_NAME = "profile_render"
+
+# Profile fields every document shows, whatever sections are chosen
+HEADER_FIELDS = ("username", "personalInfo", "socials")
+
+class RenderBusy(Exception):
+    """Too many renders in flight"""
+
+class RenderFailed(Exception):
+    """The document could not be rendered"""
+
+class RenderCache:
+    """
+    Rendered documents by content key, plus each user's latest key per variant
+
+    The content key hashes the profile data with the template and options, so
+    a document is only ever served for the exact data it was rendered from.
+    The per-user pointers let repeat downloads skip reading the profile; they
+    are dropped on section writes in this process and expire after the
+    profile cache TTL for writes handled elsewhere.
+    """
+
+    def __init__(self, max_bytes, max_users, ttl_seconds):
+        self.max_bytes = max_bytes
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._documents = OrderedDict()
+        self._bytes = 0
+        # user_id -> {variant: (key, expires_at)}
+        self._latest = OrderedDict()
+        self._epoch = 0
+        # user_id -> epoch of its last invalidation, bounded; _floor covers evicted users
+        self._invalidated = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def epoch(self):
+        return self._epoch
+
+    def latest(self, user_id, variant):
+        """(key, body) last rendered for the user, if still valid"""
+        with self._lock:
+            pointer = self._latest.get(user_id, {}).get(variant)
+            if pointer is None or pointer[1] <= time.monotonic():
+                return None
+            body = self._documents.get(pointer[0])
+            if body is None:
+                return None
+            self._documents.move_to_end(pointer[0])
+            return pointer[0], body
+
+    def get(self, key):
+        with self._lock:
+            body = self._documents.get(key)
+            if body is not None:
+                self._documents.move_to_end(key)
+            return body
+
+    def put(self, user_id, variant, key, body, epoch):
+        """Store a document; the user's pointer is only set if no write happened since epoch"""
+        with self._lock:
+            if key not in self._documents:
+                self._documents[key] = body
+                self._bytes += len(body)
+                while self._bytes > self.max_bytes and len(self._documents) > 1:
+                    _, evicted = self._documents.popitem(last=False)
+                    self._bytes -= len(evicted)
+            if self._invalidated.get(user_id, self._floor) > epoch:
+                return
+            self._latest.setdefault(user_id, {})[variant] = (key, time.monotonic() + self.ttl_seconds)
+            self._latest.move_to_end(user_id)
+            while len(self._latest) > self.max_users:
+                self._latest.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._epoch += 1
+            self._latest.pop(user_id, None)
+            self._invalidated[user_id] = self._epoch
+            self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self.max_users:
+                _, evicted_epoch = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, evicted_epoch)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._floor = self._epoch
+            self._latest.clear()
+            self._invalidated.clear()
+
+render_cache = RenderCache(RENDER_CACHE_BYTES, PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_SECONDS)
+
+@subscribe
+def invalidate_rendered_profile(user_id, section, old, new):
+    """Section writes make the user's rendered documents stale"""
+    render_cache.invalidate(user_id.lower())
+
+@change_consumer("render_cache", sections=HEADER_FIELDS + tuple(SECTION_TITLES), on_resync=render_cache.clear)
+def invalidate_changed_renders(changes):
+    for user_id in {change.user_id.lower() for change in changes}:
+        render_cache.invalidate(user_id)
+
+def render_key(profile, template, format, sections):
+    """Content hash of everything a rendered document depends on"""
+    digest = hashlib.sha256(orjson.dumps(profile, default=str, option=orjson.OPT_SORT_KEYS))
+    digest.update(f"|{template_hash(template)}|{format}|{','.join(sections)}".encode())
+    return digest.hexdigest()
+
+_pool = ProcessPool(RENDER_WORKERS)
+_in_flight = {}
+
+async def _run_render(profile, template, format, sections):
+    start = time.perf_counter()
+    try:
+        outcome = await _pool.run_async(
+            render_document, profile, template, format, sections, RENDER_TIMEOUT_SECONDS,
+            timeout=RENDER_TIMEOUT_SECONDS
+        )
+    except WorkerTimeout:
+        outcome = {"error": "Rendering took too long."}
+    except WorkerCrashed:
+        outcome = {"error": "The renderer crashed on this profile."}
+    JOB_LATENCY.observe(time.perf_counter() - start, JOB_NAME)
+    JOBS.inc(JOB_NAME, "failed" if "error" in outcome else "success")
+    return outcome
+
+async def _render(key, profile, template, format, sections):
+    # Concurrent downloads of the same document share one render
+    task = _in_flight.get(key)
+    if task is None:
+        if len(_in_flight) >= RENDER_QUEUE_SIZE:
+            JOBS.inc(JOB_NAME, "dropped")
+            raise RenderBusy("Rendering is busy, try again shortly.")
+        task = asyncio.ensure_future(_run_render(profile, template, format, sections))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    # Shielded: one client disconnecting does not cancel the others' render
+    outcome = await asyncio.shield(task)
+    if "error" in outcome:
+        raise RenderFailed(outcome["error"])
+    return outcome["body"]
+
+async def render_profile(user_id, template, format, sections):
+    """
+    Rendered profile document, from cache when the profile has not changed
+
+    Args:
+        user_id: Profile ID
+        template: Template name (utils.profile_render.available_templates)
+        format: "html" or "pdf"
+        sections: Sections to include, in document order
+
+    Returns:
+        (content key, body bytes), or None when the profile does not exist
+
+    Raises:
+        RenderBusy, RenderFailed
+    """
+    cache_key = user_id.lower()
+    variant = (template, format, tuple(sections))
+    cached = render_cache.latest(cache_key, variant)
+    if cached is not None:
+        RESPONSE_CACHE.inc("render", "hit")
+        return cached
+    epoch = render_cache.epoch()
+
+    fields = HEADER_FIELDS + tuple(sections)
+    document = Profile.objects(id=user_id).only(*fields).first()
+    if document is None:
+        return None
+    data = mongo_to_dict(document)
+    profile = {field: data.get(field) for field in fields}
+
+    # Unchanged data (or another user's identical request) reuses the document
+    key = render_key(profile, template, format, sections)
+    body = render_cache.get(key)
+    RESPONSE_CACHE.inc("render", "hit" if body is not None else "miss")
+    if body is None:
+        body = await _render(key, profile, template, format, sections)
+
+    render_cache.put(cache_key, variant, key, body, epoch)
+    return key, body
@@ -0,0 +1,183 @@
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import bson
+from bson import ObjectId
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo import ASCENDING
+from services.metrics import SECTION_BYTES
+
+load_dotenv()
+
+# A spillable section larger than this (BSON bytes) is stored in
+# profile_sections instead of the profile document
+SECTION_SPILL_BYTES = int(os.getenv("SECTION_SPILL_BYTES", str(512 * 1024)))
+
+# Sections that grow without bound; everything else always stays inline
+SPILLABLE_SECTIONS = ("projects", "publications", "achievements")
+
+PROFILE_SECTIONS_COLLECTION = "profile_sections"
+
+_indexes_ready = False
+
+def sections_collection():
+    """
+    Spilled sections, one document per profile, section and version:
+    {_id: "<profile id>:<section>:<version>", profileId, section, version, entries, bytes, updatedAt}
+
+    The profile's `spilled` marker names the version readers use; sections
+    spilled before versions were added have neither the suffix nor the field.
+    """
+    global _indexes_ready
+    collection = get_db()[PROFILE_SECTIONS_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index([("profileId", ASCENDING)])
+        _indexes_ready = True
+    return collection
+
+def section_key(profile_id, section, version=None):
+    return f"{profile_id}:{section}:{version}" if version else f"{profile_id}:{section}"
+
+def section_bytes(entries):
+    """BSON size of a section's stored (to_mongo) value"""
+    return len(bson.encode({"v": entries})) if entries else 0
+
+def placement(section, size, spilled):
+    """
+    True when a section of this size belongs in profile_sections
+
+    Spilled sections only move back inline below half the threshold, so a
+    section hovering around it does not move on every save.
+    """
+    if section not in SPILLABLE_SECTIONS:
+        return False
+    if section in spilled:
+        return size >= SECTION_SPILL_BYTES // 2
+    return size > SECTION_SPILL_BYTES
+
+def _write_spilled(profile_id, section, entries, size):
+    """Store a new version of a spilled section; returns its marker entry"""
+    version = str(ObjectId())
+    sections_collection().insert_one({
+        "_id": section_key(profile_id, section, version),
+        "profileId": profile_id, "section": section, "version": version, "entries": entries,
+        "bytes": size, "updatedAt": datetime.now(timezone.utc),
+    })
+    return {"bytes": size, "entries": len(entries), "at": datetime.now(timezone.utc), "version": version}
+
+def _delete_spilled(profile_id, versions):
+    """Delete (section, version) pairs of a profile's spilled sections"""
+    if versions:
+        keys = [section_key(profile_id, section, version) for section, version in versions]
+        sections_collection().delete_many({"_id": {"$in": keys}})
+
+def merge_spilled(son):
+    """
+    Put a raw profile's spilled sections back in place (raw dict, modified)
+
+    Only sections named in the document's `spilled` marker are read, so
+    profiles that never spilled cost nothing, and a projection without the
+    marker (e.g. .only("skills")) skips the lookup.
+    """
+    spilled = son.get("spilled") or {}
+    if not spilled or "_id" not in son:
+        return son
+    profile_id = str(son["_id"])
+    keys = [section_key(profile_id, section, marker.get("version")) for section, marker in spilled.items()]
+    for document in sections_collection().find({"_id": {"$in": keys}}, {"section": 1, "entries": 1}):
+        son[document["section"]] = document["entries"]
+    return son
+
+@contextmanager
+def spill_sections(profile):
+    """
+    Around Profile.save: move changed spillable sections in or out of profile_sections
+
+    Spilled sections are written first, as new versions, and left empty in
+    the profile document; readers follow the `spilled` marker, so they keep
+    the previous version until the save lands and never see a section whose
+    save failed. The in-memory profile keeps every section's value, so
+    callers see no difference. Superseded versions, and sections moving back
+    inline, are deleted after the save; new versions are deleted if it fails.
+    """
+    created = profile.pk is None
+    changed = {field.split(".")[0] for field in profile._get_changed_fields()}
+    previous = dict(profile.spilled or {})
+    spilled = dict(previous)
+    held, written, superseded = {}, [], []
+
+    for section in SPILLABLE_SECTIONS:
+        if not created and section not in changed:
+            continue
+        value = getattr(profile, section)
+        stored = profile._fields[section].to_mongo(value) if value else []
+        size = section_bytes(stored)
+        spill = placement(section, size, spilled)
+        SECTION_BYTES.observe(size, section, "spilled" if spill else "inline")
+        if spill:
+            if profile.pk is None:
+                profile.id = ObjectId()
+            spilled[section] = _write_spilled(str(profile.pk), section, stored, size)
+            written.append((section, spilled[section]["version"]))
+            held[section] = value
+        elif section in spilled:
+            del spilled[section]
+        if section in previous:
+            superseded.append((section, previous[section].get("version")))
+
+    if held or superseded:
+        profile.spilled = spilled
+    for section in held:
+        setattr(profile, section, [])
+    try:
+        yield
+    except BaseException:
+        # The stored marker still names the previous versions
+        _delete_spilled(str(profile.pk), written)
+        if held or superseded:
+            profile.spilled = previous
+        raise
+    finally:
+        for section, value in held.items():
+            profile._data[section] = value
+    _delete_spilled(str(profile.pk), superseded)
+
+def spill_document(document):
+    """
+    spill_sections for raw documents written without mongoengine (bulk import)
+
+    Returns:
+        The document with oversized sections moved out (a copy when changed)
+    """
+    spilled = {}
+    for section in SPILLABLE_SECTIONS:
+        entries = document.get(section)
+        size = section_bytes(entries)
+        if placement(section, size, {}):
+            spilled[section] = (entries, size)
+    if not spilled:
+        return document
+
+    document = dict(document)
+    document.setdefault("_id", ObjectId())
+    marker = {}
+    for section, (entries, size) in spilled.items():
+        marker[section] = _write_spilled(str(document["_id"]), section, entries, size)
+        document.pop(section)
+    document["spilled"] = marker
+    return document
+
+def orphaned_sections():
+    """Keys of profile_sections documents no profile's marker points at"""
+    profiles = get_db()["profiles"]
+    orphans = []
+    for document in sections_collection().find({}, {"profileId": 1, "section": 1, "version": 1}):
+        profile_id = document["profileId"]
+        version = document.get("version")
+        query = {"_id": ObjectId(profile_id) if ObjectId.is_valid(profile_id) else profile_id,
+                 f"spilled.{document['section']}.version": version if version else {"$exists": False},
+                 f"spilled.{document['section']}": {"$exists": True}}
+        if profiles.count_documents(query, limit=1) == 0:
+            orphans.append(document["_id"])
+    return orphans
@@ -0,0 +1,309 @@
+import gzip
+import io
+import multiprocessing
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from dotenv import load_dotenv
+import orjson
+from mongoengine import DateTimeField, EmbeddedDocumentField
+from mongoengine.errors import FieldDoesNotExist, ValidationError
+from pymongo import ASCENDING, InsertOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+from models.profile_schema import Profile
+from controllers.profile.personal_info import PERSONAL_INFO_SCHEMA
+from controllers.profile.academic import ACADEMIC_SCHEMA
+from controllers.profile.project import PROJECT_SCHEMA
+from controllers.profile.skills import SKILLS_SCHEMA
+from controllers.profile.workex import WORK_EXPERIENCE_SCHEMA
+from controllers.profile.certification import CERTIFICATION_SCHEMA
+from controllers.profile.achievement import ACHIEVEMENT_SCHEMA
+from controllers.profile.publication import PUBLICATION_SCHEMA
+from controllers.profile.socials import SOCIALS_SCHEMA
+from services.compression import GZIP_LEVEL, ZSTD_LEVEL, zstandard
+from services.profile_rendering import render_cache
+from services.profile_storage import merge_spilled, spill_document
+from services.response_cache import profile_response_cache
+from utils.json_response import dumps
+from utils.validation import Issue
+
+load_dotenv()
+
+# Processes parsing and validating import lines (0 parses inline)
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", str(os.cpu_count() or 1)))
+
+# Lines per validation batch, which is also the bulk_write size
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+# Profiles fetched per cursor round trip during export
+EXPORT_BATCH_SIZE = 500
+
+# Invalid lines kept in an import report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# List sections and the schema shared with their section routes
+ENTRY_SCHEMAS = {
+    "academic": ACADEMIC_SCHEMA,
+    "projects": PROJECT_SCHEMA,
+    "workEx": WORK_EXPERIENCE_SCHEMA,
+    "certifications": CERTIFICATION_SCHEMA,
+    "achievements": ACHIEVEMENT_SCHEMA,
+    "publications": PUBLICATION_SCHEMA,
+}
+
+def encoding_for_path(path):
+    """Compression implied by a file name: .gz -> gzip, .zst -> zstd, otherwise none"""
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith((".zst", ".zstd")):
+        return "zstd"
+    return None
+
+class _Identity:
+    def compress(self, data):
+        return data
+
+    def flush(self):
+        return b""
+
+def _compressor(encoding):
+    if encoding == "gzip":
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd needs the zstandard package.")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    if encoding is None:
+        return _Identity()
+    raise ValueError(f"Unsupported encoding '{encoding}'.")
+
+def open_input(stream, encoding):
+    """Binary stream of JSON lines, decompressed on the fly"""
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd needs the zstandard package.")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream))
+    if encoding is None:
+        return stream
+    raise ValueError(f"Unsupported encoding '{encoding}'.")
+
+def iter_export(encoding="gzip", batch_size=EXPORT_BATCH_SIZE):
+    """
+    Iterator of compressed JSON lines chunks covering every profile
+
+    Profiles are read in _id order from a raw cursor and encoded one by one,
+    so memory stays flat whatever the collection size. Passwords are left out.
+    """
+    # Not a generator itself, so an unsupported encoding fails before streaming starts
+    return _export_chunks(_compressor(encoding), batch_size)
+
+def _export_chunks(compressor, batch_size):
+    cursor = Profile._get_collection().find({}, {"password": 0}).sort("_id", ASCENDING).batch_size(batch_size)
+    buffer = []
+    buffered = 0
+    for document in cursor:
+        # Exported profiles are whole: spilled sections go back in place
+        merge_spilled(document).pop("spilled", None)
+        line = dumps(document) + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= 64 * 1024:
+            chunk = compressor.compress(b"".join(buffer))
+            buffer, buffered = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b"".join(buffer)) + compressor.flush()
+
+def export_profiles(output, encoding="gzip"):
+    """Write the export to a binary file object; returns bytes written"""
+    written = 0
+    for chunk in iter_export(encoding):
+        output.write(chunk)
+        written += len(chunk)
+    return written
+
+def validate_profile_document(document):
+    """
+    Errors of one import line as "path: message", checked with the same
+    schemas as the section routes
+    """
+    if not isinstance(document, dict):
+        return ["Line must be a JSON object."]
+
+    issues = []
+    if not document.get("username"):
+        issues.append(Issue(None, "username", "username is required."))
+
+    if document.get("personalInfo") is not None:
+        issues.extend(PERSONAL_INFO_SCHEMA.validate_object(document["personalInfo"], "personalInfo"))
+
+    for section, schema in ENTRY_SCHEMAS.items():
+        if document.get(section) is not None:
+            issues.extend(schema.validate(document[section], section))
+
+    if document.get("skills"):
+        issues.extend(SKILLS_SCHEMA.validate(document["skills"], "skills"))
+
+    if document.get("socials") is not None:
+        issues.extend(SOCIALS_SCHEMA.validate_object(document["socials"], "socials"))
+
+    return [f"{issue.path}: {issue.message}" for issue in issues]
+
+def _parse_dates(document, fields):
+    """Turn the ISO strings an export writes for DateTimeFields back into datetimes, in place"""
+    for name, field in fields.items():
+        value = document.get(field.db_field)
+        if isinstance(field, DateTimeField) and isinstance(value, str):
+            try:
+                document[field.db_field] = datetime.fromisoformat(value)
+            except ValueError:
+                # Left as is for validate() to report
+                pass
+        elif isinstance(field, EmbeddedDocumentField) and isinstance(value, dict):
+            _parse_dates(value, field.document_type._fields)
+
+def parse_batch(lines):
+    """
+    Parse and validate (line number, raw line) pairs on a pool worker
+
+    Returns:
+        ([(line number, document ready for Mongo)], [(line number, errors)])
+    """
+    documents, invalid = [], []
+    for line_number, line in lines:
+        try:
+            document = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            invalid.append((line_number, [f"Invalid JSON: {str(e)}"]))
+            continue
+
+        errors = validate_profile_document(document)
+        if not errors:
+            try:
+                _parse_dates(document, Profile._fields)
+                profile = Profile._from_son(document)
+                profile.validate()
+                # Written as the model stores it, not as the export encoded it
+                documents.append((line_number, profile.to_mongo().to_dict()))
+            except (FieldDoesNotExist, ValidationError) as e:
+                errors = [str(e)]
+        if errors:
+            invalid.append((line_number, errors))
+    return documents, invalid
+
+def _batches(stream, batch_size):
+    batch = []
+    for line_number, line in enumerate(stream, 1):
+        if line.strip():
+            batch.append((line_number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class ImportReport:
+    def __init__(self):
+        self.read = 0
+        self.written = 0
+        self.invalid = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+
+    def reject(self, line, errors):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "read": self.read,
+            "written": self.written,
+            "invalid": self.invalid,
+            "failed": self.failed,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "profilesPerSecond": round(self.read / elapsed) if elapsed else None,
+        }
+
+def _write_batch(collection, documents, mode, report):
+    if not documents:
+        return
+    documents = [(line, spill_document(document)) for line, document in documents]
+    if mode == "insert":
+        requests = [InsertOne(document) for _, document in documents]
+    else:
+        # Lines carrying an _id replace that profile, so re-running an import is safe
+        requests = [
+            ReplaceOne({"_id": document["_id"]}, document, upsert=True) if "_id" in document else InsertOne(document)
+            for _, document in documents
+        ]
+    try:
+        # Unordered: one bad document does not stop the rest of the batch
+        result = collection.bulk_write(requests, ordered=False)
+        report.written += result.inserted_count + result.upserted_count + result.matched_count
+    except BulkWriteError as e:
+        details = e.details
+        report.written += details.get("nInserted", 0) + details.get("nUpserted", 0) + details.get("nMatched", 0)
+        for error in details.get("writeErrors", []):
+            report.failed += 1
+            report.reject(documents[error["index"]][0], [error.get("errmsg", "Write failed")])
+
+def import_profiles(stream, encoding=None, mode="upsert", workers=IMPORT_WORKERS, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Bulk import profiles from a (compressed) JSON lines stream
+
+    Batches of lines are parsed and validated on a process pool while the
+    previous batches are written with unordered bulk_write; at most two
+    batches per worker are in flight, so memory does not grow with the input.
+
+    Args:
+        stream: Binary file object
+        encoding: "gzip", "zstd" or None
+        mode: "upsert" replaces profiles by _id, "insert" only inserts
+        workers: Pool size; 0 parses on the calling thread
+
+    Returns:
+        Import report dict. Materialized aggregates are not touched; rebuild
+        them afterwards (services.analytics.rebuild_aggregates).
+    """
+    if mode not in ("upsert", "insert"):
+        raise ValueError(f"Unknown import mode '{mode}'.")
+
+    report = ImportReport()
+    collection = Profile._get_collection()
+
+    def handle(batch_result):
+        documents, invalid = batch_result
+        report.read += len(documents) + len(invalid)
+        report.invalid += len(invalid)
+        for line_number, errors in invalid:
+            report.reject(line_number, errors)
+        _write_batch(collection, documents, mode, report)
+
+    batches = _batches(open_input(stream, encoding), batch_size)
+    if workers <= 0:
+        for batch in batches:
+            handle(parse_batch(batch))
+    else:
+        # spawn: forking a process that runs Mongo and job threads is not safe
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(parse_batch, batch))
+                if len(pending) >= workers * 2:
+                    handle(pending.popleft().result())
+            while pending:
+                handle(pending.popleft().result())
+
+    # Bulk writes bypass the controllers, so no profile events were published
+    if report.written:
+        profile_response_cache.clear()
+        render_cache.clear()
+    return report.as_dict()
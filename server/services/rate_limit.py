@@ -0,0 +1,168 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from anyio import to_thread
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo.errors import DuplicateKeyError
+
+load_dotenv()
+
+# RATE_LIMIT=0 turns every limit off
+RATE_LIMIT = os.getenv("RATE_LIMIT", "1") == "1"
+
+# Where buckets live: "memory" (per worker process) or "mongo" (shared by
+# every worker; a read and a conditional update per request)
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory")
+
+# Login/signup/Google sign-in attempts per client IP: sustained per minute, and burst
+AUTH_RATE_PER_MINUTE = float(os.getenv("AUTH_RATE_PER_MINUTE", "10"))
+AUTH_BURST = int(os.getenv("AUTH_BURST", "10"))
+
+# Profile writes per user: sustained per minute, and burst
+WRITE_RATE_PER_MINUTE = float(os.getenv("WRITE_RATE_PER_MINUTE", "120"))
+WRITE_BURST = int(os.getenv("WRITE_BURST", "30"))
+
+# Buckets kept by the in-memory store; the least recently used are dropped
+# (a dropped bucket starts again full)
+MEMORY_BUCKETS = int(os.getenv("RATE_LIMIT_MEMORY_BUCKETS", "100000"))
+
+RATE_LIMIT_COLLECTION = "rate_limit_buckets"
+
+# Optimistic update attempts against the shared store before letting the request through
+SHARED_STORE_ATTEMPTS = 3
+
+Limit = namedtuple("Limit", ["name", "rate", "burst"])
+
+AUTH_LIMIT = Limit("auth", AUTH_RATE_PER_MINUTE / 60, AUTH_BURST)
+WRITE_LIMIT = Limit("write", WRITE_RATE_PER_MINUTE / 60, WRITE_BURST)
+
+class RateLimited(Exception):
+    """A bucket is empty; retry_after is the number of seconds until it has a token"""
+
+    def __init__(self, limit, retry_after):
+        super().__init__(f"Rate limit '{limit.name}' exceeded")
+        self.limit = limit
+        self.retry_after = retry_after
+
+def refill(tokens, updated, limit, now):
+    """
+    Take one token from a bucket last seen holding `tokens` at `updated`
+
+    Returns:
+        (tokens left, seconds to wait); the wait is 0 when the token was taken
+    """
+    tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / limit.rate
+
+class MemoryBucketStore:
+    """Token buckets in this process, bounded by MEMORY_BUCKETS"""
+
+    def __init__(self, size=MEMORY_BUCKETS):
+        self.size = size
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, limit):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (limit.burst, now))
+            tokens, wait = refill(tokens, updated, limit, now)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.size:
+                self._buckets.popitem(last=False)
+        return wait
+
+class MongoBucketStore:
+    """
+    Token buckets shared by every worker: {_id: key, tokens, updated, expireAt}
+
+    Each take is a compare-and-set on `updated`, retried on conflict. A bucket
+    expires once it would be full again, so idle clients cost no storage.
+    """
+
+    def __init__(self):
+        self._indexes_ready = False
+
+    def collection(self):
+        collection = get_db()[RATE_LIMIT_COLLECTION]
+        if not self._indexes_ready:
+            collection.create_index("expireAt", expireAfterSeconds=0)
+            self._indexes_ready = True
+        return collection
+
+    def take(self, key, limit):
+        collection = self.collection()
+        for _ in range(SHARED_STORE_ATTEMPTS):
+            now = time.time()
+            bucket = collection.find_one({"_id": key}, {"tokens": 1, "updated": 1})
+            tokens, updated = (bucket["tokens"], bucket["updated"]) if bucket else (limit.burst, now)
+            tokens, wait = refill(tokens, updated, limit, now)
+            state = {
+                "tokens": tokens, "updated": now,
+                "expireAt": datetime.now(timezone.utc) + timedelta(seconds=(limit.burst - tokens) / limit.rate + 1),
+            }
+            if bucket is None:
+                try:
+                    collection.insert_one({"_id": key, **state})
+                    return wait
+                except DuplicateKeyError:
+                    continue
+            if collection.update_one({"_id": key, "updated": updated}, {"$set": state}).modified_count:
+                return wait
+        # Heavily contended: the callers racing for this bucket are already being limited
+        return 0
+
+_store = None
+_store_lock = threading.Lock()
+
+def bucket_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MongoBucketStore() if RATE_LIMIT_STORE == "mongo" else MemoryBucketStore()
+        return _store
+
+def check(limit, key):
+    """
+    Take a token from key's bucket for this limit
+
+    The shared store failing lets the request through: rate limiting must
+    not take the API down with it.
+
+    Raises:
+        RateLimited: the bucket is empty
+    """
+    if not RATE_LIMIT:
+        return
+    try:
+        wait = bucket_store().take(f"{limit.name}:{key}", limit)
+    except Exception as e:
+        print(f"Error checking rate limit: {str(e)}")
+        return
+    if wait > 0:
+        raise RateLimited(limit, wait)
+
+async def check_async(limit, key):
+    """
+    check() for the event loop: the shared store's round trips run on the
+    thread pool, the in-memory store is checked inline
+
+    Raises:
+        RateLimited: the bucket is empty
+    """
+    if not RATE_LIMIT:
+        return
+    if isinstance(bucket_store(), MongoBucketStore):
+        await to_thread.run_sync(check, limit, key)
+    else:
+        check(limit, key)
+
+def retry_after_header(seconds):
+    """Retry-After takes whole seconds; round up so the retry finds a token"""
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from services.compression import COMPRESSION_MIN_SIZE, compress, negotiate
+from services.metrics import RESPONSE_CACHE
+from services.profile_changes import change_consumer
+from services.profile_events import subscribe
+from utils.json_response import FastJSONResponse
+
+load_dotenv()
+
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "2048"))
+
+# Entries are only invalidated by writes handled in this process, so the TTL
+# bounds how stale a profile written through another worker can be
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "30"))
+
+class CachedBody:
+    """Encoded JSON body plus its compressed variants, created on first use"""
+
+    __slots__ = ("body", "variants", "expires_at")
+
+    def __init__(self, body, expires_at):
+        self.body = body
+        self.variants = {}
+        self.expires_at = expires_at
+
+    def variant(self, encoding):
+        compressed = self.variants.get(encoding)
+        if compressed is None:
+            # Two requests may race to fill the same variant; both results are identical
+            compressed = compress(self.body, encoding)
+            self.variants[encoding] = compressed
+        return compressed
+
+class ResponseCache:
+    """
+    LRU cache of encoded response bodies with a TTL
+
+    Writers that read the source data before calling put() pass the epoch()
+    they saw first, so a body built from data that was invalidated meanwhile
+    is never stored.
+    """
+
+    def __init__(self, name, max_entries, ttl_seconds):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._epoch = 0
+        # key -> epoch of its last invalidation, bounded; _floor covers evicted keys
+        self._invalidated = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def epoch(self):
+        return self._epoch
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        RESPONSE_CACHE.inc(self.name, "hit" if entry is not None else "miss")
+        return entry
+
+    def put(self, key, body, epoch):
+        """Store body unless key was invalidated after epoch; returns the entry either way"""
+        entry = CachedBody(body, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            if self._invalidated.get(key, self._floor) > epoch:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key):
+        with self._lock:
+            self._epoch += 1
+            self._entries.pop(key, None)
+            self._invalidated[key] = self._epoch
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_entries:
+                _, evicted_epoch = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, evicted_epoch)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+profile_response_cache = ResponseCache("profile", PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_SECONDS)
+
+@subscribe
+def invalidate_profile_response(user_id, section, old, new):
+    """Drop a user's cached profile whenever one of its sections is saved"""
+    profile_response_cache.invalidate(user_id.lower())
+
+@change_consumer("profile_response_cache", on_resync=profile_response_cache.clear)
+def invalidate_changed_profiles(changes):
+    """Same, for writes from other workers and scripts (PROFILE_CHANGE_STREAM)"""
+    for user_id in {change.user_id.lower() for change in changes}:
+        profile_response_cache.invalidate(user_id)
+
+def cached_json_response(entry, accept_encoding):
+    """
+    Build a JSON response from a cache entry
+
+    The negotiated compressed variant is sent with its Content-Encoding already
+    set, so CompressionMiddleware passes it through without recompressing.
+    """
+    encoding = negotiate(accept_encoding) if len(entry.body) >= COMPRESSION_MIN_SIZE else None
+    if encoding is None:
+        return FastJSONResponse(entry.body)
+    return FastJSONResponse(
+        entry.variant(encoding),
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
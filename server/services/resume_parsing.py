@@ -0,0 +1,197 @@
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo.errors import DuplicateKeyError
+from controllers.profile.academic import ACADEMIC_SCHEMA
+from controllers.profile.certification import CERTIFICATION_SCHEMA
+from controllers.profile.project import PROJECT_SCHEMA
+from controllers.profile.skills import SKILLS_SCHEMA
+from controllers.profile.workex import WORK_EXPERIENCE_SCHEMA
+from services.metrics import JOB_QUEUE_DEPTH, JOBS, JOB_LATENCY
+from services.process_pool import ProcessPool, WorkerCrashed, WorkerTimeout
+from services.resume_storage import get_blob, store_for
+from utils.resume_text import parse_document
+
+load_dotenv()
+
+# Parser processes (resume parsing is CPU bound, so threads would not help)
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+
+# Parses waiting for a worker; beyond this, new requests are turned away
+RESUME_PARSE_QUEUE_SIZE = int(os.getenv("RESUME_PARSE_QUEUE_SIZE", "32"))
+
+# A document taking longer than this is abandoned (and its worker replaced)
+RESUME_PARSE_TIMEOUT_SECONDS = float(os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", "20"))
+
+RESUME_PARSES_COLLECTION = "resume_parses"
+
+# Bump when the mapping changes, so cached results are parsed again
+PARSER_VERSION = 1
+
+# Queued or running parses older than this were lost with their process
+STALE_PARSE_SECONDS = 600
+
+JOB_NAME = "resume_parse"
+
+# Draft sections and the schemas their entries must pass to be applied
+SECTION_SCHEMAS = {
+    "academic": ACADEMIC_SCHEMA,
+    "workEx": WORK_EXPERIENCE_SCHEMA,
+    "projects": PROJECT_SCHEMA,
+    "certifications": CERTIFICATION_SCHEMA,
+    "skills": SKILLS_SCHEMA,
+}
+
+class ResumeParserBusy(Exception):
+    """The parse queue is full"""
+
+def draft_issues(draft):
+    """Schema problems of each draft section as "path: message" strings"""
+    issues = {}
+    for section, entries in draft.items():
+        found = SECTION_SCHEMAS[section].validate(entries, section)
+        if found:
+            issues[section] = [f"{issue.path}: {issue.message}" for issue in found]
+    return issues
+
+_indexes_ready = False
+
+def parses_collection():
+    """Parse status and results, keyed by the resume's SHA-256"""
+    global _indexes_ready
+    collection = get_db()[RESUME_PARSES_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index("state")
+        _indexes_ready = True
+    return collection
+
+class ResumeParsePool:
+    """
+    Parses stored resumes on a process pool
+
+    Requests go through a bounded queue served by one dispatcher thread per
+    worker process, so at most `workers` documents are parsed at once and at
+    most `queue_size` wait. Status and results are written to resume_parses,
+    where the API reads them; the parse itself never blocks a request.
+    """
+
+    def __init__(self, workers=RESUME_PARSE_WORKERS, queue_size=RESUME_PARSE_QUEUE_SIZE,
+                 timeout=RESUME_PARSE_TIMEOUT_SECONDS):
+        self.workers = max(workers, 1)
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pool = ProcessPool(self.workers)
+        self._lock = threading.Lock()
+        self._started = False
+
+    def submit(self, sha256):
+        """Queue a parse; raises ResumeParserBusy when the queue is full"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(sha256)
+        except queue.Full:
+            JOBS.inc(JOB_NAME, "dropped")
+            raise ResumeParserBusy("Resume parsing is busy, try again shortly.")
+        JOB_QUEUE_DEPTH.set(self._queue.qsize(), JOB_NAME)
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            for index in range(self.workers):
+                threading.Thread(target=self._dispatch, name=f"resume-parse-{index}", daemon=True).start()
+            self._started = True
+
+    def _dispatch(self):
+        while True:
+            sha256 = self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize(), JOB_NAME)
+            try:
+                self._run(sha256)
+            except Exception as e:
+                print(f"Error parsing resume {sha256}: {str(e)}")
+
+    def _parse(self, blob, data):
+        try:
+            return self._pool.run(parse_document, data, blob["contentType"], self.timeout, timeout=self.timeout)
+        except WorkerTimeout:
+            return {"error": "Parsing took too long."}
+        except WorkerCrashed:
+            return {"error": "The parser crashed on this document."}
+
+    def _run(self, sha256):
+        collection = parses_collection()
+        collection.update_one(
+            {"_id": sha256},
+            {"$set": {"state": "running", "startedAt": datetime.now(timezone.utc)}}
+        )
+
+        start = time.perf_counter()
+        blob = get_blob(sha256)
+        if blob is None:
+            outcome = {"error": "Resume file is missing."}
+        else:
+            outcome = self._parse(blob, store_for(blob).read(blob))
+        JOB_LATENCY.observe(time.perf_counter() - start, JOB_NAME)
+
+        update = {"finishedAt": datetime.now(timezone.utc)}
+        if "draft" in outcome:
+            JOBS.inc(JOB_NAME, "success")
+            update.update(state="done", draft=outcome["draft"], issues=draft_issues(outcome["draft"]))
+        else:
+            JOBS.inc(JOB_NAME, "failed")
+            update.update(state="failed", error=outcome["error"])
+        collection.update_one({"_id": sha256}, {"$set": update})
+
+resume_parse_pool = ResumeParsePool()
+
+def request_parse(sha256, force=False):
+    """
+    Start parsing a stored resume unless a result (or a parse) already exists
+
+    Results are cached by file hash, so a resume uploaded again, or by
+    another user, is not parsed twice.
+
+    Returns:
+        The resume_parses record (state queued, running, done or failed)
+
+    Raises:
+        ResumeParserBusy: the parse queue is full
+    """
+    collection = parses_collection()
+    now = datetime.now(timezone.utc)
+    claimable = [
+        {"state": "queued", "queuedAt": {"$lt": now - timedelta(seconds=STALE_PARSE_SECONDS)}},
+        {"state": "running", "startedAt": {"$lt": now - timedelta(seconds=STALE_PARSE_SECONDS)}},
+        {"version": {"$ne": PARSER_VERSION}},
+    ]
+    if force:
+        claimable.append({"state": {"$in": ["done", "failed"]}})
+
+    record = {"state": "queued", "version": PARSER_VERSION, "queuedAt": now}
+    try:
+        # Upserting into an _id that exists but is not claimable raises, which
+        # leaves a current result or an in-flight parse alone
+        collection.update_one(
+            {"_id": sha256, "$or": claimable},
+            {"$set": record, "$unset": {"draft": "", "issues": "", "error": "", "startedAt": "", "finishedAt": ""}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        return collection.find_one({"_id": sha256})
+
+    try:
+        resume_parse_pool.submit(sha256)
+    except ResumeParserBusy:
+        collection.delete_one({"_id": sha256, "state": "queued", "queuedAt": now})
+        raise
+    return {"_id": sha256, **record}
+
+def get_parse(sha256):
+    return parses_collection().find_one({"_id": sha256})
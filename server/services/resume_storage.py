@@ -0,0 +1,297 @@
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+import anyio
+from dotenv import load_dotenv
+from gridfs import GridFSBucket
+from mongoengine.connection import get_db
+from pymongo.errors import DuplicateKeyError
+from models.profile_schema import Profile
+
+load_dotenv()
+
+# "gridfs" stores files in Mongo; "local" in a content-addressed directory
+RESUME_STORE = os.getenv("RESUME_STORE", "gridfs")
+
+# Root of the local store (one file per SHA-256, fanned out by hash prefix)
+RESUME_DIR = os.getenv("RESUME_DIR", "resume_files")
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+
+RESUME_BLOBS_COLLECTION = "resume_blobs"
+GRIDFS_BUCKET = "resumes"
+
+# Upload bytes are handed to the store (on a worker thread) in pieces this big;
+# it is also the GridFS chunk size
+WRITE_BUFFER_SIZE = 256 * 1024
+
+# Accepted types and the magic bytes their content must start with
+CONTENT_TYPES = {
+    "application/pdf": b"%PDF-",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": b"PK\x03\x04",
+    "application/msword": b"\xd0\xcf\x11\xe0",
+}
+SNIFF_BYTES = 8
+
+class ResumeUploadError(Exception):
+    """Upload rejected; status_code is the HTTP status to answer with"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+class LocalResumeStore:
+    """Content-addressed files under RESUME_DIR"""
+
+    name = "local"
+
+    def __init__(self, root=RESUME_DIR):
+        self.root = root
+
+    def path(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def begin(self):
+        # Temporary files live under the root so the final rename stays on one filesystem
+        os.makedirs(os.path.join(self.root, "tmp"), exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=os.path.join(self.root, "tmp"), delete=False)
+
+    def commit(self, upload, sha256):
+        upload.close()
+        path = self.path(sha256)
+        if os.path.exists(path):
+            os.unlink(upload.name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(upload.name, path)
+        return None
+
+    def abort(self, upload):
+        upload.close()
+        if os.path.exists(upload.name):
+            os.unlink(upload.name)
+
+    def discard(self, file_id):
+        """Identical content already sits at the same path"""
+
+    def read(self, blob):
+        with open(self.path(blob["_id"]), "rb") as f:
+            return f.read()
+
+    def delete(self, blob):
+        path = self.path(blob["_id"])
+        if os.path.exists(path):
+            os.unlink(path)
+
+class GridFSResumeStore:
+    """Files chunked into the resumes GridFS bucket"""
+
+    name = "gridfs"
+
+    def bucket(self):
+        return GridFSBucket(get_db(), bucket_name=GRIDFS_BUCKET, chunk_size_bytes=WRITE_BUFFER_SIZE)
+
+    def begin(self):
+        # The hash is only known at the end, so the file is named after it then
+        return self.bucket().open_upload_stream("pending")
+
+    def commit(self, upload, sha256):
+        upload.close()
+        self.bucket().rename(upload._id, sha256)
+        return upload._id
+
+    def abort(self, upload):
+        upload.abort()
+
+    def discard(self, file_id):
+        self.bucket().delete(file_id)
+
+    def delete(self, blob):
+        self.bucket().delete(blob["fileId"])
+
+    def open(self, blob):
+        return self.bucket().open_download_stream(blob["fileId"])
+
+    def read(self, blob):
+        with self.open(blob) as stream:
+            return stream.read()
+
+resume_store = LocalResumeStore() if RESUME_STORE == "local" else GridFSResumeStore()
+
+def store_for(blob):
+    """Store holding a blob (it may predate a RESUME_STORE change)"""
+    return LocalResumeStore() if blob["store"] == "local" else GridFSResumeStore()
+
+_indexes_ready = False
+
+def blobs_collection():
+    """SHA-256 -> stored file; the _id doubles as the dedupe key"""
+    global _indexes_ready
+    collection = get_db()[RESUME_BLOBS_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index("lastUsedAt")
+        _indexes_ready = True
+    return collection
+
+def get_blob(sha256):
+    return blobs_collection().find_one({"_id": sha256})
+
+class _Writer:
+    """Hashes and writes upload bytes on a worker thread"""
+
+    def __init__(self, store):
+        self.store = store
+        self.upload = store.begin()
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.hash.update(data)
+        self.upload.write(data)
+        self.size += len(data)
+
+def _check_magic(content_type, head):
+    if not head.startswith(CONTENT_TYPES[content_type]):
+        raise ResumeUploadError("File content does not match its Content-Type.", 415)
+
+async def store_upload(chunks, content_type, store=None):
+    """
+    Stream an upload into resume storage without holding it in memory
+
+    Bytes are hashed while they are written; once complete, the SHA-256
+    decides between keeping the new copy and pointing at an identical file
+    stored earlier (the resume_blobs unique _id settles concurrent uploads).
+
+    Args:
+        chunks: Async iterator of bytes (e.g. request.stream())
+        content_type: Declared media type, one of CONTENT_TYPES
+
+    Returns:
+        The blob record: {_id: sha256, size, contentType, store, fileId, ...}
+
+    Raises:
+        ResumeUploadError: unsupported type (415), too large (413), empty (400)
+    """
+    store = store or resume_store
+    if content_type not in CONTENT_TYPES:
+        raise ResumeUploadError("Resumes must be PDF or Word documents.", 415)
+
+    writer = await anyio.to_thread.run_sync(_Writer, store)
+    buffer = bytearray()
+    received = 0
+    try:
+        async for chunk in chunks:
+            received += len(chunk)
+            if received > RESUME_MAX_BYTES:
+                raise ResumeUploadError(f"Resumes are limited to {RESUME_MAX_BYTES // (1024 * 1024)} MB.", 413)
+            buffer += chunk
+            if writer.size == 0 and len(buffer) >= SNIFF_BYTES:
+                _check_magic(content_type, bytes(buffer[:SNIFF_BYTES]))
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                await anyio.to_thread.run_sync(writer.write, bytes(buffer))
+                buffer.clear()
+
+        if received == 0:
+            raise ResumeUploadError("The uploaded file is empty.")
+        if writer.size == 0:
+            _check_magic(content_type, bytes(buffer[:SNIFF_BYTES]))
+        if buffer:
+            await anyio.to_thread.run_sync(writer.write, bytes(buffer))
+    except BaseException:
+        await anyio.to_thread.run_sync(store.abort, writer.upload)
+        raise
+
+    sha256 = writer.hash.hexdigest()
+    return await anyio.to_thread.run_sync(_register, store, writer, sha256, content_type)
+
+def _register(store, writer, sha256, content_type):
+    now = datetime.now(timezone.utc)
+    blobs = blobs_collection()
+
+    # Same bytes stored before: keep that copy (touching it keeps the sweeper off)
+    existing = blobs.find_one_and_update({"_id": sha256}, {"$set": {"lastUsedAt": now}})
+    if existing is not None:
+        store.abort(writer.upload)
+        return existing
+
+    file_id = store.commit(writer.upload, sha256)
+    blob = {
+        "_id": sha256,
+        "size": writer.size,
+        "contentType": content_type,
+        "store": store.name,
+        "fileId": file_id,
+        "createdAt": now,
+        "lastUsedAt": now,
+    }
+    try:
+        blobs.insert_one(blob)
+        return blob
+    except DuplicateKeyError:
+        # An identical upload finished first
+        if file_id is not None:
+            store.discard(file_id)
+        return blobs.find_one_and_update({"_id": sha256}, {"$set": {"lastUsedAt": now}})
+
+def parse_range(header, size):
+    """
+    First byte range of a Range header as (start, end) inclusive
+
+    Returns None when the header is absent or not a single bytes range
+    (the full file is sent then).
+
+    Raises:
+        ValueError: range not satisfiable
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[6:].strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = size - int(last), size - 1
+    except ValueError:
+        return None
+    start, end = max(start, 0), min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+def iter_gridfs_range(blob, start, end, chunk_size=WRITE_BUFFER_SIZE):
+    """Read bytes start..end (inclusive) of a GridFS resume; blocking, chunk by chunk"""
+    with GridFSResumeStore().open(blob) as stream:
+        stream.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = stream.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+def sweep_orphaned_blobs(min_age_seconds=3600):
+    """
+    Delete stored resumes that no profile references any more
+
+    Blobs used within min_age_seconds are skipped: their upload may not have
+    been attached to a profile yet. Meant to run offline (scripts.resume_blobs).
+
+    Returns:
+        Number of blobs deleted
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=min_age_seconds)
+    collection = blobs_collection()
+    profiles = Profile._get_collection()
+    deleted = 0
+    for blob in collection.find({"lastUsedAt": {"$lt": cutoff}}):
+        if profiles.find_one({"resumeFile.sha256": blob["_id"]}, {"_id": 1}):
+            continue
+        # Only if no upload reused it since it was read
+        if not collection.delete_one({"_id": blob["_id"], "lastUsedAt": blob["lastUsedAt"]}).deleted_count:
+            continue
+        store_for(blob).delete(blob)
+        deleted += 1
+    return deleted
@@ -0,0 +1,156 @@
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from mongoengine.connection import get_db
+from pymongo import ASCENDING
+
+load_dotenv()
+
+# "mongo" shares revocations between workers through the revocations
+# collection; "local" keeps them in this process only (single worker, tests)
+REVOCATION_STORE = os.getenv("REVOCATION_STORE", "mongo")
+
+# How often each worker pulls revocations made by other workers
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "1"))
+
+# Polls re-read this much history to tolerate clock skew between workers
+SYNC_OVERLAP_SECONDS = 5
+
+# Revocations only matter while a credential issued before them can still be
+# valid: session tokens (SESSION_TTL_SECONDS, 12h by default) and ID tokens (1h)
+REVOCATION_RETENTION_SECONDS = int(os.getenv("REVOCATION_RETENTION_SECONDS", str(13 * 3600)))
+
+REVOCATIONS_COLLECTION = "revocations"
+
+class LocalRevocationStore:
+    """In-process stand-in for the shared store"""
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def publish(self, uid, revoked_after):
+        with self._lock:
+            current = self._records.get(uid, (0, 0))[0]
+            self._records[uid] = (max(current, revoked_after), time.time())
+
+    def changes_since(self, since):
+        with self._lock:
+            return [(uid, revoked_after) for uid, (revoked_after, updated_at) in self._records.items() if updated_at >= since]
+
+class MongoRevocationStore:
+    """Revocations shared by all workers through a TTL'd Mongo collection"""
+
+    def __init__(self):
+        self._indexes_ready = False
+
+    def collection(self):
+        collection = get_db()[REVOCATIONS_COLLECTION]
+        if not self._indexes_ready:
+            collection.create_index("expireAt", expireAfterSeconds=0)
+            collection.create_index([("updatedAt", ASCENDING)])
+            self._indexes_ready = True
+        return collection
+
+    def publish(self, uid, revoked_after):
+        self.collection().update_one(
+            {"_id": uid},
+            {
+                "$max": {"revokedAfter": revoked_after},
+                "$set": {
+                    "updatedAt": datetime.now(timezone.utc),
+                    "expireAt": datetime.fromtimestamp(revoked_after + REVOCATION_RETENTION_SECONDS, timezone.utc),
+                },
+            },
+            upsert=True
+        )
+
+    def changes_since(self, since):
+        cursor = self.collection().find(
+            {"updatedAt": {"$gte": datetime.fromtimestamp(since, timezone.utc)}},
+            {"revokedAfter": 1}
+        )
+        return [(doc["_id"], doc["revokedAfter"]) for doc in cursor]
+
+class RevocationIndex:
+    """
+    uid -> revoked-after timestamp (seconds, millisecond precision), checked on
+    every authenticated request
+
+    Credentials issued before a uid's revoked-after time are rejected. Firebase
+    ID tokens carry whole seconds, so one issued in the second of a logout
+    (before or after it) is rejected too; session tokens carry milliseconds,
+    so logging back in right after a logout works.
+    Local revocations apply immediately; revocations from other workers arrive
+    within REVOCATION_SYNC_SECONDS through the store.
+    """
+
+    def __init__(self, store, sync_seconds=REVOCATION_SYNC_SECONDS):
+        self.store = store
+        self.sync_seconds = sync_seconds
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._cursor = 0.0
+        self._next_prune = 0.0
+        self._syncer = None
+        self._syncer_lock = threading.Lock()
+
+    def _apply(self, uid, revoked_after):
+        with self._lock:
+            if revoked_after > self._revoked.get(uid, -1):
+                self._revoked[uid] = revoked_after
+
+    def revoke(self, uid, revoked_after=None):
+        """Revoke every credential of uid issued up to now (or revoked_after)"""
+        if revoked_after is None:
+            # Milliseconds, rounded down like session issue times
+            revoked_after = math.floor(time.time() * 1000) / 1000
+        self._apply(uid, revoked_after)
+        self.store.publish(uid, revoked_after)
+
+    def is_revoked(self, uid, issued_at):
+        if self._syncer is None:
+            self._start_syncer()
+        revoked_after = self._revoked.get(uid)
+        return revoked_after is not None and issued_at < revoked_after
+
+    def sync(self):
+        """Pull revocations published since the last sync and drop expired ones"""
+        started = time.time()
+        since = self._cursor - SYNC_OVERLAP_SECONDS if self._cursor else started - REVOCATION_RETENTION_SECONDS
+        for uid, revoked_after in self.store.changes_since(since):
+            self._apply(uid, revoked_after)
+        self._cursor = started
+
+        if started < self._next_prune:
+            return
+        self._next_prune = started + 60
+        cutoff = started - REVOCATION_RETENTION_SECONDS
+        with self._lock:
+            for uid in [uid for uid, revoked_after in self._revoked.items() if revoked_after < cutoff]:
+                del self._revoked[uid]
+
+    def _run(self):
+        while True:
+            time.sleep(self.sync_seconds)
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Error syncing revocations: {str(e)}")
+
+    def _start_syncer(self):
+        with self._syncer_lock:
+            if self._syncer is not None:
+                return
+            # Load existing revocations before the first check is answered
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Error loading revocations: {str(e)}")
+            self._syncer = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+            self._syncer.start()
+
+revocation_index = RevocationIndex(LocalRevocationStore() if REVOCATION_STORE == "local" else MongoRevocationStore())
@@ -0,0 +1,148 @@
+import base64
+import hashlib
+import hmac
+import math
+import os
+import secrets
+import threading
+import time
+from collections import namedtuple
+from dotenv import load_dotenv
+from services.revocation import revocation_index
+
+load_dotenv()
+
+# HMAC key for session tokens, shared by every worker. Unset disables session
+# tokens: sign-in issues none and clients keep sending Firebase ID tokens
+SESSION_SECRET = os.getenv("SESSION_SECRET")
+SESSIONS_ENABLED = bool(SESSION_SECRET)
+
+# Previous key, still accepted for verification while rotating SESSION_SECRET
+SESSION_PREVIOUS_SECRET = os.getenv("SESSION_PREVIOUS_SECRET")
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(12 * 3600)))
+
+SESSION_TOKEN_PREFIX = "s1."
+
+if SESSIONS_ENABLED:
+    _signing_key = SESSION_SECRET.encode()
+    _verification_keys = [_signing_key] + ([SESSION_PREVIOUS_SECRET.encode()] if SESSION_PREVIOUS_SECRET else [])
+else:
+    # A per-process key would only verify on the worker that issued the session
+    print("⚠️ SESSION_SECRET is not set; session tokens are disabled and Firebase ID tokens are used instead.")
+    _signing_key = None
+    _verification_keys = []
+
+Session = namedtuple("Session", ["session_id", "firebase_uid", "user_id", "email", "username", "issued_at", "expires_at"])
+
+class InvalidSessionError(Exception):
+    """Session token is malformed, has a bad signature, expired or was revoked"""
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _sign(key, payload):
+    return hmac.digest(key, payload.encode(), hashlib.sha256)
+
+def is_session_token(token):
+    return token.startswith(SESSION_TOKEN_PREFIX)
+
+def issue_session(firebase_uid, user_id, email=None, username=None, ttl_seconds=SESSION_TTL_SECONDS):
+    """
+    Issue a signed session token for an already verified Firebase identity
+
+    Token layout: "s1.<payload>.<signature>" where payload is the base64url of
+    "\\x1f"-separated claims and signature is HMAC-SHA256 over the payload.
+
+    Returns:
+        (token, Session)
+
+    Raises:
+        RuntimeError: session tokens are disabled (SESSION_SECRET is not set)
+    """
+    if not SESSIONS_ENABLED:
+        raise RuntimeError("Session tokens are disabled: SESSION_SECRET is not set")
+    # Milliseconds (rounded down), so a login right after a logout is not
+    # mistaken for a session issued before it
+    now = time.time()
+    issued_at = math.floor(now * 1000) / 1000
+    session = Session(
+        secrets.token_urlsafe(12), firebase_uid, user_id,
+        (email or "").replace("\x1f", ""), (username or "").replace("\x1f", ""),
+        issued_at, int(now) + ttl_seconds
+    )
+    claims = "\x1f".join((
+        session.session_id, session.firebase_uid, session.user_id, session.email, session.username,
+        str(session.issued_at), str(session.expires_at)
+    ))
+    payload = _b64encode(claims.encode())
+    token = f"{SESSION_TOKEN_PREFIX}{payload}.{_b64encode(_sign(_signing_key, payload))}"
+    return token, session
+
+class RevokedSessions:
+    """In-memory set of revoked session IDs, each kept until the session would expire anyway"""
+
+    def __init__(self):
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._next_purge = 0
+
+    def revoke(self, session_id, expires_at):
+        with self._lock:
+            self._revoked[session_id] = expires_at
+            self._purge(time.time())
+
+    def __contains__(self, session_id):
+        return session_id in self._revoked
+
+    def _purge(self, now):
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 60
+        for session_id in [sid for sid, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[session_id]
+
+revoked_sessions = RevokedSessions()
+
+def verify_session(token):
+    """
+    Verify a session token locally (no network, no database)
+
+    Returns:
+        Session
+
+    Raises:
+        InvalidSessionError
+    """
+    try:
+        payload, signature = token[len(SESSION_TOKEN_PREFIX):].split(".")
+        signature = _b64decode(signature)
+    except ValueError:
+        raise InvalidSessionError("Malformed session token")
+
+    if not any(hmac.compare_digest(_sign(key, payload), signature) for key in _verification_keys):
+        raise InvalidSessionError("Invalid session signature")
+
+    fields = _b64decode(payload).decode().split("\x1f")
+    if len(fields) != 7:
+        raise InvalidSessionError("Malformed session token")
+    # issued_at was whole seconds in tokens issued before milliseconds were added
+    session = Session(*fields[:5], float(fields[5]), int(fields[6]))
+
+    if session.expires_at <= time.time():
+        raise InvalidSessionError("Session expired")
+    if session.session_id in revoked_sessions or revocation_index.is_revoked(session.firebase_uid, session.issued_at):
+        raise InvalidSessionError("Session revoked")
+    return session
+
+def revoke_session(token):
+    """Revoke a session token; returns the Session, or None if the token was not valid"""
+    try:
+        session = verify_session(token)
+    except InvalidSessionError:
+        return None
+    revoked_sessions.revoke(session.session_id, session.expires_at)
+    return session
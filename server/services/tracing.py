@@ -0,0 +1,280 @@
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from dotenv import load_dotenv
+from pymongo import monitoring
+
+load_dotenv()
+
+# Fraction of requests that are recorded (0 disables tracing unless
+# TRACE_TRUST_PARENT honours a sampled parent)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+
+# Honour the sampled flag of an incoming traceparent (TRACE_TRUST_PARENT=1).
+# Only enable it when every caller is internal (e.g. behind a gateway that
+# strips traceparent from outside requests): otherwise anyone can force full
+# tracing. Untrusted parents still continue the trace ID, sampled at TRACE_SAMPLE_RATE.
+TRACE_TRUST_PARENT = os.getenv("TRACE_TRUST_PARENT", "0") == "1"
+
+# When set, finished spans are appended to this file as JSON lines
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE")
+
+# Number of finished spans kept by the in-memory exporter
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "10000"))
+
+# Spans waiting to be written to TRACE_EXPORT_FILE (more are dropped), and
+# the most written with one file append
+TRACE_EXPORT_QUEUE_SIZE = 10000
+TRACE_EXPORT_BATCH_SIZE = 500
+
+SPAN_KIND_INTERNAL = "INTERNAL"
+SPAN_KIND_SERVER = "SERVER"
+SPAN_KIND_CLIENT = "CLIENT"
+
+class Span:
+    """
+    A unit of traced work, shaped after the OpenTelemetry span model
+
+    Unsampled spans only carry IDs (so context still propagates) and are never exported.
+    """
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "kind", "sampled",
+        "attributes", "start_ns", "end_ns", "status", "status_message"
+    )
+
+    def __init__(self, name, trace_id, parent_span_id=None, sampled=False, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.sampled = sampled
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns() if sampled else 0
+        self.end_ns = None
+        self.status = "UNSET"
+        self.status_message = None
+
+    def set_attribute(self, key, value):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def record_error(self, error):
+        if self.sampled:
+            self.status = "ERROR"
+            self.status_message = str(error)
+
+    def end(self):
+        if self.sampled and self.end_ns is None:
+            self.end_ns = time.time_ns()
+            for exporter in _exporters:
+                exporter.export(self)
+
+    def traceparent(self):
+        """W3C trace context header value for this span"""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self):
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+class InMemoryExporter:
+    """Keeps the most recent finished spans in a ring buffer"""
+
+    def __init__(self, max_spans=TRACE_BUFFER_SIZE):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, span):
+        self.spans.append(span.to_dict())
+
+    def get_trace(self, trace_id):
+        """Spans of one trace still in the buffer (GET /api/admin/traces/{trace_id})"""
+        # list() copies without releasing the GIL, so exports cannot mutate it mid-scan
+        return [span for span in list(self.spans) if span["traceId"] == trace_id]
+
+class FileExporter:
+    """
+    Appends finished spans to a JSON lines file
+
+    Spans are queued and written in batches by a background thread, so the
+    request path never touches the file. Spans beyond TRACE_EXPORT_QUEUE_SIZE
+    waiting to be written are dropped.
+    """
+
+    def __init__(self, path, max_queued=TRACE_EXPORT_QUEUE_SIZE):
+        self.path = path
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        try:
+            self.queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="trace-file-export", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < TRACE_EXPORT_BATCH_SIZE:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                with open(self.path, "a") as f:
+                    f.writelines(json.dumps(span, default=str) + "\n" for span in batch)
+            except Exception as e:
+                print(f"Error exporting spans: {str(e)}")
+            for _ in batch:
+                self.queue.task_done()
+
+    def flush(self, timeout=5.0):
+        """Wait for queued spans to be written (scripts and tests)"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+memory_exporter = InMemoryExporter()
+_exporters = [memory_exporter]
+if TRACE_EXPORT_FILE:
+    _exporters.append(FileExporter(TRACE_EXPORT_FILE))
+
+# Span of the work currently executing in this context (None outside traces)
+current_span = ContextVar("current_span", default=None)
+
+def parse_traceparent(header):
+    """Parse a W3C traceparent header into (trace_id, parent_span_id, sampled) or None"""
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3][:2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+def start_root_span(name, traceparent=None, attributes=None):
+    """Start a server span, continuing the caller's trace when a valid traceparent is given"""
+    parent = parse_traceparent(traceparent)
+    if parent:
+        trace_id, parent_span_id, parent_sampled = parent
+        if TRACE_TRUST_PARENT:
+            return Span(name, trace_id, parent_span_id, parent_sampled, SPAN_KIND_SERVER, attributes)
+    else:
+        trace_id = f"{random.getrandbits(128):032x}"
+        parent_span_id = None
+    sampled = TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE
+    return Span(name, trace_id, parent_span_id, sampled, SPAN_KIND_SERVER, attributes)
+
+def start_span(name, kind=SPAN_KIND_INTERNAL, attributes=None):
+    """
+    Start a child of the current span
+
+    Returns None when there is no sampled trace in progress so callers can skip work.
+    """
+    parent = current_span.get()
+    if parent is None or not parent.sampled:
+        return None
+    return Span(name, parent.trace_id, parent.span_id, True, kind, attributes)
+
+class span_scope:
+    """Context manager making a span current for the enclosed block and ending it afterwards"""
+    __slots__ = ("span", "token")
+
+    def __init__(self, span):
+        self.span = span
+        self.token = None
+
+    def __enter__(self):
+        if self.span is not None:
+            self.token = current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.span is not None:
+            if exc is not None:
+                self.span.record_error(exc)
+            current_span.reset(self.token)
+            self.span.end()
+        return False
+
+def traced(func=None, *, name=None):
+    """
+    Decorator creating a span around each call of a function
+
+    Usage:
+        @traced
+        def update_projects(user_id, projects): ...
+    """
+    def decorator(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            span = start_span(span_name)
+            if span is None:
+                return fn(*args, **kwargs)
+            with span_scope(span):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+class MongoTracingListener(monitoring.CommandListener):
+    """pymongo command monitor emitting a client span per Mongo command"""
+
+    def __init__(self):
+        self._spans = {}
+
+    def started(self, event):
+        span = start_span(f"mongo.{event.command_name}", SPAN_KIND_CLIENT, {
+            "db.system": "mongodb",
+            "db.name": event.database_name,
+            "db.operation": event.command_name,
+        })
+        if span is not None:
+            collection = event.command.get(event.command_name)
+            if isinstance(collection, str):
+                span.set_attribute("db.mongodb.collection", collection)
+            self._spans[(event.connection_id, event.request_id)] = span
+
+    def succeeded(self, event):
+        span = self._spans.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.end()
+
+    def failed(self, event):
+        span = self._spans.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.record_error(event.failure)
+            span.end()
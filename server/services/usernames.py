@@ -0,0 +1,54 @@
+from mongoengine.connection import get_db
+from mongoengine.errors import NotUniqueError
+from pymongo import ReturnDocument
+from models.profile_schema import Profile
+from utils.profile_utils import duplicate_key_field
+
+COUNTERS_COLLECTION = "counters"
+
+# Attempts at inserting a profile before giving up on a username
+MAX_USERNAME_ATTEMPTS = 5
+
+def next_username(base):
+    """
+    Allocate "<base><n>" from an atomic per-base counter
+
+    Every caller gets a different n in a single round trip, so concurrent
+    sign-ups with the same display name never race for the same suffix.
+    """
+    counter = get_db()[COUNTERS_COLLECTION].find_one_and_update(
+        {"_id": f"username:{base}"},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return f"{base}{counter['seq']}"
+
+def find_or_create_profile(uid, preferred_username):
+    """
+    Profile of a Firebase user, created on first sign-in
+
+    Uniqueness is left to the username and firebase_uid unique indexes: a
+    taken username moves on to a counter-allocated one, and a concurrent
+    first sign-in of the same user returns the profile that request created.
+    """
+    profile = Profile.objects(firebase_uid=uid).first()
+    if profile:
+        return profile
+
+    username = preferred_username
+    for _ in range(MAX_USERNAME_ATTEMPTS):
+        try:
+            return Profile(username=username, password="", firebase_uid=uid).save(force_insert=True)
+        except NotUniqueError as e:
+            field = duplicate_key_field(e)
+            if field in ("firebase_uid", None):
+                profile = Profile.objects(firebase_uid=uid).first()
+                if profile:
+                    return profile
+                if field == "firebase_uid":
+                    raise
+            elif field != "username":
+                raise
+            username = next_username(preferred_username)
+    raise NotUniqueError(f"Could not allocate a username for {preferred_username}")
@@ -0,0 +1,33 @@
+import signal
+from contextlib import contextmanager
+
+class DeadlineExceeded(BaseException):
+    """
+    Raised inside a deadline() block when time runs out
+
+    Not an Exception, so library code catching Exception cannot swallow it.
+    """
+
+@contextmanager
+def deadline(seconds):
+    """
+    Interrupt the block after `seconds` with DeadlineExceeded
+
+    Uses SIGALRM, so it only works on the main thread of a process (as in
+    process pool workers) and only interrupts Python code; where the signal is
+    unavailable the block simply runs to completion.
+    """
+    if not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise DeadlineExceeded()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
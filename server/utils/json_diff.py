@@ -0,0 +1,86 @@
+"""
+Compact diffs between two JSON-like values (dicts, lists, scalars)
+
+A diff is a list of operations, each addressing a location by its path of
+keys and list indexes:
+
+    {"op": "set", "path": ["2", "company"], "value": "Acme"}
+    {"op": "unset", "path": ["website"]}
+    {"op": "splice", "path": [], "at": 3, "remove": 1, "insert": [{...}]}
+
+Lists keep their unchanged head and tail; when the changed middle has the
+same length on both sides the entries are diffed one by one, so editing one
+field of one entry costs one small operation:
+
+    ops = diff(old_section, new_section)
+    assert patch(old_section, ops) == new_section
+
+List indexes are stored as strings so a path is valid as BSON.
+"""
+import copy
+
+def diff(old, new, path=()):
+    """Operations turning old into new (empty when they are equal)"""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "set", "path": [*path, key], "value": value})
+            else:
+                ops.extend(diff(old[key], value, (*path, key)))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "unset", "path": [*path, key]})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        return _diff_lists(old, new, path)
+    return [{"op": "set", "path": list(path), "value": new}]
+
+def _diff_lists(old, new, path):
+    head = 0
+    while head < len(old) and head < len(new) and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < len(old) - head and tail < len(new) - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    removed = old[head:len(old) - tail]
+    inserted = new[head:len(new) - tail]
+
+    if len(removed) == len(inserted):
+        ops = []
+        for offset, (before, after) in enumerate(zip(removed, inserted)):
+            ops.extend(diff(before, after, (*path, str(head + offset))))
+        return ops
+    return [{"op": "splice", "path": list(path), "at": head, "remove": len(removed), "insert": inserted}]
+
+def _resolve(value, key):
+    return value[int(key)] if isinstance(value, list) else value[key]
+
+def patch(value, ops):
+    """Apply operations from diff() to a copy of value"""
+    value = copy.deepcopy(value)
+    for op in ops:
+        path = op["path"]
+        if op["op"] == "splice":
+            target = value
+            for key in path:
+                target = _resolve(target, key)
+            target[op["at"]:op["at"] + op["remove"]] = copy.deepcopy(op["insert"])
+            continue
+
+        if not path:
+            value = copy.deepcopy(op.get("value"))
+            continue
+        parent = value
+        for key in path[:-1]:
+            parent = _resolve(parent, key)
+        key = path[-1]
+        if isinstance(parent, list):
+            key = int(key)
+        if op["op"] == "set":
+            parent[key] = copy.deepcopy(op["value"])
+        else:
+            del parent[key]
+    return value
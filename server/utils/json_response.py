@@ -0,0 +1,38 @@
+from decimal import Decimal
+import orjson
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+def _default(value):
+    """Encode the types orjson does not handle natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # Pydantic models, mongoengine documents and anything else FastAPI knows about
+    return jsonable_encoder(value, custom_encoder={ObjectId: str})
+
+def dumps(content):
+    """
+    Encode content to JSON bytes
+
+    datetime/date/UUID are encoded natively (ISO 8601), ObjectId as its hex string.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse backed by orjson
+
+    Used as the app's default_response_class. Content that is already encoded
+    (bytes) is sent as-is, so hot routes can skip jsonable_encoder entirely by
+    returning FastJSONResponse(dumps(data)) or a cached body.
+    """
+
+    def render(self, content):
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
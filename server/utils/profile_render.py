@@ -0,0 +1,191 @@
+"""
+Render profiles to HTML and PDF through Jinja2 templates
+
+Each template is a directory under templates/profile holding resume.html
+(the HTML download) and resume.pdf.html (the basic HTML fpdf2 lays out as
+PDF). Rendering is plain CPU work and runs on the render process pool
+(services.profile_rendering):
+
+    render_document(profile_data, "classic", "pdf", ["workEx", "skills"])
+"""
+import hashlib
+import os
+from functools import lru_cache
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+from utils.deadline import DeadlineExceeded, deadline
+
+# fpdf2 is needed for PDF output only
+try:
+    from fpdf import FPDF
+except ImportError:
+    FPDF = None
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "profile")
+
+FORMATS = {
+    "html": ("resume.html", "text/html; charset=utf-8"),
+    "pdf": ("resume.pdf.html", "application/pdf"),
+}
+
+# Renderable sections in document order, with their headings
+SECTION_TITLES = {
+    "workEx": "Experience",
+    "academic": "Education",
+    "projects": "Projects",
+    "skills": "Skills",
+    "certifications": "Certifications",
+    "achievements": "Achievements",
+    "publications": "Publications",
+}
+
+SOCIAL_LABELS = {
+    "linkedIn": "LinkedIn", "github": "GitHub", "twitter": "Twitter", "website": "Website",
+    "medium": "Medium", "stackOverflow": "Stack Overflow", "leetcode": "LeetCode",
+}
+
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# The PDF core fonts only cover Latin-1; common typography is mapped onto it
+_LATIN1 = str.maketrans({
+    "–": "-", "—": "-", "‘": "'", "’": "'", "“": '"', "”": '"',
+    "•": "\xb7", "…": "...",
+})
+
+class RenderError(Exception):
+    """The document cannot be rendered"""
+
+def available_templates():
+    return sorted(
+        name for name in os.listdir(TEMPLATE_ROOT)
+        if os.path.isfile(os.path.join(TEMPLATE_ROOT, name, FORMATS["html"][0]))
+    )
+
+@lru_cache(maxsize=None)
+def template_hash(template):
+    """Hash of a template's files: cached documents change when a template is edited and redeployed"""
+    digest = hashlib.sha256()
+    for filename, _ in FORMATS.values():
+        with open(os.path.join(TEMPLATE_ROOT, template, filename), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def month_year(value):
+    """ "2021-03-01" -> "Mar 2021"; other strings are shown as given"""
+    if not value:
+        return ""
+    parts = str(value).split("-")
+    if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit() and 1 <= int(parts[1]) <= 12:
+        return f"{MONTH_NAMES[int(parts[1]) - 1]} {parts[0]}"
+    return str(value)
+
+def date_range(start, end, current=False):
+    start, end = month_year(start), "Present" if current else month_year(end)
+    if start and end:
+        return f"{start} - {end}"
+    return start or end
+
+def entry_head(section, entry):
+    """Title, subtitle, dates and link of an entry, whatever its section"""
+    if section == "workEx":
+        return {"title": entry.get("position"), "subtitle": entry.get("company"),
+                "dates": date_range(entry.get("startDate"), entry.get("endDate"), entry.get("isCurrent"))}
+    if section == "academic":
+        degree = ", ".join(part for part in (entry.get("degree"), entry.get("fieldOfStudy")) if part)
+        if entry.get("grade"):
+            degree = f"{degree} (Grade: {entry['grade']})" if degree else f"Grade: {entry['grade']}"
+        return {"title": entry.get("institution"), "subtitle": degree,
+                "dates": date_range(entry.get("startDate"), entry.get("endDate"))}
+    if section == "projects":
+        return {"title": entry.get("title"), "link": entry.get("projectLink"),
+                "dates": date_range(entry.get("startDate"), entry.get("endDate"))}
+    if section == "certifications":
+        credential = f"Credential ID {entry['credentialId']}" if entry.get("credentialId") else None
+        return {"title": entry.get("name"),
+                "subtitle": " - ".join(part for part in (entry.get("issuingOrganization"), credential) if part),
+                "dates": month_year(entry.get("issueDate")), "link": entry.get("credentialURL")}
+    if section == "achievements":
+        return {"title": entry.get("title"), "subtitle": entry.get("issuer"), "dates": month_year(entry.get("date"))}
+    if section == "publications":
+        return {"title": entry.get("title"), "subtitle": entry.get("publisher"),
+                "dates": month_year(entry.get("publicationDate")), "link": entry.get("link")}
+    return {"title": entry.get("title") or entry.get("name")}
+
+def nl2br(value):
+    return Markup("<br>").join(escape(line) for line in str(value).splitlines())
+
+@lru_cache(maxsize=1)
+def _environment():
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATE_ROOT),
+        autoescape=select_autoescape(["html"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    environment.filters["month_year"] = month_year
+    environment.filters["nl2br"] = nl2br
+    environment.globals["entry_head"] = entry_head
+    return environment
+
+def template_context(profile, sections):
+    info = profile.get("personalInfo") or {}
+    address = info.get("address") or {}
+    socials = profile.get("socials") or {}
+    full_name = " ".join(part for part in (info.get("firstName"), info.get("lastName")) if part)
+    return {
+        "profile": profile,
+        "info": info,
+        "username": profile.get("username") or "",
+        "full_name": full_name,
+        "location": ", ".join(part for part in (address.get("city"), address.get("country")) if part),
+        "links": [(label, socials[field]) for field, label in SOCIAL_LABELS.items() if socials.get(field)],
+        "sections": [section for section in sections if profile.get(section)],
+        "titles": SECTION_TITLES,
+    }
+
+def _latin1(value):
+    if isinstance(value, str):
+        return value.translate(_LATIN1).encode("latin-1", "replace").decode("latin-1")
+    if isinstance(value, dict):
+        return {key: _latin1(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_latin1(item) for item in value]
+    return value
+
+def render_html(profile, template, sections):
+    html = _environment().get_template(f"{template}/{FORMATS['html'][0]}").render(template_context(profile, sections))
+    return html.encode("utf-8")
+
+def render_pdf(profile, template, sections):
+    if FPDF is None:
+        raise RenderError("PDF rendering needs the fpdf2 package.")
+    html = _environment().get_template(f"{template}/{FORMATS['pdf'][0]}").render(
+        template_context(_latin1(profile), sections)
+    )
+    pdf = FPDF(format="A4")
+    pdf.set_title(f"{profile.get('username') or 'Profile'} - Resume")
+    pdf.set_margins(18, 16, 18)
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=10)
+    pdf.write_html(html)
+    return bytes(pdf.output())
+
+def render_document(profile, template, format, sections, timeout):
+    """
+    Render on a pool worker, giving up after `timeout` seconds
+
+    Returns:
+        {"body": bytes} or {"error": message}
+    """
+    try:
+        with deadline(timeout):
+            if format == "pdf":
+                return {"body": render_pdf(profile, template, sections)}
+            return {"body": render_html(profile, template, sections)}
+    except RenderError as e:
+        return {"error": str(e)}
+    except DeadlineExceeded:
+        return {"error": "Rendering took too long."}
+    except Exception as e:
+        # Unusual profile data can break the template engine or the PDF writer
+        return {"error": f"Could not render the profile: {str(e)}"}
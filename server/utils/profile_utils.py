@@ -1,3 +1,4 @@
+import re
 from bson import ObjectId
 
 def mongo_to_dict(obj):
@@ -36,4 +37,18 @@ def format_success_response(message, data=None):
     if data is not None:
         response["data"] = data
         
-    return response
\ No newline at end of file
+    return response
+
+def duplicate_key_field(error):
+    """
+    Field whose unique index rejected a write (NotUniqueError / DuplicateKeyError)
+
+    Returns None when the server did not say which index it was.
+    """
+    cause = error.__cause__ or error.__context__ or error
+    details = getattr(cause, "details", None) or {}
+    key = details.get("keyPattern") or details.get("keyValue")
+    if key:
+        return next(iter(key))
+    match = re.search(r"index: (\S+?)_-?1 dup key", str(cause))
+    return match.group(1) if match else None
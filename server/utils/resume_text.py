@@ -0,0 +1,393 @@
+"""
+Offline resume text extraction and mapping onto profile sections
+
+Everything here is plain CPU work with no database or network access, so it
+runs on the resume parsing process pool (services.resume_parsing):
+
+    text = extract_text(data, "application/pdf")
+    draft = map_sections(text)   # {"academic": [...], "workEx": [...], ...}
+
+Mapping is heuristic: headings split the text into sections, date ranges and
+bullets split sections into entries, and keyword patterns pick out fields.
+Entries are drafts for the user to review, not validated profile data.
+"""
+import io
+import re
+import zipfile
+from xml.etree import ElementTree
+from utils.deadline import DeadlineExceeded, deadline
+
+# pypdf is needed for PDF resumes only; DOCX is read with the standard library
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Headings (lowercase, without trailing punctuation) and the section they start
+SECTION_HEADINGS = {
+    "academic": (
+        "education", "academic background", "academics", "academic qualifications",
+        "qualifications", "education and training",
+    ),
+    "workEx": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "internships", "internship experience",
+    ),
+    "projects": ("projects", "personal projects", "academic projects", "selected projects", "key projects"),
+    "certifications": (
+        "certifications", "certificates", "certification", "licenses and certifications",
+        "licenses & certifications", "courses and certifications",
+    ),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "skills and tools", "skills & tools"),
+}
+_HEADINGS = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Headings of sections that are not mapped; they end the previous section
+OTHER_HEADINGS = {
+    "summary", "profile", "objective", "about me", "interests", "hobbies", "languages",
+    "references", "achievements", "awards", "publications", "volunteering", "contact",
+}
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_DATE = r"(?:(?:(?P<{p}month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s+)|(?P<{p}num>\d{{1,2}})\s*[/.-]\s*)?(?P<{p}year>(?:19|20)\d{{2}})"
+DATE_RANGE = re.compile(
+    _DATE.format(p="s") + r"\s*(?:-|–|—|to|until)\s*(?:" + _DATE.format(p="e") + r"|(?P<current>present|current|now|ongoing|today))",
+    re.IGNORECASE
+)
+SINGLE_DATE = re.compile(_DATE.format(p="s"), re.IGNORECASE)
+
+BULLET = re.compile(r"^\s*(?:[•●▪◦■*·‣-]|–|\d+[.)])\s+")
+URL = re.compile(r"(?:https?://|www\.)[^\s,;|)]+", re.IGNORECASE)
+GRADE = re.compile(r"\b(?:c?gpa|grade|score)\s*[:\-]?\s*([0-9]+(?:\.[0-9]+)?)(?:\s*/\s*[0-9.]+)?", re.IGNORECASE)
+CREDENTIAL_ID = re.compile(r"\b(?:credential|certificate|license)\s*(?:id|no\.?|number)\s*[:#]?\s*([A-Za-z0-9-]+)", re.IGNORECASE)
+TECHNOLOGIES = re.compile(r"^(?:tech(?:nologies|nology)?(?: stack| used)?|stack|built with|tools)\s*:\s*(.+)$", re.IGNORECASE)
+
+INSTITUTION_WORDS = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic|iit|nit)\b", re.IGNORECASE)
+DEGREE = re.compile(
+    r"\b(?:bachelor|master|doctor|associate|diploma|ph\.?\s?d|mba|b\.?\s?tech|m\.?\s?tech|b\.?\s?sc|m\.?\s?sc|"
+    r"b\.?\s?e\b|m\.?\s?e\b|b\.?\s?a\b|m\.?\s?a\b|b\.?\s?s\b|m\.?\s?s\b|b\.?\s?com|m\.?\s?com|bca|mca|high school)",
+    re.IGNORECASE
+)
+FIELD_OF_STUDY = re.compile(r"\b(?:in|of)\s+([A-Z][A-Za-z&,' ]+?)(?:\s*[(,|]|$)")
+COMPANY_WORDS = re.compile(
+    r"\b(?:inc|ltd|llc|llp|corp|corporation|company|co|gmbh|pvt|plc|technologies|labs|solutions|systems|software|group)\b\.?",
+    re.IGNORECASE
+)
+POSITION_WORDS = re.compile(
+    r"\b(?:engineer|developer|intern|manager|analyst|designer|scientist|lead|consultant|architect|"
+    r"researcher|assistant|director|officer|specialist|administrator|programmer|associate|head)\b",
+    re.IGNORECASE
+)
+ISSUER_SEPARATOR = re.compile(r"\s+(?:-|–|—|\||by|from)\s+|,\s+", re.IGNORECASE)
+HEADER_SEPARATOR = re.compile(r"\s+(?:\||-|–|—|@|at)\s+|,\s+|\t+")
+
+# Skills longer than this are sentences, not skills
+MAX_SKILL_LENGTH = 40
+
+class ResumeParseError(Exception):
+    """The document cannot be read as a resume"""
+
+def extract_text(data, content_type):
+    """Plain text of a PDF or DOCX document, one line per paragraph or text line"""
+    if content_type == PDF:
+        return _pdf_text(data)
+    if content_type == DOCX:
+        return _docx_text(data)
+    raise ResumeParseError("Only PDF and DOCX resumes can be parsed.")
+
+def _pdf_text(data):
+    if pypdf is None:
+        raise ResumeParseError("PDF parsing needs the pypdf package.")
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        if reader.is_encrypted:
+            raise ResumeParseError("Encrypted PDFs cannot be parsed.")
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except pypdf.errors.PdfError as e:
+        raise ResumeParseError(f"Unreadable PDF: {str(e)}")
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def _docx_text(data):
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ResumeParseError(f"Unreadable DOCX: {str(e)}")
+
+    lines = []
+    # Table cells hold paragraphs too, so every paragraph in the body is visited
+    for paragraph in root.iter(f"{_W}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{_W}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{_W}tab":
+                parts.append("\t")
+            elif node.tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+        lines.append("".join(parts))
+    return "\n".join(lines)
+
+def _normalize_heading(line):
+    return re.sub(r"[^a-z& ]", "", line.lower()).strip()
+
+def split_sections(text):
+    """Lines under each recognised heading: {section: [line, ...]}"""
+    sections = {}
+    current = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if len(line) <= 40:
+            heading = _normalize_heading(line)
+            if heading in _HEADINGS:
+                current = _HEADINGS[heading]
+                sections.setdefault(current, [])
+                continue
+            if heading in OTHER_HEADINGS:
+                current = None
+                continue
+        if current is not None:
+            sections[current].append(line)
+    return sections
+
+def _month(match, prefix):
+    name, number = match.group(f"{prefix}month"), match.group(f"{prefix}num")
+    if name:
+        return MONTHS[name[:3].lower()]
+    if number and 1 <= int(number) <= 12:
+        return int(number)
+    return 1
+
+def _date(match, prefix):
+    return f"{int(match.group(f'{prefix}year')):04d}-{_month(match, prefix):02d}-01"
+
+def find_dates(line):
+    """
+    Dates mentioned on a line as (start, end, is_current, line without them)
+
+    Dates are YYYY-MM-01 strings (the day is rarely on a resume); all None
+    when the line has no date.
+    """
+    match = DATE_RANGE.search(line)
+    if match:
+        current = bool(match.group("current"))
+        end = None if current else _date(match, "e")
+        return _date(match, "s"), end, current, _strip_span(line, match)
+    match = SINGLE_DATE.search(line)
+    if match:
+        return _date(match, "s"), None, None, _strip_span(line, match)
+    return None, None, None, line
+
+def _strip_span(line, match):
+    rest = (line[:match.start()] + " " + line[match.end():]).strip()
+    return re.sub(r"^[\s,|–—()-]+|[\s,|–—(-]+$|\(\s*\)", "", rest).strip()
+
+def split_entries(lines):
+    """
+    Group a section's lines into entries
+
+    A blank line ends an entry. PDFs often lose blank lines, so an entry also
+    ends when a header line follows bullets, or when a second date range shows up.
+    """
+    entries, current = [], []
+    has_bullets = has_dates = False
+    for line in lines:
+        if not line:
+            if current:
+                entries.append(current)
+            current, has_bullets, has_dates = [], False, False
+            continue
+        # Bullets and "Tech: ..." lines are details of the entry above
+        is_bullet = bool(BULLET.match(line) or TECHNOLOGIES.match(line))
+        dated = bool(DATE_RANGE.search(line))
+        if current and not is_bullet and (has_bullets or (dated and has_dates)):
+            entries.append(current)
+            current, has_bullets, has_dates = [], False, False
+        current.append(line)
+        has_bullets = has_bullets or is_bullet
+        has_dates = has_dates or dated
+    if current:
+        entries.append(current)
+    return entries
+
+def _parts(lines):
+    """Header fields of an entry, its dates, and its bullet text"""
+    headers, bullets = [], []
+    start = end = current = None
+    for line in lines:
+        if start is None:
+            start, end, current, line = find_dates(line)
+        if BULLET.match(line):
+            bullets.append(BULLET.sub("", line).strip())
+        elif line:
+            headers.extend(part.strip() for part in HEADER_SEPARATOR.split(line) if part.strip())
+    return headers, bullets, start, end, current
+
+def _compact(entry):
+    return {field: value for field, value in entry.items() if value not in (None, "", [])}
+
+def map_work_experience(lines):
+    headers, bullets, start, end, current = _parts(lines)
+    # Titles are checked first: "Software Engineer" would pass for a company name
+    position = next((part for part in headers if POSITION_WORDS.search(part)), None)
+    company = next((part for part in headers if part != position and COMPANY_WORDS.search(part)), None)
+    rest = [part for part in headers if part not in (company, position)]
+    # "Position, Company" is the most common layout when nothing gives it away
+    if position is None and rest:
+        position = rest.pop(0)
+    if company is None and rest:
+        company = rest.pop(0)
+    return _compact({
+        "company": company,
+        "position": position,
+        "startDate": start,
+        "endDate": end,
+        "isCurrent": bool(current) if start else None,
+        "description": "\n".join(rest + bullets),
+    })
+
+def map_academic(lines):
+    headers, bullets, start, end, _ = _parts(lines)
+    text = " ".join(headers + bullets)
+    institution = next((part for part in headers if INSTITUTION_WORDS.search(part)), None)
+    degree_line = next((part for part in headers if part != institution and DEGREE.search(part)), None)
+    degree, field_of_study = degree_line, None
+    if degree_line:
+        match = FIELD_OF_STUDY.search(degree_line)
+        if match:
+            field_of_study = match.group(1).strip()
+            degree = degree_line[:match.start()].strip(" ,") or degree_line
+    grade = GRADE.search(text)
+    rest = [part for part in headers if part not in (institution, degree_line) and not GRADE.search(part)]
+    return _compact({
+        "institution": institution or (rest.pop(0) if rest else None),
+        "degree": degree,
+        "fieldOfStudy": field_of_study,
+        "startDate": start,
+        "endDate": end,
+        "grade": grade.group(1) if grade else None,
+        "description": "\n".join(rest + bullets),
+    })
+
+def map_project(lines):
+    technologies, description = [], []
+    link = None
+    for index, line in enumerate(lines):
+        match = URL.search(line)
+        if match and link is None:
+            link = match.group(0)
+            if not link.lower().startswith("http"):
+                link = "https://" + link
+            line = (line[:match.start()] + line[match.end():]).strip(" |,-")
+        tech = TECHNOLOGIES.match(BULLET.sub("", line).strip())
+        if tech:
+            technologies.extend(_split_list(tech.group(1)))
+            continue
+        # "Title | React, Node" headers carry the technologies
+        if index == 0 and " | " in line:
+            line, stack = line.split(" | ", 1)
+            technologies.extend(_split_list(find_dates(stack)[3]))
+        description.append(line)
+    headers, bullets, start, end, _ = _parts(description)
+    title = headers[0] if headers else None
+    return _compact({
+        "title": title,
+        "description": "\n".join(headers[1:] + bullets),
+        "startDate": start,
+        "endDate": end,
+        "technologiesUsed": technologies,
+        "projectLink": link,
+    })
+
+def map_certification(line):
+    line = BULLET.sub("", line).strip()
+    link = URL.search(line)
+    credential = CREDENTIAL_ID.search(line)
+    for match in (link, credential):
+        if match:
+            line = line.replace(match.group(0), " ")
+    start, end, _, line = find_dates(line)
+    parts = [part.strip(" ()") for part in ISSUER_SEPARATOR.split(line) if part.strip(" ()")]
+    url = link.group(0) if link else None
+    if url and not url.lower().startswith("http"):
+        url = "https://" + url
+    return _compact({
+        "name": parts[0] if parts else None,
+        "issuingOrganization": parts[1] if len(parts) > 1 else None,
+        "issueDate": start,
+        "expirationDate": end,
+        "credentialId": credential.group(1) if credential else None,
+        "credentialURL": url,
+    })
+
+def _split_list(text):
+    return [item.strip(" .") for item in re.split(r"[,;|•·]|\s{2,}|\t", text) if item.strip(" .")]
+
+def map_skills(lines):
+    skills, seen = [], set()
+    for line in lines:
+        line = BULLET.sub("", line)
+        # "Languages: Python, Go" -> the part after the category
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for skill in _split_list(line):
+            key = skill.lower()
+            if len(skill) <= MAX_SKILL_LENGTH and key not in seen:
+                seen.add(key)
+                skills.append(skill)
+    return skills
+
+def map_sections(text):
+    """
+    Draft profile sections found in resume text
+
+    Returns:
+        Dict with any of academic, workEx, projects, certifications (lists of
+        entry dicts using the profile field names) and skills (list of strings)
+    """
+    sections = split_sections(text)
+    draft = {}
+    if sections.get("academic"):
+        draft["academic"] = [map_academic(lines) for lines in split_entries(sections["academic"])]
+    if sections.get("workEx"):
+        draft["workEx"] = [map_work_experience(lines) for lines in split_entries(sections["workEx"])]
+    if sections.get("projects"):
+        draft["projects"] = [map_project(lines) for lines in split_entries(sections["projects"])]
+    if sections.get("certifications"):
+        draft["certifications"] = [map_certification(line) for line in sections["certifications"] if line]
+    if sections.get("skills"):
+        draft["skills"] = map_skills(sections["skills"])
+    return {section: entries for section, entries in draft.items() if entries}
+
+def parse_resume(data, content_type):
+    """Extract and map a resume document"""
+    text = extract_text(data, content_type)
+    if not text.strip():
+        raise ResumeParseError("No text found; scanned resumes are not supported.")
+    return map_sections(text)
+
+def parse_document(data, content_type, timeout):
+    """
+    Parse one resume on a pool worker, giving up after `timeout` seconds
+
+    Returns:
+        {"draft": {...}} or {"error": message}
+    """
+    try:
+        with deadline(timeout):
+            return {"draft": parse_resume(data, content_type)}
+    except ResumeParseError as e:
+        return {"error": str(e)}
+    except DeadlineExceeded:
+        return {"error": "Parsing took too long."}
+    except Exception as e:
+        # Malformed documents can break the PDF reader in many ways
+        return {"error": f"Could not parse the document: {str(e)}"}
@@ -0,0 +1,187 @@
+"""
+Declarative validation for profile sections
+
+A Schema is built once per section from rules, with regexes compiled and
+field lists frozen at import time, then validates single entries or whole
+arrays in one pass:
+
+    PROJECT_SCHEMA = Schema(
+        required("title", "description", "startDate", missing=ABSENT,
+                 message="Title, description, and start date are required."),
+        matches("projectLink", r"^https?://\\S+$", "Invalid project link."),
+    )
+    PROJECT_SCHEMA.errors(entry)                 # ["Invalid project link."]
+    PROJECT_SCHEMA.validate(entries, "projects") # [Issue(0, "projects[0].projectLink", ...)]
+
+Rule messages are strings or functions of the entry (for messages naming it).
+"""
+import re
+from collections import namedtuple
+
+# Where a rule failed: the array index (None for the value as a whole), a path
+# such as "projects[2].projectLink", and the message
+Issue = namedtuple("Issue", ["index", "path", "message"])
+
+# When a required field counts as missing
+ABSENT = "absent"   # key not present
+NONE = "none"       # absent or null
+FALSY = "falsy"     # absent, null, "", [], False, 0
+
+_MISSING = {
+    ABSENT: lambda entry, field: field not in entry,
+    NONE: lambda entry, field: entry.get(field) is None,
+    FALSY: lambda entry, field: not entry.get(field),
+}
+
+# A rule is a function of the entry returning its failures as a list of
+# (field, message) pairs, or None when the entry passes
+
+def _message(message, entry):
+    """A rule message is either constant or a function of the entry"""
+    return message(entry) if callable(message) else message
+
+def required(*fields, missing=NONE, message=None):
+    """All fields must be present; one issue lists every missing field"""
+    is_missing = _MISSING[missing]
+
+    def rule(entry):
+        absent = [field for field in fields if is_missing(entry, field)]
+        if absent:
+            return [(None, _message(message, entry) if message else f"Missing required fields: {', '.join(absent)}")]
+        return None
+    return rule
+
+def matches(field, pattern, message):
+    """A non-empty value must be a string matching pattern (anchored at the start, like re.match)"""
+    match = re.compile(pattern).match
+
+    def rule(entry):
+        value = entry.get(field)
+        if value and not (isinstance(value, str) and match(value)):
+            return [(field, _message(message, entry))]
+        return None
+    return rule
+
+def starts_with(field, prefixes, message):
+    """A non-empty value must be a string starting with one of prefixes"""
+    prefixes = tuple(prefixes)
+
+    def rule(entry):
+        value = entry.get(field)
+        if value and not (isinstance(value, str) and value.startswith(prefixes)):
+            return [(field, _message(message, entry))]
+        return None
+    return rule
+
+def of_type(field, types, message):
+    """A present value must be an instance of types"""
+    def rule(entry):
+        if field in entry and not isinstance(entry[field], types):
+            return [(field, _message(message, entry))]
+        return None
+    return rule
+
+def when(predicate, message, field=None):
+    """Fail when predicate(entry) is true (cross-field rules)"""
+    def rule(entry):
+        if predicate(entry):
+            return [(field, _message(message, entry))]
+        return None
+    return rule
+
+def each_value(pattern, message, skip=(None, "")):
+    """Every value of a mapping must match pattern; message is formatted with {key}"""
+    match = re.compile(pattern).match
+
+    def rule(entry):
+        return [
+            (key, message.format(key=key)) for key, value in entry.items()
+            if value not in skip and not (isinstance(value, str) and match(value))
+        ]
+    return rule
+
+class Schema:
+    """Rules for one kind of object (a section entry or a whole section)"""
+
+    def __init__(self, *rules, not_object="Entry must be an object."):
+        self.rules = tuple(rules)
+        self.not_object = not_object
+
+    def _check(self, entry):
+        failures = []
+        for rule in self.rules:
+            found = rule(entry)
+            if found:
+                failures.extend(found)
+        return failures
+
+    def _failures(self, entry):
+        if not isinstance(entry, dict):
+            return [(None, self.not_object)]
+        return self._check(entry)
+
+    def errors(self, entry):
+        """Messages for a single object"""
+        return [message for _, message in self._failures(entry)]
+
+    def validate(self, entries, path=""):
+        """Issues for a whole array, each with the index and path of its entry"""
+        if not isinstance(entries, list):
+            return [Issue(None, path, "Must be an array.")]
+        check = self._check
+        issues = []
+        for index, entry in enumerate(entries):
+            failures = check(entry) if isinstance(entry, dict) else [(None, self.not_object)]
+            if failures:
+                item = f"{path}[{index}]"
+                issues.extend(
+                    Issue(index, f"{item}.{field}" if field else item, message)
+                    for field, message in failures
+                )
+        return issues
+
+    def validate_object(self, entry, path=""):
+        """Issues for a single object section (personal info, socials)"""
+        return [
+            Issue(None, f"{path}.{field}" if path and field else field or path, message)
+            for field, message in self._failures(entry)
+        ]
+
+class ListSchema:
+    """A non-empty array of scalars, each checked by item(value) -> bool"""
+
+    def __init__(self, item, empty_message, item_message):
+        self.item = item
+        self.empty_message = empty_message
+        self.item_message = item_message
+
+    def validate(self, values, path=""):
+        if not isinstance(values, list) or not values:
+            return [Issue(None, path, self.empty_message)]
+        item = self.item
+        return [
+            Issue(index, f"{path}[{index}]", self.item_message.format(number=index + 1))
+            for index, value in enumerate(values) if not item(value)
+        ]
+
+    def errors(self, values):
+        return [issue.message for issue in self.validate(values)]
+
+def entry_errors(issues, entries, label, title_field):
+    """
+    Group array issues into the per-entry messages returned by the section routes
+
+    e.g. "Project #2 (Uply): Invalid project link format for Uply."
+    """
+    grouped = {}
+    for issue in issues:
+        grouped.setdefault(issue.index, []).append(issue.message)
+    messages = []
+    for index, entry_messages in grouped.items():
+        if index is None:
+            messages.extend(entry_messages)
+            continue
+        entry = entries[index]
+        title = entry.get(title_field, "") if isinstance(entry, dict) else ""
+        messages.append(f"{label} #{index + 1} ({title}): {', '.join(entry_messages)}")
+    return messages